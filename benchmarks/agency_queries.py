@@ -0,0 +1,136 @@
+"""Latency of the agency query builders as the tables grow.
+
+Seeds synthetic rows inside a transaction that is rolled back at the end,
+so it is safe to point at a development database:
+
+    python -m benchmarks.agency_queries --scales 1000,10000,100000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.engine import create_engine
+from api.database.queries import agency as agency_queries
+from api.database.schema.agency import Agency
+from api.database.schema.building import Building
+from api.models.agency import AgencyGeoQuery
+from benchmarks.dataset import seed, seed_activities
+
+Bounds = dict[str, tuple[int, int]]
+Query = Callable[[AsyncSession, random.Random, Bounds], Awaitable[Any]]
+
+
+async def _by_id(
+    session: AsyncSession, rng: random.Random, bounds: Bounds
+) -> Any:
+    agency_id = rng.randint(*bounds["agency"])
+    return await agency_queries.get_agency_by_id(session, agency_id)
+
+
+async def _by_building(
+    session: AsyncSession, rng: random.Random, bounds: Bounds
+) -> Any:
+    building_id = rng.randint(*bounds["building"])
+    return await agency_queries.list_agencies_by_building(
+        session, building_id, limit=20
+    )
+
+
+async def _by_geo(
+    session: AsyncSession, rng: random.Random, bounds: Bounds
+) -> Any:
+    geo = AgencyGeoQuery(
+        lat=rng.uniform(55.5, 55.9),
+        lon=rng.uniform(37.3, 37.9),
+        radius_m=300,
+    )
+    return await agency_queries.list_agencies_by_geo(session, geo, limit=20)
+
+
+QUERIES: dict[str, Query] = {
+    "get_agency_by_id": _by_id,
+    "list_agencies_by_building": _by_building,
+    "list_agencies_by_geo": _by_geo,
+}
+
+
+async def load_bounds(session: AsyncSession) -> Bounds:
+    bounds = {}
+    for name, column in (("agency", Agency.id), ("building", Building.id)):
+        row = (
+            await session.execute(select(func.min(column), func.max(column)))
+        ).one()
+        bounds[name] = (row[0], row[1])
+    return bounds
+
+
+async def measure(
+    session: AsyncSession,
+    query: Query,
+    iterations: int,
+    rng: random.Random,
+    bounds: Bounds,
+) -> dict[str, float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await query(session, rng, bounds)
+        timings.append((time.perf_counter() - started) * 1000)
+    quantiles = statistics.quantiles(timings, n=100)
+    return {
+        "p50_ms": round(quantiles[49], 3),
+        "p99_ms": round(quantiles[98], 3),
+    }
+
+
+async def run(scales: list[int], iterations: int, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    engine = create_engine()
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn)
+        try:
+            await seed_activities(session, roots=10, children=5)
+            seeded = 0
+            for scale in scales:
+                await seed(
+                    session,
+                    buildings=max((scale - seeded) // 10, 1),
+                    agencies=scale - seeded,
+                )
+                seeded = scale
+                bounds = await load_bounds(session)
+                for name, query in QUERIES.items():
+                    result = await measure(
+                        session, query, iterations, rng, bounds
+                    )
+                    line = {"agencies": scale, "query": name, **result}
+                    sys.stdout.write(json.dumps(line) + "\n")
+        finally:
+            await session.close()
+            await trans.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", default="1000,10000,100000")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    scales = sorted(int(scale) for scale in args.scales.split(","))
+    asyncio.run(run(scales, args.iterations, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Model serialization against Postgres-rendered JSON for agency lists.
+
+Both paths are checked to produce the same bytes before timing them.
+Rows are seeded inside a transaction that is rolled back at the end:
+
+    python -m benchmarks.agency_serialization --scales 10000,100000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.engine import create_engine
+from api.database.queries import agency as agency_queries
+from api.models.agency import AgencyGeoQuery, AgencyOut
+from api.models.serialization import dump_rows
+from benchmarks.agency_queries import Bounds, load_bounds, measure
+from benchmarks.dataset import seed, seed_activities
+
+LIMIT = 100
+
+Render = Callable[[AsyncSession, random.Random, Bounds], Awaitable[bytes]]
+
+
+def _dump(rows: list[dict[str, Any]]) -> bytes:
+    return dump_rows(AgencyOut, rows)
+
+
+def _geo(rng: random.Random) -> AgencyGeoQuery:
+    return AgencyGeoQuery(
+        lat=rng.uniform(55.5, 55.9),
+        lon=rng.uniform(37.3, 37.9),
+        radius_m=2000,
+    )
+
+
+async def _models_by_building(
+    session: AsyncSession, rng: random.Random, bounds: Bounds
+) -> bytes:
+    building_id = rng.randint(*bounds["building"])
+    rows = await agency_queries.list_agencies_by_building(
+        session, building_id, limit=LIMIT
+    )
+    return _dump(rows)
+
+
+async def _passthrough_by_building(
+    session: AsyncSession, rng: random.Random, bounds: Bounds
+) -> bytes:
+    building_id = rng.randint(*bounds["building"])
+    page = await agency_queries.render_agencies_by_building(
+        session, building_id, limit=LIMIT
+    )
+    return page.body
+
+
+async def _models_by_geo(
+    session: AsyncSession, rng: random.Random, bounds: Bounds
+) -> bytes:
+    rows = await agency_queries.list_agencies_by_geo(
+        session, _geo(rng), limit=LIMIT
+    )
+    return _dump(rows)
+
+
+async def _passthrough_by_geo(
+    session: AsyncSession, rng: random.Random, bounds: Bounds
+) -> bytes:
+    page = await agency_queries.render_agencies_by_geo(
+        session, _geo(rng), limit=LIMIT
+    )
+    return page.body
+
+
+PATHS: dict[str, tuple[Render, Render]] = {
+    "list_agencies_by_building": (
+        _models_by_building,
+        _passthrough_by_building,
+    ),
+    "list_agencies_by_geo": (_models_by_geo, _passthrough_by_geo),
+}
+
+
+async def _check_identical(
+    session: AsyncSession,
+    name: str,
+    models: Render,
+    passthrough: Render,
+    seed_value: int,
+    bounds: Bounds,
+) -> None:
+    for sample in range(20):
+        expected = await models(
+            session, random.Random(seed_value + sample), bounds
+        )
+        actual = await passthrough(
+            session, random.Random(seed_value + sample), bounds
+        )
+        if actual != expected:
+            raise SystemExit(f"{name}: passthrough body differs from models")
+
+
+async def run(scales: list[int], iterations: int, seed_value: int) -> None:
+    engine = create_engine()
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn)
+        try:
+            await seed_activities(session, roots=10, children=5)
+            seeded = 0
+            for scale in scales:
+                await seed(
+                    session,
+                    buildings=max((scale - seeded) // 10, 1),
+                    agencies=scale - seeded,
+                )
+                seeded = scale
+                bounds = await load_bounds(session)
+                for name, (models, passthrough) in PATHS.items():
+                    await _check_identical(
+                        session, name, models, passthrough, seed_value, bounds
+                    )
+                    for path, query in (
+                        ("models", models),
+                        ("passthrough", passthrough),
+                    ):
+                        result = await measure(
+                            session,
+                            query,
+                            iterations,
+                            random.Random(seed_value),
+                            bounds,
+                        )
+                        line = {
+                            "agencies": scale,
+                            "query": name,
+                            "path": path,
+                            **result,
+                        }
+                        sys.stdout.write(json.dumps(line) + "\n")
+        finally:
+            await session.close()
+            await trans.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", default="10000,100000")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    scales = sorted(int(scale) for scale in args.scales.split(","))
+    asyncio.run(run(scales, args.iterations, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.schema.actiivty import Activity
+from api.database.schema.building import Building
+
+_SEED_BUILDINGS = text(
+    """
+    WITH new_building AS (
+        INSERT INTO building (created_at)
+        SELECT now() FROM generate_series(1, :count)
+        RETURNING id
+    ), new_address AS (
+        INSERT INTO building_address (building_id, address, created_at)
+        SELECT id, 'Bench street, ' || id, now() FROM new_building
+        RETURNING building_id
+    )
+    INSERT INTO building_geo (building_id, geom, created_at)
+    SELECT
+        building_id,
+        ST_SetSRID(
+            ST_MakePoint(37.3 + random() * 0.6, 55.5 + random() * 0.4),
+            4326
+        ),
+        now()
+    FROM new_address
+    """
+)
+
+_SEED_AGENCIES = text(
+    """
+    WITH new_agency AS (
+        INSERT INTO agency (created_at)
+        SELECT now() FROM generate_series(1, :count)
+        RETURNING id
+    ), new_name AS (
+        INSERT INTO agency_name (agency_id, name, created_at)
+        SELECT id, 'Bench agency ' || id, now() FROM new_agency
+        RETURNING agency_id
+    ), new_phone AS (
+        INSERT INTO agency_phone (agency_id, phone, created_at)
+        SELECT agency_id, '8-800-' || agency_id || '-' || n, now()
+        FROM new_name, generate_series(1, 2) AS n
+    ), numbered_building AS (
+        SELECT id, row_number() OVER (ORDER BY id) - 1 AS rn FROM building
+    ), numbered_activity AS (
+        SELECT id, row_number() OVER (ORDER BY id) - 1 AS rn FROM activity
+    ), new_activity AS (
+        INSERT INTO agency_activity (agency_id, activity_id, created_at)
+        SELECT new_name.agency_id, numbered_activity.id, now()
+        FROM new_name
+        JOIN numbered_activity
+            ON numbered_activity.rn = new_name.agency_id % :activities
+    )
+    INSERT INTO agency_building (agency_id, building_id, created_at)
+    SELECT new_name.agency_id, numbered_building.id, now()
+    FROM new_name
+    JOIN numbered_building
+        ON numbered_building.rn = new_name.agency_id % :buildings
+    """
+)
+
+
+async def seed_activities(
+    session: AsyncSession,
+    roots: int,
+    children: int,
+) -> list[int]:
+    ids = []
+    for root_index in range(roots):
+        root = await Activity.create_activity(
+            session, name=f"Bench root {root_index}", parent_id=None
+        )
+        ids.append(root.id)
+        for child_index in range(children):
+            child = await Activity.create_activity(
+                session,
+                name=f"Bench child {root_index}.{child_index}",
+                parent_id=root.id,
+            )
+            ids.append(child.id)
+    return ids
+
+
+async def seed(
+    session: AsyncSession,
+    buildings: int,
+    agencies: int,
+) -> None:
+    await session.execute(_SEED_BUILDINGS, {"count": buildings})
+    building_count = await session.scalar(select(func.count(Building.id)))
+    activity_count = await session.scalar(select(func.count(Activity.id)))
+    if not activity_count:
+        raise ValueError("Seed activities before agencies.")
+    await session.execute(
+        _SEED_AGENCIES,
+        {
+            "count": agencies,
+            "buildings": building_count,
+            "activities": activity_count,
+        },
+    )
+    await session.execute(text("ANALYZE"))
@@ -0,0 +1,15 @@
+"""End-to-end throughput and latency of the API under a mixed workload.
+
+Boots ``create_app()`` in-process against ``PG_URL``, tops the tables up
+to a synthetic dataset and sends requests from a fixed number of
+concurrent clients. Prints one JSON line per endpoint with RPS and
+p50/p95/p99, then a ``total`` line. Seeded rows and activities created
+by the workload are committed, so point it at a disposable database:
+
+    python -m benchmarks.load --agencies 100000 --concurrency 32 \\
+        --duration 30 > load.jsonl
+    python -m benchmarks.load --baseline load.jsonl --max-regression 0.2
+
+With ``--baseline`` the run exits non-zero when an endpoint's p99 grows
+or its RPS falls by more than ``--max-regression`` against that file.
+"""
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.app import create_app
+from api.database.engine import create_engine
+from api.settings import settings
+from benchmarks.load import __doc__ as usage
+from benchmarks.load.report import (
+    EndpointTimings,
+    load_baseline,
+    regressions,
+    report,
+)
+from benchmarks.load.workload import (
+    ENDPOINTS,
+    Targets,
+    load_targets,
+    prepare,
+)
+
+
+async def _client_loop(
+    client: AsyncClient,
+    rng: random.Random,
+    targets: Targets,
+    deadline: float,
+    timings: dict[str, EndpointTimings],
+) -> None:
+    names = list(ENDPOINTS)
+    weights = [weight for _, weight in ENDPOINTS.values()]
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        call, _ = ENDPOINTS[name]
+        started = time.perf_counter()
+        response = await call(client, rng, targets)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timings[name].record(elapsed_ms, response.is_success)
+
+
+async def drive(
+    client: AsyncClient,
+    targets: Targets,
+    concurrency: int,
+    duration_s: float,
+    seed_value: int,
+) -> dict[str, EndpointTimings]:
+    """Send requests from ``concurrency`` clients for ``duration_s``.
+
+    Each client draws from its own seeded generator, so the request mix
+    is the same from run to run.
+    """
+    timings = {name: EndpointTimings() for name in ENDPOINTS}
+    deadline = time.perf_counter() + duration_s
+    await asyncio.gather(
+        *(
+            _client_loop(
+                client,
+                random.Random(seed_value + index),
+                targets,
+                deadline,
+                timings,
+            )
+            for index in range(concurrency)
+        )
+    )
+    return timings
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    engine = create_engine()
+    async with AsyncSession(bind=engine) as session:
+        await prepare(
+            session,
+            buildings=args.buildings,
+            agencies=args.agencies,
+            roots=args.roots,
+            children=args.children,
+        )
+        targets = await load_targets(session)
+    await engine.dispose()
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://load",
+            headers={"X-API-Key": settings.API_KEY},
+        ) as client:
+            if args.warmup:
+                await drive(
+                    client, targets, args.concurrency, args.warmup, args.seed
+                )
+            started = time.perf_counter()
+            timings = await drive(
+                client, targets, args.concurrency, args.duration, args.seed
+            )
+            elapsed_s = time.perf_counter() - started
+    return report(timings, elapsed_s)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load", description=usage
+    )
+    parser.add_argument("--buildings", type=int, default=10000)
+    parser.add_argument("--agencies", type=int, default=100000)
+    parser.add_argument("--roots", type=int, default=10)
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+    lines = asyncio.run(run(args))
+    for line in lines:
+        sys.stdout.write(json.dumps(line) + "\n")
+    if args.baseline is None:
+        return
+    failures = regressions(
+        lines, load_baseline(args.baseline), args.max_regression
+    )
+    for failure in failures:
+        sys.stderr.write(f"Regression: {failure}\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import json
+import statistics
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+TOTAL = "total"
+
+
+@dataclass(slots=True)
+class EndpointTimings:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, elapsed_ms: float, ok: bool) -> None:
+        self.latencies_ms.append(elapsed_ms)
+        if not ok:
+            self.errors += 1
+
+
+def summarize(
+    name: str, timings: EndpointTimings, duration_s: float
+) -> dict[str, Any]:
+    latencies = timings.latencies_ms
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100)
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "endpoint": name,
+        "requests": len(latencies),
+        "errors": timings.errors,
+        "rps": round(len(latencies) / duration_s, 1),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+    }
+
+
+def report(
+    timings: dict[str, EndpointTimings], duration_s: float
+) -> list[dict[str, Any]]:
+    """One line per endpoint, then one for all requests together."""
+    total = EndpointTimings()
+    lines = []
+    for name, endpoint in timings.items():
+        total.latencies_ms.extend(endpoint.latencies_ms)
+        total.errors += endpoint.errors
+        lines.append(summarize(name, endpoint, duration_s))
+    lines.append(summarize(TOTAL, total, duration_s))
+    return lines
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, Any]]:
+    """Lines printed by an earlier run, keyed by endpoint."""
+    lines = (line for line in path.read_text().splitlines() if line.strip())
+    return {entry["endpoint"]: entry for entry in map(json.loads, lines)}
+
+
+def regressions(
+    lines: Iterable[dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    max_regression: float,
+) -> list[str]:
+    """Endpoints whose p99 grew or RPS fell by more than the threshold.
+
+    Endpoints without a baseline line are skipped; an endpoint that
+    answered with errors fails regardless of the baseline.
+    """
+    failures = []
+    for line in lines:
+        name = line["endpoint"]
+        if line["errors"]:
+            failures.append(f"{name}: {line['errors']} failed requests")
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if line["p99_ms"] > previous["p99_ms"] * (1 + max_regression):
+            failures.append(
+                f"{name}: p99 {line['p99_ms']} ms, "
+                f"baseline {previous['p99_ms']} ms"
+            )
+        if line["rps"] < previous["rps"] * (1 - max_regression):
+            failures.append(
+                f"{name}: {line['rps']} rps, baseline {previous['rps']} rps"
+            )
+    return failures
@@ -0,0 +1,195 @@
+import itertools
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from httpx import AsyncClient, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from api.database.schema.actiivty import Activity, ActivityParent
+from api.database.schema.agency import Agency
+from api.database.schema.building import Building
+from api.settings import settings
+from benchmarks.dataset import seed, seed_activities
+
+# Seeded buildings lie in this box; see ``benchmarks.dataset``.
+MIN_LAT, MAX_LAT = 55.5, 55.9
+MIN_LON, MAX_LON = 37.3, 37.9
+BOX_DEGREES = 0.01
+RADIUS_M = 500
+LIMIT = 20
+
+
+@dataclass(slots=True)
+class Targets:
+    """Id ranges the requests pick from."""
+
+    agencies: tuple[int, int]
+    buildings: tuple[int, int]
+    activities: tuple[int, int]
+    roots: list[int]
+
+
+Call = Callable[[AsyncClient, random.Random, Targets], Awaitable[Response]]
+
+
+def _url(path: str) -> str:
+    return settings.ROOT_PATH + path
+
+
+def _point(rng: random.Random) -> dict[str, float]:
+    return {
+        "lat": rng.uniform(MIN_LAT, MAX_LAT),
+        "lon": rng.uniform(MIN_LON, MAX_LON),
+    }
+
+
+def _box(rng: random.Random) -> dict[str, float]:
+    lat = rng.uniform(MIN_LAT, MAX_LAT - BOX_DEGREES)
+    lon = rng.uniform(MIN_LON, MAX_LON - BOX_DEGREES)
+    return {
+        "min_lat": lat,
+        "max_lat": lat + BOX_DEGREES,
+        "min_lon": lon,
+        "max_lon": lon + BOX_DEGREES,
+    }
+
+
+async def _agency_by_building(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    params = {"building_id": rng.randint(*targets.buildings), "limit": LIMIT}
+    return await client.get(_url("/agency"), params=params)
+
+
+async def _agency_by_activity(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    params = {
+        "activity_id": rng.randint(*targets.activities),
+        "include_descendants": True,
+        "limit": LIMIT,
+    }
+    return await client.get(_url("/agency"), params=params)
+
+
+async def _agency_by_name(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    params: dict[str, str | int] = {
+        "name": f"agency {rng.randint(*targets.agencies)}",
+        "limit": LIMIT,
+    }
+    return await client.get(_url("/agency"), params=params)
+
+
+async def _agency_geo_radius(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    params = {**_point(rng), "radius_m": RADIUS_M, "limit": LIMIT}
+    return await client.get(_url("/agency/geo"), params=params)
+
+
+async def _agency_geo_bbox(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    params = {**_box(rng), "limit": LIMIT}
+    return await client.get(_url("/agency/geo"), params=params)
+
+
+async def _agency_by_id(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    agency_id = rng.randint(*targets.agencies)
+    return await client.get(_url(f"/agency/{agency_id}"))
+
+
+async def _building_geo(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    params = {**_point(rng), "radius_m": RADIUS_M, "limit": LIMIT}
+    return await client.get(_url("/building/geo"), params=params)
+
+
+_created = itertools.count()
+
+
+async def _activity_create(
+    client: AsyncClient, rng: random.Random, targets: Targets
+) -> Response:
+    payload = {
+        "name": f"Load activity {rng.getrandbits(32)}.{next(_created)}",
+        "parent_id": rng.choice(targets.roots),
+    }
+    return await client.post(_url("/activity"), json=payload)
+
+
+# Name, call and relative weight; reads dominate, as in production.
+ENDPOINTS: dict[str, tuple[Call, int]] = {
+    "agency_by_building": (_agency_by_building, 15),
+    "agency_by_activity": (_agency_by_activity, 15),
+    "agency_by_name": (_agency_by_name, 10),
+    "agency_geo_radius": (_agency_geo_radius, 15),
+    "agency_geo_bbox": (_agency_geo_bbox, 10),
+    "agency_by_id": (_agency_by_id, 20),
+    "building_geo": (_building_geo, 13),
+    "activity_create": (_activity_create, 2),
+}
+
+
+async def prepare(
+    session: AsyncSession,
+    buildings: int,
+    agencies: int,
+    roots: int,
+    children: int,
+) -> None:
+    """Top the tables up to the requested size and commit.
+
+    Rows already present count towards the size, so repeated runs
+    against the same database measure the same dataset.
+    """
+    activity_count = await session.scalar(select(func.count(Activity.id)))
+    if not activity_count:
+        await seed_activities(session, roots=roots, children=children)
+    building_count = await session.scalar(select(func.count(Building.id)))
+    agency_count = await session.scalar(select(func.count(Agency.id)))
+    missing_agencies = max(agencies - (agency_count or 0), 0)
+    if missing_agencies:
+        await seed(
+            session,
+            buildings=max(buildings - (building_count or 0), 0),
+            agencies=missing_agencies,
+        )
+    await session.commit()
+
+
+async def _bounds(
+    session: AsyncSession, column: InstrumentedAttribute[int]
+) -> tuple[int, int]:
+    result = await session.execute(select(func.min(column), func.max(column)))
+    low, high = result.one()
+    if low is None:
+        raise ValueError("Seed the database before running the workload.")
+    return low, high
+
+
+async def load_targets(session: AsyncSession) -> Targets:
+    # Roots keep an ``activity_parent`` row with no parent.
+    roots = list(
+        await session.scalars(
+            select(ActivityParent.activity_id).where(
+                ActivityParent.parent_id.is_(None)
+            )
+        )
+    )
+    if not roots:
+        raise ValueError("No root activities to create activities under.")
+    return Targets(
+        agencies=await _bounds(session, Agency.id),
+        buildings=await _bounds(session, Building.id),
+        activities=await _bounds(session, Activity.id),
+        roots=roots,
+    )
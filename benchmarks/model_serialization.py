@@ -0,0 +1,125 @@
+"""Response serialization CPU for agency lists, without a database.
+
+Compares the old route path (models built per row, then validated and
+serialized again by FastAPI for ``response_model``) with ``dump_rows``:
+
+    python -m benchmarks.model_serialization --sizes 100,1000,10000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from api.models.agency import AgencyOut
+from api.models.serialization import dump_rows
+
+AGENCY_LIST = TypeAdapter(list[AgencyOut])
+
+Dump = Callable[[list[dict[str, Any]]], bytes]
+
+
+def _rows(size: int, rng: random.Random) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": agency_id,
+            "name": f"Agency {agency_id}",
+            "phones": [f"8-800-{rng.randint(0, 9999999):07d}"],
+            "building": {
+                "id": rng.randint(1, size),
+                "address": f"Street {rng.randint(1, 500)}, {agency_id}",
+                "lat": rng.uniform(55.5, 55.9),
+                "lon": rng.uniform(37.3, 37.9),
+            },
+            "activities": [
+                {"id": activity_id, "name": f"Activity {activity_id}"}
+                for activity_id in rng.sample(range(1, 50), 3)
+            ],
+            "sort_key": rng.random(),
+        }
+        for agency_id in range(1, size + 1)
+    ]
+
+
+def _response_model(rows: list[dict[str, Any]]) -> bytes:
+    # What FastAPI did with ``list[AgencyOut]`` returned from a route.
+    models = [AgencyOut.model_validate(row) for row in rows]
+    content = AGENCY_LIST.dump_python(
+        AGENCY_LIST.validate_python(models), mode="json"
+    )
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def _per_row(rows: list[dict[str, Any]]) -> bytes:
+    return AGENCY_LIST.dump_json(
+        [AgencyOut.model_validate(row) for row in rows]
+    )
+
+
+def _single_pass(rows: list[dict[str, Any]]) -> bytes:
+    return dump_rows(AgencyOut, rows)
+
+
+def _construct(rows: list[dict[str, Any]]) -> bytes:
+    # Skips validation entirely; nested dicts still need building.
+    return AGENCY_LIST.dump_json(
+        [AgencyOut.model_construct(**row) for row in rows],
+        warnings=False,
+    )
+
+
+PATHS: dict[str, Dump] = {
+    "response_model": _response_model,
+    "per_row": _per_row,
+    "single_pass": _single_pass,
+    "model_construct": _construct,
+}
+
+
+def _measure(dump: Dump, rows: list[dict[str, Any]], iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        dump(rows)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def run(sizes: list[int], iterations: int, seed_value: int) -> None:
+    for size in sizes:
+        rows = _rows(size, random.Random(seed_value))
+        expected = _per_row(rows)
+        if _single_pass(rows) != expected:
+            raise SystemExit("single_pass body differs from models")
+        for path, dump in PATHS.items():
+            line = {
+                "agencies": size,
+                "path": path,
+                "p50_ms": round(_measure(dump, rows, iterations), 3),
+            }
+            sys.stdout.write(json.dumps(line) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    run(sizes, args.iterations, args.seed)
+
+
+if __name__ == "__main__":
+    main()
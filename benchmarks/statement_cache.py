@@ -0,0 +1,101 @@
+"""Per-request Python overhead of the query builders, without a database.
+
+Compares building a statement on every request (the old query functions)
+with the statement kept per shape by ``prebuilt``. Both go through
+SQLAlchemy's compiled cache, so the difference is the cost of building
+the construct and generating its cache key:
+
+    python -m benchmarks.statement_cache --iterations 2000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.util import LRUCache
+
+from api.database.engine import create_engine
+from api.database.queries import agency, building
+from api.database.queries.statements import prebuilt
+from api.settings import settings
+
+Build = Callable[[], Select[Any]]
+
+STATEMENTS: dict[str, tuple[Build, dict[str, Any]]] = {
+    "list_agencies_by_building": (
+        lambda: agency._agency_list(
+            agency._building_ids(cards=False, after=False), cards=False
+        ),
+        {"building_id": 7, "limit": 20},
+    ),
+    "list_agencies_by_geo": (
+        lambda: agency._agency_list(
+            agency._geo_ids(cards=False, shape="radius", after=False),
+            cards=False,
+        ),
+        {"lat": 55.75, "lon": 37.61, "radius_m": 300.0, "limit": 20},
+    ),
+    "list_agencies_nearest": (
+        lambda: agency._agency_list(
+            agency._nearest_ids(cards=False, match="subtree"),
+            cards=False,
+            order_by=agency._by_distance,
+        ),
+        {"lat": 55.75, "lon": 37.61, "activity_id": 3, "limit": 20},
+    ),
+    "list_buildings_by_geo": (
+        lambda: building._geo_statement("radius", after=False),
+        {"lat": 55.75, "lon": 37.61, "radius_m": 300.0, "limit": 20},
+    ),
+}
+
+
+def _measure(
+    statement: Build,
+    params: dict[str, Any],
+    iterations: int,
+) -> dict[str, float]:
+    pg = create_engine().dialect
+    cache: LRUCache[Any, Any] = LRUCache(settings.SQL_COMPILED_CACHE_SIZE)
+
+    def _execute(stmt: Select[Any]) -> None:
+        # What ``Connection.execute`` does before reaching the driver.
+        compiled, extracted, _ = stmt._compile_w_cache(
+            pg, compiled_cache=cache, column_keys=sorted(params)
+        )
+        compiled.construct_params(params, extracted_parameters=extracted)
+
+    timings: dict[str, list[float]] = {"before": [], "after": []}
+    for _ in range(iterations):
+        for path, stmt in (
+            ("before", statement),
+            ("after", lambda: prebuilt("bench", (id(statement),), statement)),
+        ):
+            started = time.perf_counter()
+            _execute(stmt())
+            timings[path].append((time.perf_counter() - started) * 1e6)
+    before = statistics.median(timings["before"])
+    after = statistics.median(timings["after"])
+    return {
+        "before_us": round(before, 1),
+        "after_us": round(after, 1),
+        "speedup": round(before / after, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    for name, (statement, params) in STATEMENTS.items():
+        result = _measure(statement, params, args.iterations)
+        sys.stdout.write(json.dumps({"query": name, **result}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
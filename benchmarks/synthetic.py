@@ -0,0 +1,354 @@
+"""Deterministic synthetic dataset at production scale.
+
+Activities form a tree down to ``MAX_ACTIVITY_DEPTH``, buildings cluster
+around city centres with a dense core, and agencies pick activities with
+Zipf-distributed popularity. The same ``--seed`` and counts always give
+the same rows. Records are streamed through the bulk importer's ``COPY``,
+which also rebuilds ``activity_closure``:
+
+    python -m benchmarks.synthetic --buildings 1000000 --agencies 3000000 \\
+        --activities 5000 --seed 0
+
+Ids start at 1 and existing rows with the same ids are overwritten, so
+load it into an empty database. With ``--output`` the records are written
+as NDJSON files for ``api.importer`` instead.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from api.database.bulk_import import (
+    STAGING_TABLES,
+    ImportStats,
+    Record,
+    bulk_import,
+    record_columns,
+)
+from api.database.engine import create_engine
+from api.database.schema.actiivty import MAX_ACTIVITY_DEPTH
+
+# Name, latitude and longitude; the first city is the largest one.
+CITIES = (
+    ("Москва", 55.7558, 37.6173),
+    ("Санкт-Петербург", 59.9386, 30.3141),
+    ("Новосибирск", 55.0376, 82.9000),
+    ("Екатеринбург", 56.8380, 60.5973),
+    ("Казань", 55.7963, 49.1088),
+    ("Нижний Новгород", 56.3269, 44.0059),
+    ("Красноярск", 56.0106, 92.8526),
+    ("Челябинск", 55.1598, 61.4025),
+    ("Самара", 53.1959, 50.1002),
+    ("Уфа", 54.7348, 55.9579),
+    ("Ростов-на-Дону", 47.2357, 39.7015),
+    ("Краснодар", 45.0355, 38.9753),
+    ("Омск", 54.9893, 73.3682),
+    ("Воронеж", 51.6608, 39.2003),
+    ("Пермь", 58.0105, 56.2502),
+    ("Волгоград", 48.7080, 44.5133),
+)
+STREETS = (
+    "Ленина",
+    "Мира",
+    "Советская",
+    "Садовая",
+    "Лесная",
+    "Школьная",
+    "Молодёжная",
+    "Гагарина",
+    "Пушкина",
+    "Центральная",
+    "Набережная",
+    "Заводская",
+    "Кирова",
+    "Победы",
+    "Строителей",
+    "Полевая",
+)
+ROOT_ACTIVITIES = (
+    "Еда",
+    "Автомобили",
+    "Строительство",
+    "Медицина",
+    "Образование",
+    "Одежда",
+    "Туризм",
+    "Спорт",
+    "Финансы",
+    "Связь",
+    "Недвижимость",
+    "Логистика",
+)
+ACTIVITY_ADJECTIVES = (
+    "Оптовая",
+    "Розничная",
+    "Мясная",
+    "Молочная",
+    "Детская",
+    "Бытовая",
+    "Офисная",
+    "Садовая",
+    "Строительная",
+    "Медицинская",
+    "Спортивная",
+    "Цифровая",
+)
+ACTIVITY_NOUNS = (
+    "продукция",
+    "техника",
+    "торговля",
+    "мебель",
+    "одежда",
+    "химия",
+    "электроника",
+    "косметика",
+    "обувь",
+    "посуда",
+    "доставка",
+    "аренда",
+)
+LEGAL_FORMS = ("ООО", "АО", "ПАО", "ИП")
+NAME_STEMS = (
+    "Авто",
+    "Строй",
+    "Мед",
+    "Агро",
+    "Техно",
+    "Эко",
+    "Транс",
+    "Пром",
+    "Энерго",
+    "Гидро",
+    "Спец",
+    "Гео",
+)
+NAME_ENDINGS = (
+    "Сервис",
+    "Торг",
+    "Снаб",
+    "Инвест",
+    "Групп",
+    "Маркет",
+    "Лайн",
+    "Проект",
+    "Трейд",
+    "Комплект",
+)
+KM_PER_DEGREE = 111.32
+
+
+def _rng(seed_value: int, kind: str) -> random.Random:
+    # One stream per kind: changing one count leaves the others intact.
+    return random.Random(f"{seed_value}:{kind}")
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    """Cumulative weights of ranks ``1..count``, for ``Random.choices``."""
+    return list(
+        itertools.accumulate(
+            1 / rank**exponent for rank in range(1, count + 1)
+        )
+    )
+
+
+def level_sizes(count: int, levels: int) -> list[int]:
+    """Activities per tree level, each level four times the one above."""
+    if count <= levels:
+        return [1] * count
+    weights = [4**level for level in range(levels)]
+    sizes = [max(count * weight // sum(weights), 1) for weight in weights]
+    sizes[-1] += count - sum(sizes)
+    return sizes
+
+
+def _activity_name(rng: random.Random, activity_id: int, root: bool) -> str:
+    if root:
+        name = ROOT_ACTIVITIES[(activity_id - 1) % len(ROOT_ACTIVITIES)]
+        cycle = (activity_id - 1) // len(ROOT_ACTIVITIES)
+        return f"{name} {cycle + 1}" if cycle else name
+    adjective = rng.choice(ACTIVITY_ADJECTIVES)
+    return f"{adjective} {rng.choice(ACTIVITY_NOUNS)}"
+
+
+def activity_records(count: int, seed_value: int) -> Iterator[Record]:
+    """``count`` activities; every level below the roots is filled.
+
+    A level's parents are drawn from the level above, so the tree is
+    exactly ``MAX_ACTIVITY_DEPTH`` deep once there are enough activities.
+    """
+    rng = _rng(seed_value, "activity")
+    next_id = 1
+    parents: range | None = None
+    for size in level_sizes(count, MAX_ACTIVITY_DEPTH + 1):
+        level = range(next_id, next_id + size)
+        for activity_id in level:
+            parent_id = rng.choice(parents) if parents else None
+            name = _activity_name(rng, activity_id, parents is None)
+            yield (activity_id, activity_id, name, parent_id)
+        parents = level
+        next_id += size
+
+
+def _offset(
+    rng: random.Random, lat: float, sigma_km: float
+) -> tuple[float, float]:
+    # A dense centre inside a wider spread of outskirts.
+    if rng.random() < 0.3:
+        sigma_km /= 4
+    north_km = rng.gauss(0, sigma_km)
+    east_km = rng.gauss(0, sigma_km)
+    lon_km = KM_PER_DEGREE * math.cos(math.radians(lat))
+    return north_km / KM_PER_DEGREE, east_km / lon_km
+
+
+def building_records(
+    count: int,
+    seed_value: int,
+    cities: int,
+    exponent: float = 1.0,
+) -> Iterator[Record]:
+    """Buildings spread around ``cities`` centres, Zipf-sized by rank.
+
+    Smaller cities also spread over a smaller radius.
+    """
+    rng = _rng(seed_value, "building")
+    centres = CITIES[:cities]
+    weights = zipf_weights(len(centres), exponent)
+    sigmas_km = [
+        3 + 12 / math.sqrt(rank) for rank in range(1, len(centres) + 1)
+    ]
+    for building_id in range(1, count + 1):
+        city = rng.choices(range(len(centres)), cum_weights=weights)[0]
+        name, lat, lon = centres[city]
+        north, east = _offset(rng, lat, sigmas_km[city])
+        street = rng.choice(STREETS)
+        address = f"г. {name}, ул. {street}, д. {rng.randint(1, 150)}"
+        yield (
+            building_id,
+            building_id,
+            address,
+            min(max(lat + north, -90.0), 90.0),
+            min(max(lon + east, -180.0), 180.0),
+        )
+
+
+def _phone(rng: random.Random) -> str:
+    if rng.random() < 0.6:
+        digits = f"{rng.randrange(10**9):09d}"
+        return f"8-9{digits[:2]}-{digits[2:5]}-{digits[5:7]}-{digits[7:]}"
+    digits = f"{rng.randrange(10**7):07d}"
+    return f"{digits[0]}-{digits[1:4]}-{digits[4:]}"
+
+
+def _agency_name(rng: random.Random) -> str:
+    stem = rng.choice(NAME_STEMS) + rng.choice(NAME_ENDINGS)
+    return f'{rng.choice(LEGAL_FORMS)} "{stem}"'
+
+
+def agency_records(
+    count: int,
+    seed_value: int,
+    buildings: int,
+    activities: int,
+    exponent: float = 1.1,
+) -> Iterator[Record]:
+    """Agencies with one to three phones and activities.
+
+    Activity popularity follows a Zipf law over a shuffled ranking, so
+    popular activities sit at every level of the tree.
+    """
+    rng = _rng(seed_value, "agency")
+    ranking = list(range(1, activities + 1))
+    rng.shuffle(ranking)
+    weights = zipf_weights(activities, exponent)
+    for agency_id in range(1, count + 1):
+        picked = rng.choices(ranking, cum_weights=weights, k=rng.randint(1, 3))
+        phones = [_phone(rng) for _ in range(rng.randint(1, 3))]
+        yield (
+            agency_id,
+            agency_id,
+            _agency_name(rng),
+            rng.randint(1, buildings),
+            phones,
+            sorted(set(picked)),
+        )
+
+
+def generate(args: argparse.Namespace) -> dict[str, Iterator[Record]]:
+    """Lazy records per ``STAGING_TABLES`` kind, in merge order."""
+    return {
+        "activity": activity_records(args.activities, args.seed),
+        "building": building_records(args.buildings, args.seed, args.cities),
+        "agency": agency_records(
+            args.agencies,
+            args.seed,
+            buildings=args.buildings,
+            activities=args.activities,
+        ),
+    }
+
+
+def write_ndjson(
+    directory: Path, sources: Mapping[str, Iterator[Record]]
+) -> dict[str, int]:
+    """Write one ``<kind>.ndjson`` file per kind for ``api.importer``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = {}
+    for kind, records in sources.items():
+        columns = record_columns(STAGING_TABLES[kind])
+        rows[kind] = 0
+        with (directory / f"{kind}.ndjson").open(
+            "w", encoding="utf-8"
+        ) as file:
+            for record in records:
+                item = dict(zip(columns, record[1:], strict=True))
+                file.write(json.dumps(item, ensure_ascii=False) + "\n")
+                rows[kind] += 1
+    return rows
+
+
+async def load(sources: Mapping[str, Iterator[Record]]) -> ImportStats:
+    engine = create_engine()
+    try:
+        async with engine.begin() as conn:
+            return await bulk_import(conn, sources)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--activities", type=int, default=5000)
+    parser.add_argument("--buildings", type=int, default=100000)
+    parser.add_argument("--agencies", type=int, default=300000)
+    parser.add_argument("--cities", type=int, default=len(CITIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+    if min(args.activities, args.buildings, args.cities) < 1:
+        parser.error("activities, buildings and cities must be positive")
+    if args.cities > len(CITIES):
+        parser.error(f"at most {len(CITIES)} cities")
+    started = time.perf_counter()
+    sources = generate(args)
+    if args.output is not None:
+        rows = write_ndjson(args.output, sources)
+    else:
+        rows = asyncio.run(load(sources)).rows
+    elapsed_s = time.perf_counter() - started
+    line = {**rows, "elapsed_s": round(elapsed_s, 3)}
+    sys.stdout.write(json.dumps(line) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,131 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Coroutine
 from contextlib import asynccontextmanager
+from functools import partial
 from typing import Any
 
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.datastructures import State
 from starlette.middleware.cors import CORSMiddleware
 
+from api.cache.activity_tree import ActivityTree
+from api.cache.building_index import BuildingIndex
+from api.cache.response import RESPONSE_CACHE, ResponseCache
+from api.database.engine import create_engine, ping_forever, pool_stats
+from api.database.listener import listen_forever, listen_url
+from api.database.queries.statements import QueryCacheMonitor
+from api.database.replicas import ReplicaSet
+from api.database.schema.actiivty import ActivityClosure
+from api.database.slow_queries import SlowQueryLog
+from api.metrics import MetricsMiddleware, RequestMetrics, engines
 from api.routes.actiivty import router as activity_router
 from api.routes.agency import router as agency_router
 from api.routes.building import router as building_router
+from api.routes.metrics import router as metrics_router
 from api.settings import API_VERSION, SERVICE_NAME, settings
 
 origins = ["*"]
 
 
+def _activity_tree_cache(listening: bool) -> bool:
+    if settings.ACTIVITY_TREE_CACHE is not None:
+        return settings.ACTIVITY_TREE_CACHE
+    # Unannounced, another worker's writes wait for the periodic rebuild.
+    return listening or settings.WORKERS == 1
+
+
+def _on_write(state: State, tables: frozenset[str]) -> None:
+    state.response_cache.invalidate(tables)
+    if ActivityClosure.__tablename__ in tables:
+        state.activity_tree.invalidate()
+
+
+def _cache_jobs(state: State) -> list[Coroutine[Any, Any, None]]:
+    url = listen_url()
+    tree = _activity_tree_cache(url is not None)
+    jobs = []
+    if tree:
+        jobs.append(
+            state.activity_tree.refresh_forever(
+                state.async_session, settings.ACTIVITY_TREE_REFRESH_S
+            )
+        )
+    if url is not None and (tree or settings.RESPONSE_CACHE_ROUTES):
+        jobs.append(
+            listen_forever(
+                url, partial(_on_write, state), settings.PG_PING_INTERVAL_S
+            )
+        )
+    if settings.BUILDING_INDEX:
+        jobs.append(
+            state.building_index.refresh_forever(
+                state.async_session, settings.BUILDING_INDEX_REFRESH_S
+            )
+        )
+    return jobs
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, Any]:
-    app.state.engine = create_async_engine(
-        settings.PG_URL.unicode_string(),
-        echo=settings.DEBUG,
-        pool_pre_ping=True,
+    app.state.engine = create_engine(echo=settings.DEBUG)
+    app.state.pool_stats = pool_stats(app.state.engine)
+    app.state.query_cache = QueryCacheMonitor()
+    app.state.query_cache.instrument(app.state.engine)
+    app.state.response_cache = ResponseCache(
+        ttl_s=settings.RESPONSE_CACHE_TTL_S,
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        routes=settings.RESPONSE_CACHE_ROUTES,
     )
+    session_kwargs: dict[str, Any] = {
+        "expire_on_commit": False,
+        "info": {RESPONSE_CACHE: app.state.response_cache},
+    }
     app.state.async_session = async_sessionmaker(
-        bind=app.state.engine,
-        expire_on_commit=False,
+        bind=app.state.engine, **session_kwargs
+    )
+    app.state.replicas = ReplicaSet.connect(
+        settings.PG_REPLICA_URLS,
+        settings.PG_REPLICA_POLICY,
+        **session_kwargs,
     )
+    app.state.slow_queries = SlowQueryLog(
+        threshold_s=settings.SLOW_QUERY_MS / 1000,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        explain_interval_s=settings.SLOW_QUERY_EXPLAIN_INTERVAL_S,
+        explains_per_minute=settings.SLOW_QUERY_EXPLAINS_PER_MINUTE,
+    )
+    for engine in engines(app.state).values():
+        app.state.metrics.instrument(engine)
+        app.state.slow_queries.instrument(engine)
+    app.state.activity_tree = ActivityTree()
+    app.state.building_index = BuildingIndex()
+    tasks = []
+    if app.state.replicas.replicas:
+        tasks.append(
+            asyncio.create_task(
+                app.state.replicas.check_forever(
+                    settings.PG_REPLICA_CHECK_INTERVAL_S
+                )
+            )
+        )
+    if settings.PG_PRE_PING == "periodic":
+        tasks.append(
+            asyncio.create_task(
+                ping_forever(app.state.engine, settings.PG_PING_INTERVAL_S)
+            )
+        )
+    tasks.extend(asyncio.create_task(job) for job in _cache_jobs(app.state))
     yield
 
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await app.state.slow_queries.aclose()
+    await app.state.replicas.dispose()
     await app.state.engine.dispose()
 
 
@@ -40,6 +136,7 @@ def create_app() -> FastAPI:
         version=API_VERSION,
         lifespan=lifespan,
     )
+    app.state.metrics = RequestMetrics()
 
     @app.exception_handler(ValidationError)
     async def pydantic_validation_exception_handler(
@@ -56,12 +153,18 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(
+        MetricsMiddleware,
+        metrics=app.state.metrics,
+        server_timing=settings.SERVER_TIMING,
+    )
 
     api_router = APIRouter(prefix=settings.ROOT_PATH)
     api_router.include_router(agency_router)
     api_router.include_router(building_router)
     api_router.include_router(activity_router)
     app.include_router(api_router)
+    app.include_router(metrics_router)
 
     return app
 
@@ -0,0 +1,140 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.schema.actiivty import ActivityClosure
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ActivityTreeStats:
+    hits: int = 0
+    misses: int = 0
+    rebuilds: int = 0
+    last_rebuild_s: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ActivityTree:
+    """In-process copy of ``activity_closure``.
+
+    Maps every activity to the flat tuple of its descendants (itself
+    included), so ``include_descendants`` filters become a plain
+    ``activity_id = ANY(:ids)`` instead of a closure join per agency.
+    Writes from this process patch the tree in place; ``invalidate``
+    takes it out of use until the refresher has reloaded it.
+    """
+
+    def __init__(self) -> None:
+        self._descendants: dict[int, tuple[int, ...]] = {}
+        self._ancestors: dict[int, tuple[int, ...]] = {}
+        self._pending: list[tuple[int, int | None]] | None = None
+        self._generation = 0
+        self._stale = asyncio.Event()
+        self.ready = False
+        self.stats = ActivityTreeStats()
+
+    def load(self, pairs: Iterable[tuple[int, int]]) -> None:
+        descendants: defaultdict[int, list[int]] = defaultdict(list)
+        ancestors: defaultdict[int, list[int]] = defaultdict(list)
+        for ancestor_id, descendant_id in pairs:
+            descendants[ancestor_id].append(descendant_id)
+            ancestors[descendant_id].append(ancestor_id)
+        self._descendants = {
+            key: tuple(ids) for key, ids in descendants.items()
+        }
+        self._ancestors = {key: tuple(ids) for key, ids in ancestors.items()}
+        self.ready = True
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        started = time.perf_counter()
+        generation = self._generation
+        self._pending = []
+        try:
+            result = await session.execute(
+                select(
+                    ActivityClosure.ancestor_id,
+                    ActivityClosure.descendant_id,
+                ).order_by(
+                    ActivityClosure.ancestor_id,
+                    ActivityClosure.descendant_id,
+                )
+            )
+            rows = result.tuples().all()
+        finally:
+            # Detached first: replaying goes through ``add``, which would
+            # otherwise append to the list being replayed.
+            pending, self._pending = self._pending or [], None
+        self.load(rows)
+        for activity_id, parent_id in pending:
+            self.add(activity_id, parent_id)
+        if generation != self._generation:
+            # Invalidated while loading: the rows may predate the write.
+            self.ready = False
+        self.stats.rebuilds += 1
+        self.stats.last_rebuild_s = time.perf_counter() - started
+        logger.info(
+            "Activity tree rebuilt: %d activities in %.1f ms",
+            len(self._descendants),
+            self.stats.last_rebuild_s * 1000,
+        )
+
+    async def refresh_forever(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_s: float,
+    ) -> None:
+        while True:
+            self._stale.clear()
+            try:
+                async with session_factory() as session:
+                    await self.rebuild(session)
+            except (SQLAlchemyError, OSError):
+                logger.warning("Activity tree rebuild failed", exc_info=True)
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stale.wait(), interval_s)
+
+    def invalidate(self) -> None:
+        """Stop serving the tree and wake the refresher to reload it."""
+        self.ready = False
+        self._generation += 1
+        self._stale.set()
+
+    def descendants(self, activity_id: int) -> tuple[int, ...] | None:
+        if not self.ready:
+            return None
+        ids = self._descendants.get(activity_id)
+        if ids is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return ids
+
+    def add(self, activity_id: int, parent_id: int | None) -> None:
+        if self._pending is not None:
+            self._pending.append((activity_id, parent_id))
+        if not self.ready or activity_id in self._descendants:
+            return
+        if parent_id is not None and parent_id not in self._ancestors:
+            self.ready = False
+            return
+        ancestors: tuple[int, ...] = (activity_id,)
+        if parent_id is not None:
+            ancestors += self._ancestors[parent_id]
+        self._ancestors[activity_id] = ancestors
+        self._descendants[activity_id] = (activity_id,)
+        for ancestor_id in ancestors[1:]:
+            self._descendants[ancestor_id] += (activity_id,)
@@ -0,0 +1,428 @@
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from sqlalchemy import (
+    Numeric,
+    Select,
+    cast,
+    func,
+    literal_column,
+    select,
+    union,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.database.schema.building import BuildingAddress, BuildingGeo
+from api.models.geo import GeoQueryBase
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6_371_008.8
+WGS84_A = 6_378_137.0
+WGS84_F = 1 / 298.257223563
+# Sphere and WGS84 distances differ by under 0.6%, so a sphere search
+# this much wider finds every point within the radius on the spheroid.
+SPHERE_MARGIN = 1.01
+_VINCENTY_ITERATIONS = 200
+_VINCENTY_TOLERANCE = 1e-12
+# Changes are re-read this far behind the watermark: ``now()`` is the
+# transaction start, so a slow writer can commit rows stamped before it.
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+# ``sum(id * id)`` is compared modulo 2**64, where int64 arithmetic wraps.
+_SQUARES_MODULUS = 2**64
+
+BuildingRow = tuple[int, str, float, float]
+# Count, sum and sum of squares of the building ids.
+Fingerprint = tuple[int, int, int]
+
+
+def haversine_m(
+    lat: float,
+    lon: float,
+    lats: NDArray[np.float64],
+    lons: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    lat_rad = math.radians(lat)
+    lats_rad = np.radians(lats)
+    half_dlat = (lats_rad - lat_rad) / 2
+    half_dlon = np.radians(lons - lon) / 2
+    a = (
+        np.sin(half_dlat) ** 2
+        + math.cos(lat_rad) * np.cos(lats_rad) * np.sin(half_dlon) ** 2
+    )
+    distances: NDArray[np.float64] = (
+        2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    )
+    return distances
+
+
+def _vincenty_length(
+    sigma: NDArray[np.float64],
+    sin_sigma: NDArray[np.float64],
+    cos_sigma: NDArray[np.float64],
+    cos2_alpha: NDArray[np.float64],
+    cos_2sm: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    b = WGS84_A * (1 - WGS84_F)
+    u_sq = cos2_alpha * (WGS84_A**2 - b**2) / b**2
+    big_a = 1 + u_sq / 16384 * (
+        4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq))
+    )
+    big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = (
+        big_b
+        * sin_sigma
+        * (
+            cos_2sm
+            + big_b
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2sm**2)
+                - big_b
+                / 6
+                * cos_2sm
+                * (-3 + 4 * sin_sigma**2)
+                * (-3 + 4 * cos_2sm**2)
+            )
+        )
+    )
+    length: NDArray[np.float64] = b * big_a * (sigma - delta_sigma)
+    return length
+
+
+def geodesic_m(
+    lat: float,
+    lon: float,
+    lats: NDArray[np.float64],
+    lons: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Distances on the WGS84 spheroid, as PostGIS measures geography.
+
+    Uses Vincenty's inverse formula. Nearly antipodal pairs, where it
+    does not converge, fall back to ``haversine_m``.
+    """
+    f = WGS84_F
+    u1 = math.atan((1 - f) * math.tan(math.radians(lat)))
+    u2 = np.arctan((1 - f) * np.tan(np.radians(lats)))
+    sin_u1, cos_u1 = math.sin(u1), math.cos(u1)
+    sin_u2, cos_u2 = np.sin(u2), np.cos(u2)
+    big_l = np.radians(lons - lon)
+    lam = big_l
+    converged = np.zeros(len(lats), dtype=np.bool_)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(_VINCENTY_ITERATIONS):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(
+                cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam
+            )
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(
+                sin_sigma == 0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma
+            )
+            cos2_alpha = 1 - sin_alpha**2
+            # Zero on the equator, where the second term is undefined.
+            cos_2sm = np.where(
+                cos2_alpha == 0,
+                0.0,
+                cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha,
+            )
+            c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            previous = lam
+            lam = big_l + (1 - c) * f * sin_alpha * (
+                sigma
+                + c
+                * sin_sigma
+                * (cos_2sm + c * cos_sigma * (-1 + 2 * cos_2sm**2))
+            )
+            converged = np.abs(lam - previous) < _VINCENTY_TOLERANCE
+            if converged.all():
+                break
+    distances = _vincenty_length(
+        sigma, sin_sigma, cos_sigma, cos2_alpha, cos_2sm
+    )
+    if not converged.all():
+        fallback = ~converged
+        distances[fallback] = haversine_m(
+            lat, lon, lats[fallback], lons[fallback]
+        )
+    return distances
+
+
+@dataclass(frozen=True, slots=True)
+class _Points:
+    """Building points as parallel arrays sorted by latitude."""
+
+    ids: NDArray[np.int64]
+    lat: NDArray[np.float64]
+    lon: NDArray[np.float64]
+    addresses: NDArray[np.object_]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[BuildingRow]) -> _Points:
+        return cls._sorted(
+            np.array([row[0] for row in rows], dtype=np.int64),
+            np.array([row[2] for row in rows], dtype=np.float64),
+            np.array([row[3] for row in rows], dtype=np.float64),
+            np.array([row[1] for row in rows], dtype=np.object_),
+        )
+
+    @classmethod
+    def _sorted(
+        cls,
+        ids: NDArray[np.int64],
+        lat: NDArray[np.float64],
+        lon: NDArray[np.float64],
+        addresses: NDArray[np.object_],
+    ) -> _Points:
+        order = np.argsort(lat, kind="stable")
+        return cls(ids[order], lat[order], lon[order], addresses[order])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def fingerprint(self) -> Fingerprint:
+        squares = int(np.sum(self.ids * self.ids)) % _SQUARES_MODULUS
+        return len(self.ids), int(np.sum(self.ids)), squares
+
+    def merge(self, rows: Sequence[BuildingRow]) -> _Points:
+        fresh = _Points.from_rows(rows)
+        keep = ~np.isin(self.ids, fresh.ids)
+        return self._sorted(
+            np.concatenate([self.ids[keep], fresh.ids]),
+            np.concatenate([self.lat[keep], fresh.lat]),
+            np.concatenate([self.lon[keep], fresh.lon]),
+            np.concatenate([self.addresses[keep], fresh.addresses]),
+        )
+
+    def lat_band(self, min_lat: float, max_lat: float) -> tuple[int, int]:
+        start = int(np.searchsorted(self.lat, min_lat, side="left"))
+        stop = int(np.searchsorted(self.lat, max_lat, side="right"))
+        return start, stop
+
+    def within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+    ) -> NDArray[np.intp]:
+        # The sphere narrows the search cheaply; the spheroid decides.
+        wide_m = radius_m * SPHERE_MARGIN
+        band = math.degrees(wide_m / EARTH_RADIUS_M)
+        start, stop = self.lat_band(lat - band, lat + band)
+        lats, lons = self.lat[start:stop], self.lon[start:stop]
+        near = np.flatnonzero(haversine_m(lat, lon, lats, lons) <= wide_m)
+        distances = geodesic_m(lat, lon, lats[near], lons[near])
+        return near[distances <= radius_m] + start
+
+    def within_box(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+    ) -> NDArray[np.intp]:
+        start, stop = self.lat_band(min_lat, max_lat)
+        lons = self.lon[start:stop]
+        return np.flatnonzero((lons >= min_lon) & (lons <= max_lon)) + start
+
+    def page(
+        self,
+        positions: NDArray[np.intp],
+        limit: int,
+        after_id: int | None,
+    ) -> list[dict[str, Any]]:
+        ids = self.ids[positions]
+        if after_id is not None:
+            positions = positions[ids > after_id]
+            ids = self.ids[positions]
+        if len(ids) > limit:
+            top = np.argpartition(ids, limit - 1)[:limit]
+            positions, ids = positions[top], ids[top]
+        positions = positions[np.argsort(ids)]
+        return [
+            {
+                "id": int(self.ids[position]),
+                "address": self.addresses[position],
+                "lat": float(self.lat[position]),
+                "lon": float(self.lon[position]),
+            }
+            for position in positions
+        ]
+
+
+@dataclass(slots=True)
+class BuildingIndexStats:
+    queries: int = 0
+    refreshes: int = 0
+    rebuilds: int = 0
+    last_refresh_s: float = 0.0
+
+
+def _rows_select() -> Select[Any]:
+    return select(
+        BuildingGeo.building_id,
+        BuildingAddress.address,
+        func.ST_Y(BuildingGeo.geom),
+        func.ST_X(BuildingGeo.geom),
+        func.greatest(BuildingGeo.updated_at, BuildingAddress.updated_at),
+    ).join(
+        BuildingAddress,
+        BuildingAddress.building_id == BuildingGeo.building_id,
+    )
+
+
+def _fingerprint_select() -> Select[Any]:
+    ids = BuildingGeo.building_id
+    squares = func.sum(cast(ids, Numeric) * ids)
+    return select(
+        func.count(),
+        func.coalesce(func.sum(ids), 0),
+        func.coalesce(squares, 0) % literal_column(str(_SQUARES_MODULUS)),
+    ).join(
+        BuildingAddress,
+        BuildingAddress.building_id == BuildingGeo.building_id,
+    )
+
+
+class BuildingIndex:
+    """In-process copy of building points for ``/building/geo``.
+
+    Radius queries measure on the WGS84 spheroid like PostGIS geography,
+    after a haversine pass on a slightly wider radius narrows the points.
+    """
+
+    def __init__(self) -> None:
+        self._points = _Points.from_rows([])
+        self._watermark: datetime | None = None
+        self.ready = False
+        self.stats = BuildingIndexStats()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def load(
+        self,
+        rows: Sequence[BuildingRow],
+        watermark: datetime | None = None,
+    ) -> None:
+        self._points = _Points.from_rows(rows)
+        self._watermark = watermark
+        self.ready = True
+
+    def upsert(
+        self,
+        rows: Sequence[BuildingRow],
+        watermark: datetime | None = None,
+    ) -> None:
+        if rows:
+            self._points = self._points.merge(rows)
+        if watermark is not None:
+            self._watermark = max(watermark, self._watermark or watermark)
+
+    async def _fetch(
+        self,
+        session: AsyncSession,
+        since: datetime | None,
+    ) -> tuple[list[BuildingRow], datetime | None]:
+        stmt = _rows_select()
+        if since is not None:
+            changed = union(
+                select(BuildingGeo.building_id).where(
+                    BuildingGeo.updated_at > since
+                ),
+                select(BuildingAddress.building_id).where(
+                    BuildingAddress.updated_at > since
+                ),
+            )
+            stmt = stmt.where(BuildingGeo.building_id.in_(changed))
+        result = await session.execute(stmt)
+        rows = result.tuples().all()
+        watermark = max((row[4] for row in rows), default=None)
+        return [
+            (building_id, address, lat, lon)
+            for building_id, address, lat, lon, _ in rows
+        ], watermark
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        started = time.perf_counter()
+        rows, watermark = await self._fetch(session, since=None)
+        self.load(rows, watermark)
+        self.stats.rebuilds += 1
+        self.stats.last_refresh_s = time.perf_counter() - started
+        logger.info(
+            "Building index rebuilt: %d buildings in %.1f ms",
+            len(rows),
+            self.stats.last_refresh_s * 1000,
+        )
+
+    async def refresh(self, session: AsyncSession) -> None:
+        if not self.ready or self._watermark is None:
+            await self.rebuild(session)
+            return
+        started = time.perf_counter()
+        since = self._watermark - WATERMARK_OVERLAP
+        rows, watermark = await self._fetch(session, since=since)
+        self.upsert(rows, watermark)
+        count, total, squares = (
+            await session.execute(_fingerprint_select())
+        ).one()
+        if (count, int(total), int(squares)) != self._points.fingerprint():
+            # Deleted buildings leave no updated_at trail, and a count
+            # alone misses a delete paired with an insert.
+            await self.rebuild(session)
+            return
+        self.stats.refreshes += 1
+        self.stats.last_refresh_s = time.perf_counter() - started
+
+    async def refresh_forever(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_s: float,
+    ) -> None:
+        while True:
+            try:
+                async with session_factory() as session:
+                    await self.refresh(session)
+            except (SQLAlchemyError, OSError):
+                logger.warning("Building index refresh failed", exc_info=True)
+            await asyncio.sleep(interval_s)
+
+    def search(
+        self,
+        geo: GeoQueryBase,
+        limit: int,
+        after_id: int | None = None,
+    ) -> list[dict[str, Any]] | None:
+        if not self.ready:
+            return None
+        points = self._points
+        if (
+            geo.radius_m is not None
+            and geo.lat is not None
+            and geo.lon is not None
+        ):
+            positions = points.within_radius(geo.lat, geo.lon, geo.radius_m)
+        elif (
+            geo.min_lat is not None
+            and geo.max_lat is not None
+            and geo.min_lon is not None
+            and geo.max_lon is not None
+        ):
+            positions = points.within_box(
+                geo.min_lat, geo.max_lat, geo.min_lon, geo.max_lon
+            )
+        else:
+            raise ValueError("Bounding box parameters are required.")
+        self.stats.queries += 1
+        return points.page(positions, limit, after_id)
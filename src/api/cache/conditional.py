@@ -0,0 +1,46 @@
+from collections.abc import Mapping
+
+from fastapi import Request, Response, status
+
+ETAG_HEADER = "ETag"
+NOT_MODIFIED_RESPONSES: dict[int | str, dict[str, str]] = {
+    status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
+}
+
+
+def validator_headers(count: int, digest: str) -> dict[str, str]:
+    """Validators for a response built from ``count`` rows.
+
+    ``digest`` covers the version of every row, so the tag changes with
+    any committed write behind the response. There is no
+    ``Last-Modified``: ``updated_at`` is the writing transaction's start
+    time, not its commit order, so a date could miss a later commit.
+    """
+    return {ETAG_HEADER: f'W/"{count:x}-{digest}"'}
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def is_not_modified(request: Request, headers: Mapping[str, str]) -> bool:
+    """Whether the request's ``If-None-Match`` matches ``headers``."""
+    if_none_match = request.headers.get("if-none-match")
+    etag = headers.get(ETAG_HEADER)
+    if if_none_match is None or etag is None:
+        return False
+    tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+    return "*" in tags or _opaque_tag(etag) in tags
+
+
+def not_modified(headers: Mapping[str, str]) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={ETAG_HEADER: headers[ETAG_HEADER]},
+    )
+
+
+def conditional(request: Request, response: Response) -> Response:
+    if is_not_modified(request, response.headers):
+        return not_modified(response.headers)
+    return response
@@ -0,0 +1,232 @@
+import time
+from collections import OrderedDict
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass
+
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.database.schema.base import WRITTEN_TABLES
+
+# ``session.info`` key holding the cache invalidated on commit.
+RESPONSE_CACHE = "response_cache"
+JSON_MEDIA_TYPE = "application/json"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    body: bytes
+    headers: tuple[tuple[str, str], ...]
+    tags: frozenset[str]
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(
+            len(name) + len(value) for name, value in self.headers
+        )
+
+    def response(self) -> Response:
+        return Response(
+            content=self.body,
+            media_type=JSON_MEDIA_TYPE,
+            headers=dict(self.headers),
+        )
+
+
+@dataclass(slots=True)
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """Serialized read responses in an LRU bounded by TTL and total bytes.
+
+    Every entry is tagged with the tables its response was built from.
+    Committing a session that wrote any of them drops the entry. Writes
+    from other processes arrive through the table write listener; when
+    it cannot run, they only show up once the TTL runs out.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float,
+        max_bytes: int,
+        routes: Collection[str],
+    ) -> None:
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.routes = frozenset(routes)
+        self.generation = 0
+        self.size = 0
+        self.stats = ResponseCacheStats()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        headers: Mapping[str, str],
+        tags: frozenset[str],
+        generation: int | None = None,
+    ) -> None:
+        if generation is not None and generation != self.generation:
+            # A commit landed while the response was being built.
+            return
+        entry = CachedResponse(
+            body=body,
+            headers=tuple(headers.items()),
+            tags=tags,
+            expires_at=time.monotonic() + self.ttl_s,
+        )
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        tables = frozenset(tables)
+        if not tables:
+            return 0
+        self.generation += 1
+        # Writes are rare next to reads, a full scan keeps entries small.
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if not entry.tags.isdisjoint(tables)
+        ]
+        for key in stale:
+            self._remove(key)
+        self.stats.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self.size = 0
+
+    def route(
+        self,
+        name: str,
+        params: BaseModel | int | str,
+        tags: frozenset[str],
+        *,
+        read: bool = True,
+        write: bool = True,
+    ) -> RouteCache:
+        if isinstance(params, BaseModel):
+            params = params.model_dump_json()
+        return RouteCache(
+            cache=self if name in self.routes else None,
+            key=f"{name}:{params}",
+            tags=tags,
+            generation=self.generation,
+            read=read,
+            write=write,
+        )
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+
+@dataclass(frozen=True, slots=True)
+class RouteCache:
+    """Cache slot of one request; inert when its route is switched off."""
+
+    cache: ResponseCache | None
+    key: str
+    tags: frozenset[str]
+    generation: int
+    read: bool = True
+    write: bool = True
+
+    def lookup(self) -> Response | None:
+        if self.cache is None or not self.read:
+            return None
+        entry = self.cache.get(self.key)
+        return None if entry is None else entry.response()
+
+    def respond(
+        self,
+        body: bytes,
+        headers: Mapping[str, str] | None = None,
+    ) -> Response:
+        headers = headers or {}
+        if self.cache is not None and self.write:
+            self.cache.put(self.key, body, headers, self.tags, self.generation)
+        return Response(
+            content=body,
+            media_type=JSON_MEDIA_TYPE,
+            headers=dict(headers),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RequestCache:
+    """The response cache as one request may use it.
+
+    A read presenting a consistency token skips lookups: an entry may
+    predate the write it waits for. A response read from a replica is
+    not stored: the replica may not have replayed a write whose commit
+    already invalidated this cache.
+    """
+
+    cache: ResponseCache
+    read: bool = True
+    write: bool = True
+
+    def route(
+        self,
+        name: str,
+        params: BaseModel | int | str,
+        tags: frozenset[str],
+    ) -> RouteCache:
+        return self.cache.route(
+            name, params, tags, read=self.read, write=self.write
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written(session: Session) -> None:
+    tables = session.info.pop(WRITTEN_TABLES, None)
+    cache = session.info.get(RESPONSE_CACHE)
+    if tables and isinstance(cache, ResponseCache):
+        cache.invalidate(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written(session: Session) -> None:
+    session.info.pop(WRITTEN_TABLES, None)
@@ -0,0 +1,367 @@
+"""Set-based bulk import through ``COPY`` into staging tables.
+
+Rows are copied with asyncpg's binary ``COPY`` into temporary tables
+that never outlive the transaction, then merged into the normalized
+tables with one statement per table. ``activity_closure`` is rebuilt
+from ``activity_parent`` in SQL once activities have changed.
+"""
+
+import time
+from collections.abc import AsyncIterable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Double,
+    MetaData,
+    Select,
+    Table,
+    Text,
+    all_,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import ColumnElement, Executable
+from sqlalchemy.sql.selectable import CTE, CompoundSelect
+
+from api.database.schema.actiivty import (
+    MAX_ACTIVITY_DEPTH,
+    Activity,
+    ActivityClosure,
+    ActivityName,
+    ActivityParent,
+)
+from api.database.schema.agency import (
+    Agency,
+    AgencyActivity,
+    AgencyBuilding,
+    AgencyName,
+    AgencyPhone,
+)
+from api.database.schema.base import Base
+from api.database.schema.building import Building, BuildingAddress, BuildingGeo
+
+Record = tuple[Any, ...]
+Records = Iterable[Record] | AsyncIterable[Record]
+
+staging = MetaData()
+
+
+def _staging_table(name: str, *columns: Column[Any]) -> Table:
+    # ``line`` is the input position, so the last duplicate of an id wins.
+    return Table(
+        name,
+        staging,
+        Column("line", BigInteger, nullable=False),
+        Column("id", BigInteger, nullable=False),
+        *columns,
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+import_activity = _staging_table(
+    "import_activity",
+    Column("name", Text, nullable=False),
+    Column("parent_id", BigInteger),
+)
+import_building = _staging_table(
+    "import_building",
+    Column("address", Text, nullable=False),
+    Column("lat", Double, nullable=False),
+    Column("lon", Double, nullable=False),
+)
+import_agency = _staging_table(
+    "import_agency",
+    Column("name", Text, nullable=False),
+    Column("building_id", BigInteger, nullable=False),
+    Column("phones", ARRAY(Text), nullable=False),
+    Column("activity_ids", ARRAY(BigInteger), nullable=False),
+)
+
+# Merge order: agencies reference buildings and activities.
+STAGING_TABLES: dict[str, Table] = {
+    "activity": import_activity,
+    "building": import_building,
+    "agency": import_agency,
+}
+
+
+@dataclass(slots=True)
+class ImportStats:
+    rows: dict[str, int] = field(default_factory=dict)
+    copy_s: float = 0.0
+    merge_s: float = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_s(self) -> float:
+        elapsed = self.copy_s + self.merge_s
+        return self.total_rows / elapsed if elapsed else 0.0
+
+
+def record_columns(table: Table) -> list[str]:
+    """Staging columns a record carries, in order, after ``line``."""
+    return [column.name for column in table.columns][1:]
+
+
+async def copy_records(
+    conn: AsyncConnection,
+    table: Table,
+    records: Records,
+) -> int:
+    raw = await conn.get_raw_connection()
+    driver: Any = raw.driver_connection
+    status = await driver.copy_records_to_table(
+        table.name,
+        records=records,
+        columns=[column.name for column in table.columns],
+    )
+    return int(status.split()[-1])
+
+
+async def _prepare_staged(conn: AsyncConnection, table: Table) -> None:
+    # Keep the last row of every id, so each merge touches a row once.
+    newer = table.alias("newer")
+    await conn.execute(
+        delete(table).where(
+            table.c.id == newer.c.id, table.c.line < newer.c.line
+        )
+    )
+    # Autovacuum never analyzes temporary tables.
+    await conn.execute(text(f"ANALYZE {table.name}"))
+
+
+def _merge(target: type[Base], key: str, rows: Select[Any]) -> Insert:
+    """Insert ``rows``, updating existing ``key`` rows whose values differ."""
+    names = list(rows.selected_columns.keys())
+    stmt = insert(target).from_select(names, rows)
+    updates = [name for name in names if name != key]
+    if not updates:
+        return stmt.on_conflict_do_nothing(index_elements=[key])
+    return stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={
+            **{name: stmt.excluded[name] for name in updates},
+            "updated_at": func.now(),
+        },
+        where=or_(
+            *(
+                getattr(target, name).is_distinct_from(stmt.excluded[name])
+                for name in updates
+            )
+        ),
+    )
+
+
+def _merge_activities() -> list[Executable]:
+    staged = import_activity.c
+    activity_id = staged.id.label("activity_id")
+    return [
+        _merge(Activity, "id", select(staged.id)),
+        _merge(ActivityName, "activity_id", select(activity_id, staged.name)),
+        _merge(
+            ActivityParent,
+            "activity_id",
+            select(activity_id, staged.parent_id),
+        ),
+    ]
+
+
+def _merge_buildings() -> list[Executable]:
+    staged = import_building.c
+    building_id = staged.id.label("building_id")
+    point = func.ST_SetSRID(func.ST_MakePoint(staged.lon, staged.lat), 4326)
+    return [
+        _merge(Building, "id", select(staged.id)),
+        _merge(
+            BuildingAddress,
+            "building_id",
+            select(building_id, staged.address),
+        ),
+        _merge(
+            BuildingGeo,
+            "building_id",
+            select(building_id, point.label("geom")),
+        ),
+    ]
+
+
+def _replace_links(
+    target: type[AgencyPhone] | type[AgencyActivity],
+    column: str,
+    values: ColumnElement[Any],
+) -> list[Executable]:
+    """Make the ``column`` values of each imported agency equal ``values``."""
+    agency_id = import_agency.c.id
+    stale = delete(target).where(
+        target.agency_id == agency_id,
+        getattr(target, column) != all_(values),
+    )
+    rows = select(
+        agency_id.label("agency_id"), func.unnest(values).label(column)
+    )
+    fresh = (
+        insert(target)
+        .from_select(["agency_id", column], rows)
+        .on_conflict_do_nothing(index_elements=["agency_id", column])
+    )
+    return [stale, fresh]
+
+
+def _merge_agencies() -> list[Executable]:
+    staged = import_agency.c
+    agency_id = staged.id.label("agency_id")
+    return [
+        _merge(Agency, "id", select(staged.id)),
+        _merge(AgencyName, "agency_id", select(agency_id, staged.name)),
+        _merge(
+            AgencyBuilding,
+            "agency_id",
+            select(agency_id, staged.building_id),
+        ),
+        *_replace_links(AgencyPhone, "phone", staged.phones),
+        *_replace_links(AgencyActivity, "activity_id", staged.activity_ids),
+    ]
+
+
+_MERGES: dict[str, Callable[[], list[Executable]]] = {
+    "activity": _merge_activities,
+    "building": _merge_buildings,
+    "agency": _merge_agencies,
+}
+
+
+def _known_activity_ids() -> CompoundSelect[Any]:
+    return union_all(select(Activity.id), select(import_activity.c.id))
+
+
+def _reference_checks() -> dict[str, Select[Any]]:
+    activity_refs = select(
+        func.unnest(import_agency.c.activity_ids).label("activity_id")
+    ).subquery("activity_refs")
+    known_buildings = union_all(
+        select(Building.id), select(import_building.c.id)
+    )
+    return {
+        "agencies reference unknown buildings": (
+            select(func.count())
+            .select_from(import_agency)
+            .where(import_agency.c.building_id.not_in(known_buildings))
+        ),
+        "agency activities reference unknown activities": (
+            select(func.count())
+            .select_from(activity_refs)
+            .where(activity_refs.c.activity_id.not_in(_known_activity_ids()))
+        ),
+        "activities reference unknown parents": (
+            select(func.count())
+            .select_from(import_activity)
+            .where(import_activity.c.parent_id.not_in(_known_activity_ids()))
+        ),
+    }
+
+
+async def _check_references(conn: AsyncConnection) -> None:
+    for problem, stmt in _reference_checks().items():
+        count = (await conn.execute(stmt)).scalar_one()
+        if count:
+            raise ValueError(f"{count} {problem}.")
+
+
+def _activity_closure() -> CTE:
+    closure = select(
+        Activity.id.label("ancestor_id"),
+        Activity.id.label("descendant_id"),
+        literal(0).label("depth"),
+    ).cte("closure", recursive=True)
+    # One level past the limit is enough to detect a violation (or a
+    # cycle) while keeping the recursion finite.
+    parents = (
+        select(
+            ActivityParent.parent_id,
+            closure.c.descendant_id,
+            closure.c.depth + 1,
+        )
+        .join_from(
+            closure,
+            ActivityParent,
+            ActivityParent.activity_id == closure.c.ancestor_id,
+        )
+        .where(
+            ActivityParent.parent_id.is_not(None),
+            closure.c.depth <= MAX_ACTIVITY_DEPTH,
+        )
+    )
+    return closure.union_all(parents)
+
+
+async def rebuild_activity_closure(conn: AsyncConnection) -> None:
+    closure = _activity_closure()
+    depth = (await conn.execute(select(func.max(closure.c.depth)))).scalar()
+    if depth is not None and depth > MAX_ACTIVITY_DEPTH:
+        raise ValueError("Activity depth limit exceeded.")
+    await conn.execute(delete(ActivityClosure))
+    await conn.execute(
+        insert(ActivityClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(
+                closure.c.ancestor_id, closure.c.descendant_id, closure.c.depth
+            ),
+        )
+    )
+
+
+async def _sync_id_sequences(conn: AsyncConnection) -> None:
+    # Imported rows carry their own ids; keep later inserts clear of them.
+    for target in (Activity, Building, Agency):
+        sequence = func.pg_get_serial_sequence(target.__tablename__, "id")
+        await conn.execute(select(func.setval(sequence, func.max(target.id))))
+
+
+async def bulk_import(
+    conn: AsyncConnection,
+    sources: Mapping[str, Records],
+) -> ImportStats:
+    """Copy ``sources`` (``STAGING_TABLES`` key -> records) and merge them.
+
+    Runs in the caller's transaction; nothing is visible until it
+    commits, and a failed check or constraint leaves no partial import.
+    The staging tables are dropped at the end, so several imports can
+    share one transaction.
+    """
+    stats = ImportStats()
+    await conn.run_sync(partial(staging.create_all, checkfirst=False))
+    started = time.perf_counter()
+    for kind, records in sources.items():
+        stats.rows[kind] = await copy_records(
+            conn, STAGING_TABLES[kind], records
+        )
+    stats.copy_s = time.perf_counter() - started
+    started = time.perf_counter()
+    for kind in stats.rows:
+        await _prepare_staged(conn, STAGING_TABLES[kind])
+    await _check_references(conn)
+    for kind, merge in _MERGES.items():
+        if stats.rows.get(kind):
+            for stmt in merge():
+                await conn.execute(stmt)
+    if stats.rows.get("activity"):
+        await rebuild_activity_closure(conn)
+    await _sync_id_sequences(conn)
+    await conn.run_sync(partial(staging.drop_all, checkfirst=False))
+    stats.merge_s = time.perf_counter() - started
+    return stats
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from pydantic import PostgresDsn
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    QueuePool,
+)
+
+from api import timing
+from api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    @property
+    def mean_wait_s(self) -> float:
+        return self.wait_s / self.checkouts if self.checkouts else 0.0
+
+    def record(self, wait_s: float) -> None:
+        self.checkouts += 1
+        self.wait_s += wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection.
+
+    The wait includes opening a new connection when the pool grows. The
+    stats survive ``engine.dispose()``, which recreates the pool.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.record(waited)
+            timing.add("session", waited)
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        if isinstance(pool, TimedQueuePool):
+            pool.stats = self.stats
+        return pool
+
+
+def _statement_name() -> str:
+    # Unique names, so a pooler handing out other server connections
+    # never sees the same statement name twice.
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _pool_args() -> dict[str, Any]:
+    if settings.PG_TRANSACTION_POOLER:
+        # The external pooler owns the connections; see the SQLAlchemy
+        # asyncpg notes on pgbouncer.
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _statement_name,
+            },
+        }
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.PG_POOL_SIZE,
+        "max_overflow": settings.PG_MAX_OVERFLOW,
+        "pool_timeout": settings.PG_POOL_TIMEOUT_S,
+        "pool_recycle": settings.PG_POOL_RECYCLE_S,
+        "pool_pre_ping": settings.PG_PRE_PING == "checkout",
+        "connect_args": {
+            "prepared_statement_cache_size": settings.PG_STATEMENT_CACHE_SIZE
+        },
+    }
+
+
+def create_engine(
+    url: PostgresDsn | None = None, **kwargs: Any
+) -> AsyncEngine:
+    """Engine for ``url`` (``PG_URL`` by default) configured by ``settings``.
+
+    ``SQL_COMPILED_CACHE_SIZE`` bounds SQLAlchemy's compiled SQL cache;
+    ``PG_STATEMENT_CACHE_SIZE`` bounds asyncpg's per-connection cache of
+    prepared statements. With ``PG_TRANSACTION_POOLER`` the engine keeps
+    no pool of its own and no prepared statements between queries.
+    """
+    return create_async_engine(
+        (url or settings.PG_URL).unicode_string(),
+        query_cache_size=settings.SQL_COMPILED_CACHE_SIZE,
+        **_pool_args(),
+        **kwargs,
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats | None:
+    pool = engine.pool
+    return pool.stats if isinstance(pool, TimedQueuePool) else None
+
+
+async def ping_forever(engine: AsyncEngine, interval_s: float) -> None:
+    """Check the database every ``interval_s`` instead of on checkout.
+
+    A ping that finds a dropped connection invalidates the pool, so the
+    connections checked in before it are replaced on their next checkout
+    rather than failing a request.
+    """
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+        except (SQLAlchemyError, OSError):
+            logger.warning("Database health check failed", exc_info=True)
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import asyncpg
+from pydantic import PostgresDsn
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from api.database.schema.table_writes import WRITES_CHANNEL, notify_tables
+from api.settings import settings
+
+logger = logging.getLogger(__name__)
+
+OnWrite = Callable[[frozenset[str]], None]
+# The listener talks to asyncpg directly, past SQLAlchemy's wrapping.
+_CONNECTION_ERRORS = (
+    SQLAlchemyError,
+    OSError,
+    asyncpg.PostgresError,
+    asyncpg.InterfaceError,
+)
+
+
+def listen_url() -> PostgresDsn | None:
+    """Where ``LISTEN`` can reach the primary, if anywhere.
+
+    A transaction pooler hands each transaction a different server
+    connection, so it needs ``PG_LISTEN_URL`` pointing past it.
+    """
+    if settings.PG_LISTEN_URL is not None:
+        return settings.PG_LISTEN_URL
+    return None if settings.PG_TRANSACTION_POOLER else settings.PG_URL
+
+
+async def _listen(
+    engine: AsyncEngine, on_write: OnWrite, ping_s: float
+) -> None:
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver: Any = raw.driver_connection
+        closed = asyncio.Event()
+
+        def notified(
+            connection: Any, pid: int, channel: str, payload: str
+        ) -> None:
+            on_write(frozenset({payload}))
+
+        driver.add_termination_listener(lambda _: closed.set())
+        await driver.add_listener(WRITES_CHANNEL, notified)
+        # Writes committed while no one was listening went unannounced.
+        on_write(frozenset(notify_tables()))
+        while not closed.is_set():
+            try:
+                await asyncio.wait_for(closed.wait(), ping_s)
+            except TimeoutError:
+                # Outside a transaction: one would hold notifications
+                # back until it ends.
+                await driver.execute("SELECT 1")
+
+
+async def listen_forever(
+    url: PostgresDsn,
+    on_write: OnWrite,
+    retry_s: float,
+) -> None:
+    """Call ``on_write`` with the tables each committed write touched.
+
+    Covers writes from every process: other workers, the importer and
+    ad-hoc scripts. The listener holds one connection of its own,
+    outside the pool, pinged every ``retry_s`` to notice a dead link.
+    """
+    engine = create_async_engine(url.unicode_string(), poolclass=NullPool)
+    try:
+        while True:
+            try:
+                await _listen(engine, on_write, retry_s)
+            except _CONNECTION_ERRORS:
+                logger.warning("Table write listener failed", exc_info=True)
+            await asyncio.sleep(retry_s)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,61 @@
+from collections.abc import Sequence
+from typing import Any, Literal
+
+from sqlalchemy import BigInteger, any_, bindparam, exists, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+
+from api.database.schema.actiivty import ActivityClosure
+from api.database.schema.agency import AgencyActivity
+
+# How an activity filter matches: the activity alone, its subtree through
+# ``activity_closure``, or an explicit list of descendant ids.
+ActivityMatch = Literal["exact", "subtree", "descendants"]
+
+ACTIVITY_ID = bindparam("activity_id", type_=BigInteger)
+DESCENDANT_IDS = bindparam("descendant_ids", type_=ARRAY(BigInteger))
+
+
+def activity_match(
+    include_descendants: bool,
+    descendant_ids: Sequence[int] | None,
+) -> ActivityMatch:
+    if not include_descendants:
+        return "exact"
+    return "subtree" if descendant_ids is None else "descendants"
+
+
+def activity_params(
+    activity_id: int,
+    descendant_ids: Sequence[int] | None,
+) -> dict[str, Any]:
+    return {
+        "activity_id": activity_id,
+        "descendant_ids": None
+        if descendant_ids is None
+        else list(descendant_ids),
+    }
+
+
+def agency_activity_filter(
+    agency_id: ColumnElement[int] | InstrumentedAttribute[int],
+    match: ActivityMatch,
+) -> ColumnElement[bool]:
+    """Agencies with the ``activity_id`` or ``descendant_ids`` parameter.
+
+    The descendant ids travel as one array parameter, so the statement
+    stays the same whatever the size of the subtree.
+    """
+    stmt = select(1).select_from(AgencyActivity)
+    stmt = stmt.where(AgencyActivity.agency_id == agency_id)
+    if match == "descendants":
+        stmt = stmt.where(AgencyActivity.activity_id == any_(DESCENDANT_IDS))
+    elif match == "subtree":
+        stmt = stmt.join(
+            ActivityClosure,
+            ActivityClosure.descendant_id == AgencyActivity.activity_id,
+        ).where(ActivityClosure.ancestor_id == ACTIVITY_ID)
+    else:
+        stmt = stmt.where(AgencyActivity.activity_id == ACTIVITY_ID)
+    return exists(stmt)
@@ -1,11 +1,73 @@
+from collections.abc import Callable, Sequence
 from typing import Any
 
-from sqlalchemy import Select, String, cast, exists, func, literal, select
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    Integer,
+    Select,
+    String,
+    Text,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    JSONB,
+    aggregate_order_by,
+    array,
+)
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import ColumnElement, Subquery
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.sql.selectable import CTE, LateralFromClause
 
-from api.database.queries.geo import apply_geo_filter
+from api.database.queries.activity_filter import (
+    ACTIVITY_ID,
+    DESCENDANT_IDS,
+    ActivityMatch,
+    activity_match,
+    activity_params,
+    agency_activity_filter,
+)
+from api.database.queries.geo import (
+    GeoShape,
+    geo_filter,
+    geo_params,
+    geo_shape,
+    knn_distance,
+)
+from api.database.queries.pagination import (
+    AFTER_ID,
+    LIMIT,
+    apply_keyset,
+    keyset_params,
+)
+from api.database.queries.rendering import (
+    JsonPage,
+    json_array,
+    json_float,
+    json_int,
+    json_items,
+    json_nullable,
+    json_object,
+    json_text,
+)
+from api.database.queries.statements import prebuilt
+from api.database.queries.streaming import RowBatches, stream_rows
 from api.database.schema.actiivty import (
     Activity,
     ActivityClosure,
@@ -19,57 +81,83 @@ from api.database.schema.agency import (
     AgencyName,
     AgencyPhone,
 )
+from api.database.schema.agency_card import AgencyCard
+from api.database.schema.base import Base
 from api.database.schema.building import (
     Building,
     BuildingAddress,
     BuildingGeo,
 )
-from api.models.agency import AgencyGeoQuery
+from api.models.agency import AgencyGeoQuery, AgencyNearestQuery
+from api.models.pagination import DEFAULT_PAGE_LIMIT
+from api.settings import settings
+from api.timing import phase
+
+OrderBy = Callable[[Subquery], list[ColumnElement[Any]]]
+# Number of rows behind a set of agencies and a digest of their versions.
+AgencyVersion = tuple[int, str]
+Params = dict[str, Any]
 
+_BUILDING_ID: BindParameter[int] = bindparam("building_id")
+_AGENCY_ID: BindParameter[int] = bindparam("agency_id")
+_AGENCY_IDS = bindparam("agency_ids", type_=ARRAY(BigInteger))
+_NAME = bindparam("name", type_=String)
+_NAME_PATTERN = bindparam("name_pattern", type_=String)
+_THRESHOLD = bindparam("threshold", type_=String)
+_AFTER_KEY = bindparam("after_key", type_=String)
+_AFTER_RANK = bindparam("after_rank", type_=Float)
 
-def _agency_phones_subquery() -> Subquery:
+
+def _agency_phones_lateral(agency_id: ColumnElement[int]) -> LateralFromClause:
     return (
         select(
-            AgencyPhone.agency_id,
-            func.array_agg(AgencyPhone.phone).label("phones"),
+            func.array_agg(
+                aggregate_order_by(AgencyPhone.phone, AgencyPhone.id)
+            ).label("phones"),
         )
-        .group_by(AgencyPhone.agency_id)
-        .subquery()
+        .where(AgencyPhone.agency_id == agency_id)
+        .lateral("agency_phones")
     )
 
 
-def _agency_activities_subquery() -> Subquery:
+def _agency_activities_lateral(
+    agency_id: ColumnElement[int],
+) -> LateralFromClause:
     return (
         select(
-            AgencyActivity.agency_id,
             func.jsonb_agg(
-                func.jsonb_build_object(
-                    "id",
+                aggregate_order_by(
+                    func.jsonb_build_object(
+                        "id",
+                        Activity.id,
+                        "name",
+                        ActivityName.name,
+                        "parent_id",
+                        ActivityParent.parent_id,
+                    ),
                     Activity.id,
-                    "name",
-                    ActivityName.name,
-                    "parent_id",
-                    ActivityParent.parent_id,
                 )
             ).label("activities"),
         )
+        .select_from(AgencyActivity)
         .join(Activity, Activity.id == AgencyActivity.activity_id)
         .join(ActivityName, ActivityName.activity_id == Activity.id)
         .outerjoin(ActivityParent, ActivityParent.activity_id == Activity.id)
-        .group_by(AgencyActivity.agency_id)
-        .subquery()
+        .where(AgencyActivity.agency_id == agency_id)
+        .lateral("agency_activities")
     )
 
 
-def _agency_select() -> Select[Any]:
-    phones = _agency_phones_subquery()
-    activities = _agency_activities_subquery()
+def _hydrate_agencies(matched: Subquery) -> Select[Any]:
+    phones = _agency_phones_lateral(matched.c.id)
+    activities = _agency_activities_lateral(matched.c.id)
     empty_phones = cast(literal("{}"), ARRAY(String))
     empty_activities = cast(literal("[]"), JSONB)
+    sort_columns = [column for column in matched.c if column.key != "id"]
 
     return (
         select(
-            Agency.id.label("id"),
+            matched.c.id.label("id"),
             AgencyName.name.label("name"),
             func.coalesce(phones.c.phones, empty_phones).label("phones"),
             func.jsonb_build_object(
@@ -85,78 +173,749 @@ def _agency_select() -> Select[Any]:
             func.coalesce(activities.c.activities, empty_activities).label(
                 "activities"
             ),
+            *sort_columns,
         )
-        .join(AgencyName, AgencyName.agency_id == Agency.id)
-        .join(AgencyBuilding, AgencyBuilding.agency_id == Agency.id)
+        .select_from(matched)
+        .join(AgencyName, AgencyName.agency_id == matched.c.id)
+        .join(AgencyBuilding, AgencyBuilding.agency_id == matched.c.id)
         .join(Building, Building.id == AgencyBuilding.building_id)
         .join(BuildingAddress, BuildingAddress.building_id == Building.id)
         .join(BuildingGeo, BuildingGeo.building_id == Building.id)
-        .outerjoin(phones, phones.c.agency_id == Agency.id)
-        .outerjoin(activities, activities.c.agency_id == Agency.id)
+        .outerjoin(phones, true())
+        .outerjoin(activities, true())
     )
 
 
-def _activity_filter(
-    activity_id: int,
-    include_descendants: bool,
-) -> ColumnElement[bool]:
-    stmt = select(1).select_from(AgencyActivity)
-    stmt = stmt.where(AgencyActivity.agency_id == Agency.id)
-    if include_descendants:
-        stmt = stmt.join(
-            ActivityClosure,
-            ActivityClosure.descendant_id == AgencyActivity.activity_id,
-        ).where(ActivityClosure.ancestor_id == activity_id)
+def _card_ids() -> Select[Any]:
+    return select(
+        AgencyCard.agency_id.label("id"),
+        AgencyCard.document.label("document"),
+    )
+
+
+def _hydrate_cards(matched: Subquery) -> Select[Any]:
+    sort_columns = [column for column in matched.c if column.key != "id"]
+    if "document" in matched.c:
+        return select(*sort_columns).select_from(matched)
+    return (
+        select(AgencyCard.document.label("document"), *sort_columns)
+        .select_from(matched)
+        .join(AgencyCard, AgencyCard.agency_id == matched.c.id)
+    )
+
+
+def _card_row(row: RowMapping) -> dict[str, Any]:
+    card = dict(row)
+    return {**card.pop("document"), **card}
+
+
+def _use_cards() -> bool:
+    return settings.AGENCY_READ_MODEL == "card"
+
+
+def _by_id(matched: Subquery) -> list[ColumnElement[Any]]:
+    return [matched.c.id]
+
+
+def _by_distance(matched: Subquery) -> list[ColumnElement[Any]]:
+    return [matched.c.distance_m, matched.c.id]
+
+
+def _by_sort_key(matched: Subquery) -> list[ColumnElement[Any]]:
+    return [matched.c.sort_key, matched.c.id]
+
+
+def _by_rank(matched: Subquery) -> list[ColumnElement[Any]]:
+    return [matched.c.rank.desc(), matched.c.id]
+
+
+def _agency_list(
+    ids: Select[Any],
+    cards: bool,
+    order_by: OrderBy = _by_id,
+) -> Select[Any]:
+    matched = ids.subquery("matched")
+    hydrate = _hydrate_cards if cards else _hydrate_agencies
+    return hydrate(matched).order_by(*order_by(matched))
+
+
+async def _fetch_agencies(
+    session: AsyncSession,
+    stmt: Select[Any],
+    params: Params,
+    cards: bool,
+) -> list[dict[str, Any]]:
+    result = await session.execute(stmt, params)
+    row = _card_row if cards else dict
+    with phase("rows"):
+        return [row(mapping) for mapping in result.mappings().all()]
+
+
+def _agency_documents(matched: Subquery) -> Select[Any]:
+    phones = (
+        select(
+            json_items(json_text(AgencyPhone.phone), AgencyPhone.id).label(
+                "phones"
+            )
+        )
+        .where(AgencyPhone.agency_id == matched.c.id)
+        .lateral("agency_phones")
+    )
+    activity = json_object(
+        id=json_int(Activity.id),
+        name=json_text(ActivityName.name),
+        parent_id=json_nullable(json_int(ActivityParent.parent_id)),
+    )
+    activities = (
+        select(json_items(activity, Activity.id).label("activities"))
+        .select_from(AgencyActivity)
+        .join(Activity, Activity.id == AgencyActivity.activity_id)
+        .join(ActivityName, ActivityName.activity_id == Activity.id)
+        .outerjoin(ActivityParent, ActivityParent.activity_id == Activity.id)
+        .where(AgencyActivity.agency_id == matched.c.id)
+        .lateral("agency_activities")
+    )
+    document = json_object(
+        id=json_int(matched.c.id),
+        name=json_text(AgencyName.name),
+        phones=json_array(phones.c.phones),
+        building=json_object(
+            id=json_int(AgencyBuilding.building_id),
+            address=json_text(BuildingAddress.address),
+            lat=json_float(func.ST_Y(BuildingGeo.geom)),
+            lon=json_float(func.ST_X(BuildingGeo.geom)),
+        ),
+        activities=json_array(activities.c.activities),
+    )
+    return (
+        select(matched.c.id.label("id"), document.label("document"))
+        .select_from(matched)
+        .join(AgencyName, AgencyName.agency_id == matched.c.id)
+        .join(AgencyBuilding, AgencyBuilding.agency_id == matched.c.id)
+        .join(
+            BuildingAddress,
+            BuildingAddress.building_id == AgencyBuilding.building_id,
+        )
+        .join(
+            BuildingGeo, BuildingGeo.building_id == AgencyBuilding.building_id
+        )
+        .outerjoin(phones, true())
+        .outerjoin(activities, true())
+    )
+
+
+def _card_elements(document: ColumnElement[Any], name: str) -> Any:
+    return func.jsonb_array_elements(document).table_valued(
+        column("value", JSONB), with_ordinality="ordinality", name=name
+    )
+
+
+def _card_documents(matched: Subquery) -> Select[Any]:
+    # The stored jsonb is re-rendered: jsonb text output is not compact
+    # and orders keys by length.
+    card = AgencyCard.document
+    phone = _card_elements(card["phones"], "card_phone")
+    phones = (
+        select(
+            json_items(cast(phone.c.value, Text), phone.c.ordinality).label(
+                "phones"
+            )
+        )
+        .select_from(phone)
+        .lateral("card_phones")
+    )
+    activity = _card_elements(card["activities"], "card_activity")
+    activity_json = json_object(
+        id=cast(activity.c.value["id"], Text),
+        name=cast(activity.c.value["name"], Text),
+        parent_id=cast(activity.c.value["parent_id"], Text),
+    )
+    activities = (
+        select(
+            json_items(activity_json, activity.c.ordinality).label(
+                "activities"
+            )
+        )
+        .select_from(activity)
+        .lateral("card_activities")
+    )
+    document = json_object(
+        id=json_int(AgencyCard.agency_id),
+        name=cast(card["name"], Text),
+        phones=json_array(phones.c.phones),
+        building=json_object(
+            id=json_int(AgencyCard.building_id),
+            address=cast(card["building"]["address"], Text),
+            lat=json_float(func.ST_Y(AgencyCard.geom)),
+            lon=json_float(func.ST_X(AgencyCard.geom)),
+        ),
+        activities=json_array(activities.c.activities),
+    )
+    return (
+        select(matched.c.id.label("id"), document.label("document"))
+        .select_from(matched)
+        .join(AgencyCard, AgencyCard.agency_id == matched.c.id)
+        .outerjoin(phones, true())
+        .outerjoin(activities, true())
+    )
+
+
+def _agency_page(ids: Select[Any], cards: bool) -> Select[Any]:
+    """An id-ordered page rendered as the ``list[AgencyOut]`` JSON body."""
+    matched = ids.subquery("matched")
+    if cards:
+        documents = _card_documents(matched).subquery("documents")
+    else:
+        documents = _agency_documents(matched).subquery("documents")
+    return select(
+        json_array(json_items(documents.c.document, documents.c.id)),
+        func.count(),
+        func.max(documents.c.id),
+    )
+
+
+async def _render_agencies(
+    session: AsyncSession,
+    stmt: Select[Any],
+    params: Params,
+) -> JsonPage:
+    body, count, last_id = (await session.execute(stmt, params)).one()
+    return JsonPage(body=body.encode(), count=count, last_id=last_id)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _card_activity_filter(match: ActivityMatch) -> ColumnElement[bool]:
+    condition: ColumnElement[bool]
+    if match == "descendants":
+        condition = AgencyCard.activity_ids.overlap(DESCENDANT_IDS)
+    elif match == "subtree":
+        subtree = (
+            select(func.array_agg(ActivityClosure.descendant_id))
+            .where(ActivityClosure.ancestor_id == ACTIVITY_ID)
+            .scalar_subquery()
+        )
+        condition = AgencyCard.activity_ids.overlap(subtree)
+    else:
+        condition = AgencyCard.activity_ids.contains(array([ACTIVITY_ID]))
+    return condition
+
+
+def _row_version(
+    table: type[Base], key: InstrumentedAttribute[int]
+) -> ColumnElement[str]:
+    # ``xmin`` is the transaction that wrote the row version: unlike
+    # ``updated_at`` it changes on every write, whenever that commits.
+    name = table.__tablename__
+    xmin = cast(literal_column(f"{name}.xmin"), Text)
+    return func.concat(f"{name}:", key, ":", xmin).label("version")
+
+
+def _digest(versions: Subquery) -> Select[Any]:
+    ordered = aggregate_order_by(literal(","), versions.c.version)
+    return select(
+        func.count(),
+        func.md5(func.string_agg(versions.c.version, ordered)),
+    )
+
+
+def _agency_versions(matched: CTE) -> Select[Any]:
+    agency_ids = select(matched.c.id)
+    building_ids = select(AgencyBuilding.building_id).where(
+        AgencyBuilding.agency_id.in_(agency_ids)
+    )
+    activity_ids = select(AgencyActivity.activity_id).where(
+        AgencyActivity.agency_id.in_(agency_ids)
+    )
+    versions = union_all(
+        select(_row_version(Agency, Agency.id)).where(
+            Agency.id.in_(agency_ids)
+        ),
+        *(
+            select(_row_version(table, table.id)).where(
+                table.agency_id.in_(agency_ids)
+            )
+            for table in (
+                AgencyName,
+                AgencyPhone,
+                AgencyBuilding,
+                AgencyActivity,
+            )
+        ),
+        *(
+            select(_row_version(table, table.id)).where(
+                table.building_id.in_(building_ids)
+            )
+            for table in (BuildingAddress, BuildingGeo)
+        ),
+        *(
+            select(_row_version(table, table.id)).where(
+                table.activity_id.in_(activity_ids)
+            )
+            for table in (ActivityName, ActivityParent)
+        ),
+    ).subquery("versions")
+    return _digest(versions)
+
+
+def _card_versions(matched: CTE) -> Select[Any]:
+    versions = (
+        select(_row_version(AgencyCard, AgencyCard.agency_id))
+        .where(AgencyCard.agency_id.in_(select(matched.c.id)))
+        .subquery("versions")
+    )
+    return _digest(versions)
+
+
+def _agency_version(ids: Select[Any], cards: bool) -> Select[Any]:
+    matched = ids.cte("matched")
+    return _card_versions(matched) if cards else _agency_versions(matched)
+
+
+async def _fetch_version(
+    session: AsyncSession,
+    stmt: Select[Any],
+    params: Params,
+) -> AgencyVersion | None:
+    count, digest = (await session.execute(stmt, params)).one()
+    if not count:
+        return None
+    return count, digest
+
+
+def _building_ids(cards: bool, after: bool) -> Select[Any]:
+    if cards:
+        ids = _card_ids().where(AgencyCard.building_id == _BUILDING_ID)
+        return apply_keyset(ids, AgencyCard.agency_id, after)
+    ids = select(AgencyBuilding.agency_id.label("id")).where(
+        AgencyBuilding.building_id == _BUILDING_ID
+    )
+    return apply_keyset(ids, AgencyBuilding.agency_id, after)
+
+
+def _activity_ids(
+    cards: bool, match: ActivityMatch, after: bool
+) -> Select[Any]:
+    if cards:
+        ids = _card_ids().where(_card_activity_filter(match))
+        return apply_keyset(ids, AgencyCard.agency_id, after)
+    ids = select(Agency.id).where(agency_activity_filter(Agency.id, match))
+    return apply_keyset(ids, Agency.id, after)
+
+
+def _geo_matches(cards: bool, shape: GeoShape) -> Select[Any]:
+    if cards:
+        return geo_filter(_card_ids(), AgencyCard.geom, shape)
+    ids = select(AgencyBuilding.agency_id.label("id")).join(
+        BuildingGeo, BuildingGeo.building_id == AgencyBuilding.building_id
+    )
+    return geo_filter(ids, BuildingGeo.geom, shape)
+
+
+def _geo_ids(cards: bool, shape: GeoShape, after: bool) -> Select[Any]:
+    key = AgencyCard.agency_id if cards else AgencyBuilding.agency_id
+    return apply_keyset(_geo_matches(cards, shape), key, after)
+
+
+def _name_ids(after: bool) -> Select[Any]:
+    ids = select(AgencyName.agency_id.label("id")).where(
+        AgencyName.name.ilike(_NAME_PATTERN)
+    )
+    return apply_keyset(ids, AgencyName.agency_id, after)
+
+
+def _nearest_ids(cards: bool, match: ActivityMatch | None) -> Select[Any]:
+    if cards:
+        distance = knn_distance(AgencyCard.geom)
+        ids = _card_ids().add_columns(distance.label("distance_m"))
+        if match is not None:
+            ids = ids.where(_card_activity_filter(match))
     else:
-        stmt = stmt.where(AgencyActivity.activity_id == activity_id)
-    return exists(stmt)
+        distance = knn_distance(BuildingGeo.geom)
+        ids = select(
+            AgencyBuilding.agency_id.label("id"),
+            distance.label("distance_m"),
+        ).join(
+            BuildingGeo,
+            BuildingGeo.building_id == AgencyBuilding.building_id,
+        )
+        if match is not None:
+            ids = ids.where(
+                agency_activity_filter(AgencyBuilding.agency_id, match)
+            )
+    return ids.order_by(distance).limit(LIMIT)
+
+
+def _name_prefix_ids(after: bool) -> Select[Any]:
+    sort_key = func.lower(AgencyName.name).collate("C")
+    ids = select(
+        AgencyName.agency_id.label("id"),
+        sort_key.label("sort_key"),
+    ).where(sort_key.like(func.lower(_NAME_PATTERN)))
+    if after:
+        ids = ids.where(
+            tuple_(sort_key, AgencyName.agency_id)
+            > tuple_(_AFTER_KEY, AFTER_ID)
+        )
+    return ids.order_by(sort_key, AgencyName.agency_id).limit(LIMIT)
+
+
+def _name_similarity_ids(after: bool) -> Select[Any]:
+    rank = func.similarity(AgencyName.name, _NAME)
+    ids = select(
+        AgencyName.agency_id.label("id"),
+        rank.label("rank"),
+    ).where(AgencyName.name.op("%")(_NAME))
+    if after:
+        ids = ids.where(
+            or_(
+                rank < _AFTER_RANK,
+                and_(rank == _AFTER_RANK, AgencyName.agency_id > AFTER_ID),
+            )
+        )
+    return ids.order_by(rank.desc(), AgencyName.agency_id).limit(LIMIT)
+
+
+def _building_version_ids(cards: bool, after: bool) -> Select[Any]:
+    if cards:
+        ids = select(AgencyCard.agency_id.label("id")).where(
+            AgencyCard.building_id == _BUILDING_ID
+        )
+        return apply_keyset(ids, AgencyCard.agency_id, after)
+    ids = select(AgencyBuilding.agency_id.label("id")).where(
+        AgencyBuilding.building_id == _BUILDING_ID
+    )
+    return apply_keyset(ids, AgencyBuilding.agency_id, after)
+
+
+def _agency_ids(cards: bool) -> Select[Any]:
+    if cards:
+        return select(AgencyCard.agency_id.label("id")).where(
+            AgencyCard.agency_id == _AGENCY_ID
+        )
+    return select(Agency.id).where(Agency.id == _AGENCY_ID)
 
 
 async def list_agencies_by_building(
     session: AsyncSession,
     building_id: int,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
 ) -> list[dict[str, Any]]:
-    stmt = _agency_select().where(AgencyBuilding.building_id == building_id)
-    result = await session.execute(stmt)
-    return [dict(row) for row in result.mappings().all()]
+    cards, after = _use_cards(), after_id is not None
+    stmt = prebuilt(
+        "list_agencies_by_building",
+        (cards, after),
+        lambda: _agency_list(_building_ids(cards, after), cards),
+    )
+    params = {"building_id": building_id} | keyset_params(limit, after_id)
+    return await _fetch_agencies(session, stmt, params, cards)
+
+
+async def render_agencies_by_building(
+    session: AsyncSession,
+    building_id: int,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+) -> JsonPage:
+    cards, after = _use_cards(), after_id is not None
+    stmt = prebuilt(
+        "render_agencies_by_building",
+        (cards, after),
+        lambda: _agency_page(_building_ids(cards, after), cards),
+    )
+    params = {"building_id": building_id} | keyset_params(limit, after_id)
+    return await _render_agencies(session, stmt, params)
 
 
 async def list_agencies_by_activity(
     session: AsyncSession,
     activity_id: int,
     include_descendants: bool,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+    descendant_ids: Sequence[int] | None = None,
 ) -> list[dict[str, Any]]:
-    stmt = _agency_select().where(
-        _activity_filter(activity_id, include_descendants)
+    cards, after = _use_cards(), after_id is not None
+    match = activity_match(include_descendants, descendant_ids)
+    stmt = prebuilt(
+        "list_agencies_by_activity",
+        (cards, match, after),
+        lambda: _agency_list(_activity_ids(cards, match, after), cards),
+    )
+    params = activity_params(activity_id, descendant_ids) | keyset_params(
+        limit, after_id
+    )
+    return await _fetch_agencies(session, stmt, params, cards)
+
+
+async def render_agencies_by_activity(
+    session: AsyncSession,
+    activity_id: int,
+    include_descendants: bool,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+    descendant_ids: Sequence[int] | None = None,
+) -> JsonPage:
+    cards, after = _use_cards(), after_id is not None
+    match = activity_match(include_descendants, descendant_ids)
+    stmt = prebuilt(
+        "render_agencies_by_activity",
+        (cards, match, after),
+        lambda: _agency_page(_activity_ids(cards, match, after), cards),
+    )
+    params = activity_params(activity_id, descendant_ids) | keyset_params(
+        limit, after_id
     )
-    result = await session.execute(stmt)
-    return [dict(row) for row in result.mappings().all()]
+    return await _render_agencies(session, stmt, params)
 
 
 async def list_agencies_by_geo(
     session: AsyncSession,
     geo: AgencyGeoQuery,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+) -> list[dict[str, Any]]:
+    cards, shape, after = _use_cards(), geo_shape(geo), after_id is not None
+    stmt = prebuilt(
+        "list_agencies_by_geo",
+        (cards, shape, after),
+        lambda: _agency_list(_geo_ids(cards, shape, after), cards),
+    )
+    params = geo_params(geo) | keyset_params(limit, after_id)
+    return await _fetch_agencies(session, stmt, params, cards)
+
+
+async def render_agencies_by_geo(
+    session: AsyncSession,
+    geo: AgencyGeoQuery,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+) -> JsonPage:
+    cards, shape, after = _use_cards(), geo_shape(geo), after_id is not None
+    stmt = prebuilt(
+        "render_agencies_by_geo",
+        (cards, shape, after),
+        lambda: _agency_page(_geo_ids(cards, shape, after), cards),
+    )
+    params = geo_params(geo) | keyset_params(limit, after_id)
+    return await _render_agencies(session, stmt, params)
+
+
+def _stream_statement(cards: bool, shape: GeoShape) -> Select[Any]:
+    matched = _geo_matches(cards, shape).subquery("matched")
+    if cards:
+        return _hydrate_cards(matched)
+    return _hydrate_agencies(matched)
+
+
+def stream_agencies_by_geo(
+    session: AsyncSession,
+    geo: AgencyGeoQuery,
+) -> RowBatches:
+    """Every agency in ``geo``, unpaged and in no particular order.
+
+    Leaving out ``ORDER BY`` lets Postgres send the first rows straight
+    from the index scan instead of sorting the whole match first.
+    """
+    cards, shape = _use_cards(), geo_shape(geo)
+    stmt = prebuilt(
+        "stream_agencies_by_geo",
+        (cards, shape),
+        lambda: _stream_statement(cards, shape),
+    )
+    row = _card_row if cards else dict
+    return stream_rows(session, stmt, row, params=geo_params(geo))
+
+
+async def list_agencies_nearest(
+    session: AsyncSession,
+    query: AgencyNearestQuery,
+    descendant_ids: Sequence[int] | None = None,
 ) -> list[dict[str, Any]]:
-    stmt = _agency_select()
-    stmt = apply_geo_filter(stmt, geo, BuildingGeo.geom)
-    result = await session.execute(stmt)
-    return [dict(row) for row in result.mappings().all()]
+    cards = _use_cards()
+    params: Params = {"lat": query.lat, "lon": query.lon, "limit": query.limit}
+    match = None
+    if query.activity_id is not None:
+        match = activity_match(query.include_descendants, descendant_ids)
+        params |= activity_params(query.activity_id, descendant_ids)
+    stmt = prebuilt(
+        "list_agencies_nearest",
+        (cards, match),
+        lambda: _agency_list(_nearest_ids(cards, match), cards, _by_distance),
+    )
+    return await _fetch_agencies(session, stmt, params, cards)
+
+
+def _name_params(
+    name: str, limit: int, after_id: int | None
+) -> dict[str, Any]:
+    pattern = f"%{_escape_like(name)}%"
+    return {"name_pattern": pattern} | keyset_params(limit, after_id)
 
 
 async def list_agencies_by_name(
     session: AsyncSession,
     name: str,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
 ) -> list[dict[str, Any]]:
-    stmt = _agency_select().where(AgencyName.name.ilike(f"%{name}%"))
-    result = await session.execute(stmt)
-    return [dict(row) for row in result.mappings().all()]
+    cards, after = _use_cards(), after_id is not None
+    stmt = prebuilt(
+        "list_agencies_by_name",
+        (cards, after),
+        lambda: _agency_list(_name_ids(after), cards),
+    )
+    params = _name_params(name, limit, after_id)
+    return await _fetch_agencies(session, stmt, params, cards)
+
+
+async def render_agencies_by_name(
+    session: AsyncSession,
+    name: str,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+) -> JsonPage:
+    cards, after = _use_cards(), after_id is not None
+    stmt = prebuilt(
+        "render_agencies_by_name",
+        (cards, after),
+        lambda: _agency_page(_name_ids(after), cards),
+    )
+    params = _name_params(name, limit, after_id)
+    return await _render_agencies(session, stmt, params)
+
+
+async def list_agencies_by_name_prefix(
+    session: AsyncSession,
+    prefix: str,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after: tuple[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    cards, paged = _use_cards(), after is not None
+    stmt = prebuilt(
+        "list_agencies_by_name_prefix",
+        (cards, paged),
+        lambda: _agency_list(_name_prefix_ids(paged), cards, _by_sort_key),
+    )
+    params: Params = {
+        "name_pattern": f"{_escape_like(prefix)}%",
+        "limit": limit,
+    }
+    if after is not None:
+        params["after_key"], params["after_id"] = after
+    return await _fetch_agencies(session, stmt, params, cards)
+
+
+async def list_agencies_by_name_similarity(
+    session: AsyncSession,
+    name: str,
+    min_similarity: float,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after: tuple[float, int] | None = None,
+) -> list[dict[str, Any]]:
+    threshold = prebuilt(
+        "set_similarity_threshold",
+        (),
+        lambda: select(
+            func.set_config("pg_trgm.similarity_threshold", _THRESHOLD, True)
+        ),
+    )
+    await session.execute(threshold, {"threshold": str(min_similarity)})
+    cards, paged = _use_cards(), after is not None
+    stmt = prebuilt(
+        "list_agencies_by_name_similarity",
+        (cards, paged),
+        lambda: _agency_list(_name_similarity_ids(paged), cards, _by_rank),
+    )
+    params: Params = {"name": name, "limit": limit}
+    if after is not None:
+        params["after_rank"], params["after_id"] = after
+    return await _fetch_agencies(session, stmt, params, cards)
+
+
+async def get_building_agencies_version(
+    session: AsyncSession,
+    building_id: int,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+) -> AgencyVersion | None:
+    cards, after = _use_cards(), after_id is not None
+    stmt = prebuilt(
+        "get_building_agencies_version",
+        (cards, after),
+        lambda: _agency_version(_building_version_ids(cards, after), cards),
+    )
+    params = {"building_id": building_id} | keyset_params(limit, after_id)
+    return await _fetch_version(session, stmt, params)
+
+
+async def get_agency_version(
+    session: AsyncSession,
+    agency_id: int,
+) -> AgencyVersion | None:
+    cards = _use_cards()
+    stmt = prebuilt(
+        "get_agency_version",
+        (cards,),
+        lambda: _agency_version(_agency_ids(cards), cards),
+    )
+    return await _fetch_version(session, stmt, {"agency_id": agency_id})
 
 
 async def get_agency_by_id(
     session: AsyncSession,
     agency_id: int,
 ) -> dict[str, Any] | None:
-    stmt = _agency_select().where(Agency.id == agency_id)
-    result = await session.execute(stmt)
-    row = result.mappings().one_or_none()
-    return dict(row) if row else None
+    params = {"agency_id": agency_id}
+    if _use_cards():
+        stmt = prebuilt(
+            "get_agency_by_id",
+            (True,),
+            lambda: select(AgencyCard.document).where(
+                AgencyCard.agency_id == _AGENCY_ID
+            ),
+        )
+        card = await session.execute(stmt, params)
+        return card.scalar_one_or_none()
+    stmt = prebuilt(
+        "get_agency_by_id",
+        (False,),
+        lambda: _agency_list(_agency_ids(False), False),
+    )
+    rows = await _fetch_agencies(session, stmt, params, False)
+    return rows[0] if rows else None
+
+
+async def get_agencies_by_ids(
+    session: AsyncSession,
+    agency_ids: Sequence[int],
+) -> list[dict[str, Any]]:
+    """Agencies among ``agency_ids``, ordered by id; unknown ids are skipped.
+
+    The ids travel as one array parameter, so the statement stays the
+    same for any number of them.
+    """
+    cards = _use_cards()
+    params = {"agency_ids": list(agency_ids)}
+    if cards:
+        stmt = prebuilt(
+            "get_agencies_by_ids",
+            (True,),
+            lambda: select(AgencyCard.document)
+            .where(AgencyCard.agency_id == any_(_AGENCY_IDS))
+            .order_by(AgencyCard.agency_id),
+        )
+        cards_result = await session.execute(stmt, params)
+        with phase("rows"):
+            return list(cards_result.scalars().all())
+    stmt = prebuilt(
+        "get_agencies_by_ids",
+        (False,),
+        lambda: _agency_list(
+            select(Agency.id).where(Agency.id == any_(_AGENCY_IDS)), False
+        ),
+    )
+    return await _fetch_agencies(session, stmt, params, False)
@@ -1,11 +1,31 @@
+from collections.abc import Sequence
 from typing import Any
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.database.queries.geo import apply_geo_filter
+from api.cache.building_index import BuildingIndex
+from api.database.queries.activity_filter import (
+    ActivityMatch,
+    activity_match,
+    activity_params,
+    agency_activity_filter,
+)
+from api.database.queries.geo import (
+    GeoShape,
+    geo_filter,
+    geo_params,
+    geo_shape,
+    knn_distance,
+)
+from api.database.queries.pagination import LIMIT, apply_keyset, keyset_params
+from api.database.queries.statements import prebuilt
+from api.database.queries.streaming import RowBatches, stream_rows
+from api.database.schema.agency import AgencyBuilding
 from api.database.schema.building import Building, BuildingAddress, BuildingGeo
-from api.models.building import BuildingGeoQuery
+from api.models.building import BuildingGeoQuery, BuildingNearestQuery
+from api.models.pagination import DEFAULT_PAGE_LIMIT
+from api.timing import phase
 
 
 def _building_select() -> Select[Any]:
@@ -21,11 +41,84 @@ def _building_select() -> Select[Any]:
     )
 
 
+def _geo_statement(shape: GeoShape, after: bool) -> Select[Any]:
+    stmt = geo_filter(_building_select(), BuildingGeo.geom, shape)
+    return apply_keyset(stmt, Building.id, after)
+
+
+def _nearest_statement(match: ActivityMatch | None) -> Select[Any]:
+    distance = knn_distance(BuildingGeo.geom)
+    stmt = _building_select().add_columns(distance.label("distance_m"))
+    if match is not None:
+        stmt = stmt.where(
+            exists(
+                select(1)
+                .select_from(AgencyBuilding)
+                .where(
+                    AgencyBuilding.building_id == Building.id,
+                    agency_activity_filter(AgencyBuilding.agency_id, match),
+                )
+            )
+        )
+    return stmt.order_by(distance).limit(LIMIT)
+
+
 async def list_buildings_by_geo(
     session: AsyncSession,
     geo: BuildingGeoQuery,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    after_id: int | None = None,
+    building_index: BuildingIndex | None = None,
+) -> list[dict[str, Any]]:
+    if building_index is not None:
+        rows = building_index.search(geo, limit, after_id)
+        if rows is not None:
+            return rows
+    shape, after = geo_shape(geo), after_id is not None
+    stmt = prebuilt(
+        "list_buildings_by_geo",
+        (shape, after),
+        lambda: _geo_statement(shape, after),
+    )
+    params = geo_params(geo) | keyset_params(limit, after_id)
+    result = await session.execute(stmt, params)
+    with phase("rows"):
+        return [dict(row) for row in result.mappings().all()]
+
+
+def stream_buildings_by_geo(
+    session: AsyncSession,
+    geo: BuildingGeoQuery,
+) -> RowBatches:
+    """Every building in ``geo``, unpaged and in no particular order."""
+    shape = geo_shape(geo)
+    stmt = prebuilt(
+        "stream_buildings_by_geo",
+        (shape,),
+        lambda: geo_filter(_building_select(), BuildingGeo.geom, shape),
+    )
+    return stream_rows(session, stmt, params=geo_params(geo))
+
+
+async def list_buildings_nearest(
+    session: AsyncSession,
+    query: BuildingNearestQuery,
+    descendant_ids: Sequence[int] | None = None,
 ) -> list[dict[str, Any]]:
-    stmt = _building_select()
-    stmt = apply_geo_filter(stmt, geo, BuildingGeo.geom)
-    result = await session.execute(stmt)
-    return [dict(row) for row in result.mappings().all()]
+    params: dict[str, Any] = {
+        "lat": query.lat,
+        "lon": query.lon,
+        "limit": query.limit,
+    }
+    match = None
+    if query.activity_id is not None:
+        match = activity_match(query.include_descendants, descendant_ids)
+        params |= activity_params(query.activity_id, descendant_ids)
+    stmt = prebuilt(
+        "list_buildings_nearest",
+        (match,),
+        lambda: _nearest_statement(match),
+    )
+    result = await session.execute(stmt, params)
+    with phase("rows"):
+        return [dict(row) for row in result.mappings().all()]
@@ -1,31 +1,50 @@
-from typing import Any
+from typing import Any, Literal
 
-from geoalchemy2 import Geography
-from sqlalchemy import Select, cast, func
+from sqlalchemy import Float, Select, bindparam, func
 from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import ColumnElement
 
 from api.models.geo import GeoQueryBase
 
+GeoShape = Literal["radius", "box"]
 
-def apply_geo_filter(
-    stmt: Select[Any],
-    geo: GeoQueryBase,
-    geom_col: ColumnElement[Any] | InstrumentedAttribute[Any],
-) -> Select[Any]:
+LAT = bindparam("lat", type_=Float)
+LON = bindparam("lon", type_=Float)
+_RADIUS_M = bindparam("radius_m", type_=Float)
+_MIN_LAT = bindparam("min_lat", type_=Float)
+_MAX_LAT = bindparam("max_lat", type_=Float)
+_MIN_LON = bindparam("min_lon", type_=Float)
+_MAX_LON = bindparam("max_lon", type_=Float)
+
+GeoColumn = ColumnElement[Any] | InstrumentedAttribute[Any]
+Coordinate = float | ColumnElement[float]
+
+
+def _point(lat: Coordinate, lon: Coordinate) -> ColumnElement[Any]:
+    return func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+
+
+def knn_distance(
+    geom_col: GeoColumn,
+    lat: Coordinate = LAT,
+    lon: Coordinate = LON,
+) -> ColumnElement[float]:
+    """Sphere distance in meters, ordered by the geography GiST indexes.
+
+    The point defaults to the ``lat`` and ``lon`` parameters.
+    """
+    return func.geography(geom_col).op("<->", return_type=Float)(
+        func.geography(_point(lat, lon))
+    )
+
+
+def geo_shape(geo: GeoQueryBase) -> GeoShape:
     if (
         geo.radius_m is not None
         and geo.lat is not None
         and geo.lon is not None
     ):
-        point = func.ST_SetSRID(func.ST_MakePoint(geo.lon, geo.lat), 4326)
-        return stmt.where(
-            func.ST_DWithin(
-                cast(geom_col, Geography),
-                cast(point, Geography),
-                geo.radius_m,
-            )
-        )
+        return "radius"
     if (
         geo.min_lat is None
         or geo.max_lat is None
@@ -33,11 +52,41 @@ def apply_geo_filter(
         or geo.max_lon is None
     ):
         raise ValueError("Bounding box parameters are required.")
+    return "box"
+
+
+def geo_params(geo: GeoQueryBase) -> dict[str, Any]:
+    if geo_shape(geo) == "radius":
+        return {"lat": geo.lat, "lon": geo.lon, "radius_m": geo.radius_m}
+    return {
+        "min_lat": geo.min_lat,
+        "max_lat": geo.max_lat,
+        "min_lon": geo.min_lon,
+        "max_lon": geo.max_lon,
+    }
+
+
+def geo_filter(
+    stmt: Select[Any],
+    geom_col: GeoColumn,
+    shape: GeoShape,
+) -> Select[Any]:
+    """Filter by the parameters of ``geo_params`` for a ``shape`` search."""
+    if shape == "radius":
+        # A plain geography() call, not CAST(... AS geography(GEOMETRY,-1)),
+        # so the expression matches the geography(geom) GiST indexes.
+        return stmt.where(
+            func.ST_DWithin(
+                func.geography(geom_col),
+                func.geography(_point(LAT, LON)),
+                _RADIUS_M,
+            )
+        )
     envelope = func.ST_MakeEnvelope(
-        geo.min_lon,
-        geo.min_lat,
-        geo.max_lon,
-        geo.max_lat,
+        _MIN_LON,
+        _MIN_LAT,
+        _MAX_LON,
+        _MAX_LAT,
         4326,
     )
     return stmt.where(func.ST_Intersects(geom_col, envelope))
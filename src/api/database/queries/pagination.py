@@ -0,0 +1,23 @@
+from typing import Any
+
+from sqlalchemy import BigInteger, Integer, Select, bindparam
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+
+LIMIT = bindparam("limit", type_=Integer)
+AFTER_ID = bindparam("after_id", type_=BigInteger)
+
+
+def apply_keyset(
+    stmt: Select[Any],
+    key_col: ColumnElement[int] | InstrumentedAttribute[int],
+    after: bool,
+) -> Select[Any]:
+    """Page by ``key_col`` with the ``limit`` and ``after_id`` parameters."""
+    if after:
+        stmt = stmt.where(key_col > AFTER_ID)
+    return stmt.order_by(key_col).limit(LIMIT)
+
+
+def keyset_params(limit: int, after_id: int | None) -> dict[str, Any]:
+    return {"limit": limit, "after_id": after_id}
@@ -0,0 +1,93 @@
+"""SQL builders for response JSON rendered by Postgres.
+
+The text produced here is byte-identical to pydantic's compact
+``dump_json`` of the matching response model, so routes can hand the
+body straight to the client without building Python objects per row.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Numeric, Text, and_, case, cast, func, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+
+from api.models.pagination import encode_cursor
+
+# pydantic prints plain decimals for 1e-5 <= |x| < 1e16, like ryu does.
+_DECIMAL_MIN = 1e-5
+_DECIMAL_MAX = 1e16
+
+Value = ColumnElement[Any] | InstrumentedAttribute[Any]
+
+
+@dataclass(frozen=True, slots=True)
+class JsonPage:
+    body: bytes
+    count: int
+    last_id: int | None
+
+    def next_cursor(self, limit: int) -> str | None:
+        if self.count < limit or self.last_id is None:
+            return None
+        return encode_cursor(self.last_id)
+
+
+def json_int(value: Value) -> ColumnElement[str]:
+    return cast(value, Text)
+
+
+def json_nullable(value: ColumnElement[str]) -> ColumnElement[str]:
+    return func.coalesce(value, "null")
+
+
+def json_text(value: Value) -> ColumnElement[str]:
+    return cast(func.to_json(value), Text)
+
+
+def json_float(value: ColumnElement[float]) -> ColumnElement[str]:
+    # float8 text is the shortest round-trip form, the same digits
+    # pydantic prints; only the notation needs adjusting.
+    text = cast(value, Text)
+    decimal = cast(cast(text, Numeric), Text)
+    return case(
+        (value == 0, case((text.startswith("-"), "-0.0"), else_="0.0")),
+        (
+            and_(
+                func.abs(value) >= _DECIMAL_MIN,
+                func.abs(value) < _DECIMAL_MAX,
+            ),
+            case(
+                (func.strpos(decimal, ".") > 0, decimal),
+                else_=decimal.concat(".0"),
+            ),
+        ),
+        # "1e-06" / "1e+16" -> "1e-6" / "1e16"
+        else_=func.regexp_replace(text, r"e\+?(-?)0*", r"e\1"),
+    )
+
+
+def json_object(**fields: ColumnElement[str]) -> ColumnElement[str]:
+    parts: list[Any] = []
+    for index, (key, value) in enumerate(fields.items()):
+        prefix = "{" if index == 0 else ","
+        parts.extend((f"{prefix}{json.dumps(key)}:", value))
+    parts.append("}")
+    return func.concat(*parts)
+
+
+def json_items(
+    element: ColumnElement[str],
+    *order_by: Value,
+) -> ColumnElement[str]:
+    """Comma-joined elements of a JSON array, without the brackets."""
+    return func.string_agg(
+        element, aggregate_order_by(literal(","), *order_by)
+    )
+
+
+def json_array(items: ColumnElement[str]) -> ColumnElement[str]:
+    # ``concat`` skips NULL, so an empty aggregate renders as ``[]``.
+    return func.concat("[", items, "]")
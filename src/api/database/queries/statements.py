@@ -0,0 +1,103 @@
+"""Statements built once per shape and per-query cache instrumentation.
+
+A query's *shape* is whatever changes its SQL text: the read model,
+which optional filters are present, radius or bounding box. Every value
+is a bind parameter passed to ``execute``, so the one statement object
+kept per shape serves every request. SQLAlchemy memoizes its cache key
+and finds the compiled SQL without rebuilding anything, and the SQL text
+never changes, so asyncpg keeps reusing its prepared statement.
+"""
+
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Select, event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Execution option naming the query function a statement belongs to.
+QUERY_NAME = "query_name"
+
+_statements: dict[tuple[Hashable, ...], Select[Any]] = {}
+
+
+def prebuilt(
+    name: str,
+    shape: tuple[Hashable, ...],
+    build: Callable[[], Select[Any]],
+) -> Select[Any]:
+    """The statement of ``name`` for ``shape``, built on first use."""
+    key = (name, *shape)
+    stmt = _statements.get(key)
+    if stmt is None:
+        stmt = build().execution_options(**{QUERY_NAME: name})
+        _statements[key] = stmt
+    return stmt
+
+
+@dataclass(slots=True)
+class QueryCacheStats:
+    executions: int = 0
+    compiled_hits: int = 0
+    prepared_hits: int = 0
+
+    @property
+    def compiled_hit_ratio(self) -> float:
+        return self.compiled_hits / self.executions if self.executions else 0.0
+
+    @property
+    def prepared_hit_ratio(self) -> float:
+        return self.prepared_hits / self.executions if self.executions else 0.0
+
+
+class QueryCacheMonitor:
+    """Compiled and prepared statement cache hits, per ``QUERY_NAME``.
+
+    Statements without a query name are counted under ``"other"``.
+    Prepared hits are read from the asyncpg adapter's LRU before the
+    statement runs; drivers without one never count a hit.
+    """
+
+    def __init__(self) -> None:
+        self.queries: dict[str, QueryCacheStats] = {}
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def report(self) -> dict[str, dict[str, float]]:
+        return {
+            name: {
+                "executions": stats.executions,
+                "compiled_hit_ratio": stats.compiled_hit_ratio,
+                "prepared_hit_ratio": stats.prepared_hit_ratio,
+            }
+            for name, stats in sorted(self.queries.items())
+        }
+
+    def _record(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        if context is None:
+            return
+        name = context.execution_options.get(QUERY_NAME, "other")
+        stats = self.queries.get(name)
+        if stats is None:
+            stats = self.queries[name] = QueryCacheStats()
+        stats.executions += 1
+        if getattr(context, "cache_hit", None) is CacheStats.CACHE_HIT:
+            stats.compiled_hits += 1
+        prepared = getattr(
+            conn.connection.dbapi_connection,
+            "_prepared_statement_cache",
+            None,
+        )
+        if prepared is not None and statement in prepared:
+            stats.prepared_hits += 1
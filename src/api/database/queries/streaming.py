@@ -0,0 +1,33 @@
+from collections.abc import AsyncGenerator, Callable, Mapping
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.settings import settings
+
+RowBatches = AsyncGenerator[list[dict[str, Any]]]
+
+
+async def stream_rows(
+    session: AsyncSession,
+    stmt: Select[Any],
+    row: Callable[[RowMapping], dict[str, Any]] = dict,
+    params: Mapping[str, Any] | None = None,
+) -> RowBatches:
+    """Rows of ``stmt`` in batches fetched from a server-side cursor.
+
+    Only one batch is held at a time, and the next one is fetched when
+    the consumer asks for it. Closing the generator closes the cursor.
+    """
+    result = await session.stream(
+        stmt,
+        params,
+        execution_options={"yield_per": settings.STREAM_YIELD_PER},
+    )
+    try:
+        async for partition in result.mappings().partitions():
+            yield [row(mapping) for mapping in partition]
+    finally:
+        await result.close()
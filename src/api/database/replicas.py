@@ -0,0 +1,160 @@
+"""Read replicas for GET requests, with read-your-writes tokens.
+
+A write response carries the primary's WAL position after the commit as
+a consistency token (``X-Consistency-Token``). A read that sends it back
+is only routed to a replica whose replayed position has reached it;
+when none has, the read goes to the primary.
+"""
+
+import asyncio
+import itertools
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from pydantic import PostgresDsn
+from sqlalchemy import Text, case, cast, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.pool import QueuePool
+
+from api.database.engine import create_engine
+
+logger = logging.getLogger(__name__)
+
+CONSISTENCY_HEADER = "X-Consistency-Token"
+
+ReplicaPolicy = Literal["round_robin", "least_used"]
+
+_PRIMARY_LSN = select(cast(func.pg_current_wal_lsn(), Text))
+# Also answers on a primary, so a replica DSN may point at one.
+_REPLAYED_LSN = select(
+    cast(
+        case(
+            (func.pg_is_in_recovery(), func.pg_last_wal_replay_lsn()),
+            else_=func.pg_current_wal_lsn(),
+        ),
+        Text,
+    )
+)
+
+
+def parse_lsn(token: str) -> int:
+    """``pg_lsn`` text (``16/B374D848``) as a comparable integer."""
+    high, sep, low = token.partition("/")
+    try:
+        if not sep:
+            raise ValueError
+        return int(high, 16) << 32 | int(low, 16)
+    except ValueError:
+        raise ValueError("Invalid consistency token.") from None
+
+
+@dataclass(slots=True)
+class ReplicaStats:
+    replica_reads: int = 0
+    primary_reads: int = 0
+    lagging_reads: int = 0
+
+    @property
+    def replica_ratio(self) -> float:
+        total = self.replica_reads + self.primary_reads
+        return self.replica_reads / total if total else 0.0
+
+
+@dataclass(slots=True)
+class Replica:
+    engine: AsyncEngine
+    sessions: async_sessionmaker[AsyncSession]
+    healthy: bool = False
+    replayed_lsn: int = 0
+
+    @property
+    def in_use(self) -> int:
+        pool = self.engine.pool
+        return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+    async def check(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                lsn = (await conn.execute(_REPLAYED_LSN)).scalar_one()
+        except (SQLAlchemyError, OSError):
+            if self.healthy:
+                logger.warning("Replica health check failed", exc_info=True)
+            self.healthy = False
+            return
+        self.replayed_lsn = parse_lsn(lsn)
+        self.healthy = True
+
+
+@dataclass(slots=True)
+class ReplicaSet:
+    """Replica engines, their health and replayed WAL positions.
+
+    Positions come from the last background check, so a replica counts
+    as caught up at most one check interval late and the read goes to
+    the primary meanwhile.
+    """
+
+    replicas: Sequence[Replica]
+    policy: ReplicaPolicy = "round_robin"
+    stats: ReplicaStats = field(default_factory=ReplicaStats)
+    _turn: itertools.count[int] = field(
+        default_factory=itertools.count, init=False
+    )
+
+    @classmethod
+    def connect(
+        cls,
+        urls: Sequence[PostgresDsn],
+        policy: ReplicaPolicy,
+        **session_kwargs: Any,
+    ) -> ReplicaSet:
+        replicas = []
+        for url in urls:
+            engine = create_engine(url)
+            sessions = async_sessionmaker(bind=engine, **session_kwargs)
+            replicas.append(Replica(engine, sessions))
+        return cls(replicas, policy)
+
+    def pick(self, min_lsn: int | None = None) -> Replica | None:
+        """A healthy replica that has replayed ``min_lsn``, if any."""
+        ready = [
+            replica
+            for replica in self.replicas
+            if replica.healthy
+            and (min_lsn is None or replica.replayed_lsn >= min_lsn)
+        ]
+        if not ready:
+            if min_lsn is not None and self.replicas:
+                self.stats.lagging_reads += 1
+            self.stats.primary_reads += 1
+            return None
+        self.stats.replica_reads += 1
+        if self.policy == "least_used":
+            return min(ready, key=lambda replica: replica.in_use)
+        return ready[next(self._turn) % len(ready)]
+
+    async def write_token(self, session: AsyncSession) -> str | None:
+        """The primary's WAL position after ``session`` has committed."""
+        if not self.replicas:
+            return None
+        token: str = (await session.execute(_PRIMARY_LSN)).scalar_one()
+        return token
+
+    async def check(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def check_forever(self, interval_s: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval_s)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
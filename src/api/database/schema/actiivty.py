@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Self
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Self
 
 from sqlalchemy import (
     BigInteger,
@@ -6,20 +7,45 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    Select,
+    Text,
     UniqueConstraint,
     func,
     insert,
     literal,
     select,
+    union_all,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from api.database.schema.base import BaseSchema
+from api.database.schema.base import BaseSchema, mark_written
 
 if TYPE_CHECKING:
     from api.database.schema.agency import AgencyActivity
 
+# Deepest ``activity_closure.depth``: a root and three levels below it.
+MAX_ACTIVITY_DEPTH = 3
+
+# ``(ancestor_id, depth)`` pairs of one activity, itself included.
+Ancestry = list[tuple[int, int]]
+
+
+def _unnest(**arrays: tuple[list[Any], Any]) -> Select[Any]:
+    """Rows zipped from typed array parameters, one bind per column."""
+    columns = (
+        func.unnest(
+            *(
+                literal(values, ARRAY(type_))
+                for values, type_ in arrays.values()
+            )
+        )
+        .table_valued(*arrays)
+        .render_derived()
+    )
+    return select(*columns.c)
+
 
 class Activity(BaseSchema):
     __tablename__ = "activity"
@@ -62,57 +88,165 @@ class Activity(BaseSchema):
         name: str,
         parent_id: int | None,
     ) -> Self:
-        activity = await cls.create(session)
-        await ActivityName.create(
-            session=session, activity_id=activity.id, name=name
+        """Create an activity with its name, parent and closure rows.
+
+        Everything is one statement: the activity row is only inserted
+        while the parent is above the depth limit, and the dependent
+        rows are chained on the id it returns.
+        """
+        parent_depth = (
+            select(func.max(ActivityClosure.depth))
+            .where(ActivityClosure.descendant_id == parent_id)
+            .scalar_subquery()
         )
-        await ActivityParent.create(
-            session=session,
-            activity_id=activity.id,
-            parent_id=parent_id,
+        new = cls._insert_cte(
+            "new_activity",
+            select(func.now().label("created_at")).where(
+                func.coalesce(parent_depth, 0) < MAX_ACTIVITY_DEPTH
+            ),
         )
-        await cls._insert_activity_closure(session, activity.id, parent_id)
+        closure = union_all(
+            select(
+                new.c.id.label("ancestor_id"),
+                new.c.id.label("descendant_id"),
+                literal(0).label("depth"),
+            ),
+            select(
+                ActivityClosure.ancestor_id,
+                new.c.id,
+                ActivityClosure.depth + 1,
+            ).where(ActivityClosure.descendant_id == parent_id),
+        ).subquery("closure")
+        activity = await cls._create_chain(
+            session,
+            new,
+            insert(ActivityName).from_select(
+                ["activity_id", "name"],
+                select(new.c.id, literal(name, Text)),
+            ),
+            insert(ActivityParent).from_select(
+                ["activity_id", "parent_id"],
+                select(new.c.id, literal(parent_id, BigInteger)),
+            ),
+            insert(ActivityClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(closure),
+            ),
+        )
+        if activity is None:
+            raise ValueError("Activity depth limit exceeded.")
         return activity
 
     @classmethod
-    async def _insert_activity_closure(
+    async def create_tree(
         cls,
         session: AsyncSession,
-        activity_id: int,
+        drafts: Sequence[tuple[str, int | None]],
         parent_id: int | None,
-    ) -> None:
+    ) -> list[int]:
+        """Create a whole subtree under ``parent_id`` in five statements.
+
+        ``drafts`` are ``(name, parent index)`` pairs listing every parent
+        before its children; roots have no parent index. Depths are
+        checked in memory before anything is written, and the closure
+        rows are computed here rather than read back per node. Returns
+        the new ids in ``drafts`` order.
+        """
+        ancestry = await cls._parent_ancestry(session, parent_id)
+        depths: list[int] = []
+        for index, (_, parent) in enumerate(drafts):
+            if parent is not None and not 0 <= parent < index:
+                raise ValueError("Parents must precede their children.")
+            depth = len(ancestry) if parent is None else depths[parent] + 1
+            if depth > MAX_ACTIVITY_DEPTH:
+                raise ValueError("Activity depth limit exceeded.")
+            depths.append(depth)
+
+        ids = await cls._reserve_ids(session, len(drafts))
+        parent_ids: list[int | None] = []
+        ancestries: list[Ancestry] = []
+        for activity_id, (_, parent) in zip(ids, drafts, strict=True):
+            above = ancestry if parent is None else ancestries[parent]
+            parent_ids.append(parent_id if parent is None else ids[parent])
+            ancestries.append(
+                [(activity_id, 0), *((a, d + 1) for a, d in above)]
+            )
+        closure = [row for rows in ancestries for row in rows]
+        descendants = [
+            activity_id
+            for activity_id, rows in zip(ids, ancestries, strict=True)
+            for _ in rows
+        ]
+        mark_written(
+            session,
+            cls.__tablename__,
+            ActivityName.__tablename__,
+            ActivityParent.__tablename__,
+            ActivityClosure.__tablename__,
+        )
         await session.execute(
-            insert(ActivityClosure).values(
-                ancestor_id=activity_id,
-                descendant_id=activity_id,
-                depth=0,
+            insert(ActivityName).from_select(
+                ["activity_id", "name"],
+                _unnest(
+                    activity_id=(ids, BigInteger),
+                    name=([name for name, _ in drafts], Text),
+                ),
             )
         )
-
-        if parent_id is None:
-            return
-
-        max_depth_stmt = select(func.max(ActivityClosure.depth)).where(
-            ActivityClosure.descendant_id == parent_id
+        await session.execute(
+            insert(ActivityParent).from_select(
+                ["activity_id", "parent_id"],
+                _unnest(
+                    activity_id=(ids, BigInteger),
+                    parent_id=(parent_ids, BigInteger),
+                ),
+            )
         )
-        max_depth = (await session.execute(max_depth_stmt)).scalar_one()
-        max_depth = max_depth if max_depth is not None else 0
-
-        if max_depth >= 3:
-            raise ValueError("Activity depth limit exceeded.")
-
-        ancestors_stmt = select(
-            ActivityClosure.ancestor_id,
-            literal(activity_id).label("descendant_id"),
-            (ActivityClosure.depth + 1).label("depth"),
-        ).where(ActivityClosure.descendant_id == parent_id)
-
         await session.execute(
             insert(ActivityClosure).from_select(
                 ["ancestor_id", "descendant_id", "depth"],
-                ancestors_stmt,
+                _unnest(
+                    ancestor_id=([a for a, _ in closure], BigInteger),
+                    descendant_id=(descendants, BigInteger),
+                    depth=([d for _, d in closure], Integer),
+                ),
+            )
+        )
+        return ids
+
+    @classmethod
+    async def _reserve_ids(
+        cls, session: AsyncSession, count: int
+    ) -> list[int]:
+        # Activity rows carry nothing but their id, so any id can go to
+        # any node; sorting keeps parents numbered before children.
+        result = await session.execute(
+            insert(cls)
+            .from_select(
+                ["created_at"],
+                select(func.now()).select_from(func.generate_series(1, count)),
+            )
+            .returning(cls.id)
+        )
+        return sorted(result.scalars())
+
+    @classmethod
+    async def _parent_ancestry(
+        cls,
+        session: AsyncSession,
+        parent_id: int | None,
+    ) -> Ancestry:
+        if parent_id is None:
+            return []
+        rows = await session.execute(
+            select(ActivityClosure.ancestor_id, ActivityClosure.depth).where(
+                ActivityClosure.descendant_id == parent_id
             )
         )
+        ancestry: Ancestry = [(a, d) for a, d in rows.tuples()]
+        if not ancestry:
+            raise ValueError("Parent activity does not exist.")
+        return ancestry
 
 
 class ActivityName(BaseSchema):
@@ -1,6 +1,12 @@
 from typing import TYPE_CHECKING, Self
 
-from sqlalchemy import BigInteger, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -43,6 +49,17 @@ class AgencyName(BaseSchema):
     __table_args__ = (
         UniqueConstraint("agency_id", name="uq_agency_name_agency_id"),
         Index("ix_agency_name_name", "name"),
+        Index(
+            "ix_agency_name_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_agency_name_name_prefix",
+            text('lower(name) COLLATE "C"'),
+            "agency_id",
+        ),
     )
 
     agency_id: Mapped[int] = mapped_column(
@@ -120,7 +137,11 @@ class AgencyBuilding(BaseSchema):
     __tablename__ = "agency_building"
     __table_args__ = (
         UniqueConstraint("agency_id", name="uq_agency_building_agency_id"),
-        Index("ix_agency_building_building_id", "building_id"),
+        Index(
+            "ix_agency_building_building_id_agency_id",
+            "building_id",
+            "agency_id",
+        ),
     )
 
     agency_id: Mapped[int] = mapped_column(
@@ -172,7 +193,11 @@ class AgencyActivity(BaseSchema):
             "activity_id",
             name="uq_agency_activity_agency_id_activity_id",
         ),
-        Index("ix_agency_activity_activity_id", "activity_id"),
+        Index(
+            "ix_agency_activity_activity_id_agency_id",
+            "activity_id",
+            "agency_id",
+        ),
     )
 
     agency_id: Mapped[int] = mapped_column(
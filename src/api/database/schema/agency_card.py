@@ -0,0 +1,257 @@
+from datetime import datetime
+from typing import Any
+
+from geoalchemy2 import Geometry, WKBElement
+from sqlalchemy import (
+    BigInteger,
+    Connection,
+    ForeignKey,
+    Index,
+    MetaData,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.database.schema.base import Base, metadata
+
+
+class AgencyCard(Base):
+    """Pre-rendered agency document kept in sync by database triggers."""
+
+    __tablename__ = "agency_card"
+    __table_args__ = (
+        Index(
+            "ix_agency_card_building_id_agency_id",
+            "building_id",
+            "agency_id",
+        ),
+        Index("ix_agency_card_geom", "geom", postgresql_using="gist"),
+        Index(
+            "ix_agency_card_geog",
+            text("(geography(geom))"),
+            postgresql_using="gist",
+        ),
+        Index(
+            "ix_agency_card_activity_ids",
+            "activity_ids",
+            postgresql_using="gin",
+        ),
+    )
+
+    agency_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("agency.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    building_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    geom: Mapped[WKBElement] = mapped_column(
+        Geometry(
+            geometry_type="POINT",
+            srid=4326,
+            spatial_index=False,
+        ),
+        nullable=False,
+    )
+    activity_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(BigInteger),
+        nullable=False,
+        server_default="{}",
+    )
+    document: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+    )
+
+
+AGENCY_CARD_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION agency_card_refresh(agency_ids bigint[])
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF coalesce(cardinality(agency_ids), 0) = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO agency_card (
+        agency_id, building_id, geom, activity_ids, document, updated_at
+    )
+    SELECT
+        a.id,
+        ab.building_id,
+        bg.geom,
+        array(
+            SELECT aa.activity_id
+            FROM agency_activity AS aa
+            WHERE aa.agency_id = a.id
+            ORDER BY aa.activity_id
+        ),
+        jsonb_build_object(
+            'id', a.id,
+            'name', an.name,
+            'phones', coalesce(ph.phones, '[]'::jsonb),
+            'building', jsonb_build_object(
+                'id', ab.building_id,
+                'address', ba.address,
+                'lat', ST_Y(bg.geom),
+                'lon', ST_X(bg.geom)
+            ),
+            'activities', coalesce(act.activities, '[]'::jsonb)
+        ),
+        now()
+    FROM agency AS a
+    JOIN agency_name AS an ON an.agency_id = a.id
+    JOIN agency_building AS ab ON ab.agency_id = a.id
+    JOIN building_address AS ba ON ba.building_id = ab.building_id
+    JOIN building_geo AS bg ON bg.building_id = ab.building_id
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(p.phone ORDER BY p.id) AS phones
+        FROM agency_phone AS p
+        WHERE p.agency_id = a.id
+    ) AS ph ON true
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(
+            jsonb_build_object(
+                'id', ac.id,
+                'name', acn.name,
+                'parent_id', ap.parent_id
+            )
+            ORDER BY ac.id
+        ) AS activities
+        FROM agency_activity AS aa
+        JOIN activity AS ac ON ac.id = aa.activity_id
+        JOIN activity_name AS acn ON acn.activity_id = ac.id
+        LEFT JOIN activity_parent AS ap ON ap.activity_id = ac.id
+        WHERE aa.agency_id = a.id
+    ) AS act ON true
+    WHERE a.id = ANY(agency_ids)
+    ON CONFLICT (agency_id) DO UPDATE SET
+        building_id = excluded.building_id,
+        geom = excluded.geom,
+        activity_ids = excluded.activity_ids,
+        document = excluded.document,
+        updated_at = excluded.updated_at;
+
+    DELETE FROM agency_card AS c
+    WHERE c.agency_id = ANY(agency_ids)
+      AND NOT EXISTS (
+        SELECT 1
+        FROM agency_name AS an
+        JOIN agency_building AS ab ON ab.agency_id = an.agency_id
+        JOIN building_address AS ba ON ba.building_id = ab.building_id
+        JOIN building_geo AS bg ON bg.building_id = ab.building_id
+        WHERE an.agency_id = c.agency_id
+      );
+END
+$$
+"""
+
+_SYNC_FUNCTION = """
+CREATE OR REPLACE FUNCTION {name}()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    changed bigint[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed := array(SELECT {key} FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed := array(SELECT {key} FROM old_rows);
+    ELSE
+        changed := array(
+            SELECT {key} FROM new_rows UNION SELECT {key} FROM old_rows
+        );
+    END IF;
+    PERFORM agency_card_refresh({agency_ids});
+    RETURN NULL;
+END
+$$
+"""
+
+# Sync function -> (key column of the source rows, affected agency ids).
+AGENCY_CARD_SYNC_FUNCTIONS: dict[str, tuple[str, str]] = {
+    "agency_card_sync_by_agency": ("agency_id", "changed"),
+    "agency_card_sync_by_building": (
+        "building_id",
+        "array(SELECT agency_id FROM agency_building"
+        " WHERE building_id = ANY(changed))",
+    ),
+    "agency_card_sync_by_activity": (
+        "activity_id",
+        "array(SELECT DISTINCT agency_id FROM agency_activity"
+        " WHERE activity_id = ANY(changed))",
+    ),
+}
+
+# Normalized table -> sync function fired by its statement triggers.
+AGENCY_CARD_SOURCES: dict[str, str] = {
+    "agency_name": "agency_card_sync_by_agency",
+    "agency_phone": "agency_card_sync_by_agency",
+    "agency_building": "agency_card_sync_by_agency",
+    "agency_activity": "agency_card_sync_by_agency",
+    "building_address": "agency_card_sync_by_building",
+    "building_geo": "agency_card_sync_by_building",
+    "activity_name": "agency_card_sync_by_activity",
+    "activity_parent": "agency_card_sync_by_activity",
+}
+
+# Transition tables force one trigger per event.
+_TRIGGER_EVENTS: dict[str, str] = {
+    "insert": "INSERT REFERENCING NEW TABLE AS new_rows",
+    "update": "UPDATE REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "DELETE REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def agency_card_ddl() -> list[str]:
+    statements = [AGENCY_CARD_REFRESH_FUNCTION]
+    for name, (key, agency_ids) in AGENCY_CARD_SYNC_FUNCTIONS.items():
+        statements.append(
+            _SYNC_FUNCTION.format(name=name, key=key, agency_ids=agency_ids)
+        )
+    for table, function in AGENCY_CARD_SOURCES.items():
+        for suffix, events in _TRIGGER_EVENTS.items():
+            statements.append(
+                f"CREATE OR REPLACE TRIGGER {table}_agency_card_{suffix}"
+                f" AFTER {events} ON {table}"
+                f" FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+            )
+    return statements
+
+
+def agency_card_drop_ddl() -> list[str]:
+    statements = [
+        f"DROP TRIGGER IF EXISTS {table}_agency_card_{suffix} ON {table}"
+        for table in AGENCY_CARD_SOURCES
+        for suffix in _TRIGGER_EVENTS
+    ]
+    statements.extend(
+        f"DROP FUNCTION IF EXISTS {name}()"
+        for name in AGENCY_CARD_SYNC_FUNCTIONS
+    )
+    statements.append("DROP FUNCTION IF EXISTS agency_card_refresh(bigint[])")
+    return statements
+
+
+@event.listens_for(metadata, "after_create")
+def _create_agency_card_sync(
+    target: MetaData,
+    connection: Connection,
+    **kwargs: Any,
+) -> None:
+    for statement in agency_card_ddl():
+        connection.execute(text(statement))
+
+
+@event.listens_for(metadata, "before_drop")
+def _drop_agency_card_sync(
+    target: MetaData,
+    connection: Connection,
+    **kwargs: Any,
+) -> None:
+    for statement in agency_card_drop_ddl():
+        connection.execute(text(statement))
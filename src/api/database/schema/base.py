@@ -1,20 +1,85 @@
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 from typing import Any, Self
 
-from sqlalchemy import BigInteger, func, update
+from sqlalchemy import BigInteger, Insert, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, aliased, mapped_column
 from sqlalchemy.sql.roles import ExpressionElementRole
+from sqlalchemy.sql.selectable import CTE, Select
+
+# ``session.info`` key collecting tables written in the open transaction.
+WRITTEN_TABLES = "written_tables"
+
+
+def mark_written(session: AsyncSession, *tables: str) -> None:
+    session.info.setdefault(WRITTEN_TABLES, set()).update(tables)
 
 
 class Base(DeclarativeBase):
     @classmethod
     async def _create(cls, session: AsyncSession, **kwargs: Any) -> Self:
-        obj = cls(**kwargs)
-        session.add(obj)
-        await session.flush()
+        (obj,) = await cls._create_many(session, [kwargs])
         return obj
 
+    @classmethod
+    async def _create_many(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[Mapping[str, Any]],
+    ) -> list[Self]:
+        """Insert ``rows`` with multi-row ``INSERT … RETURNING``.
+
+        Objects come back in ``rows`` order without flushing the rest of
+        the session, so ids of a batch cost one round trip instead of
+        one per row.
+        """
+        if not rows:
+            return []
+        result = await session.scalars(
+            insert(cls).returning(cls, sort_by_parameter_order=True),
+            rows,
+        )
+        mark_written(session, cls.__tablename__)
+        return list(result)
+
+    @classmethod
+    def _insert_cte(cls, name: str, rows: Select[Any]) -> CTE:
+        """``INSERT … RETURNING`` of ``rows`` to chain other inserts on."""
+        return (
+            insert(cls)
+            .from_select(list(rows.selected_columns.keys()), rows)
+            .returning(*cls.__table__.columns)
+            .cte(name)
+        )
+
+    @classmethod
+    async def _create_chain(
+        cls,
+        session: AsyncSession,
+        head: CTE,
+        *dependents: Insert,
+    ) -> Self | None:
+        """Run ``head`` and the inserts built on it as a single statement.
+
+        ``head`` comes from ``_insert_cte``; each dependent selects the
+        new ids from it. Foreign keys are checked at the end of the
+        statement, so dependents may reference the rows ``head`` adds.
+        Returns the ``head`` row, or ``None`` when it inserted nothing.
+        """
+        stmt = select(aliased(cls, head)).add_cte(
+            *(
+                dependent.cte(f"{head.name}_{index}")
+                for index, dependent in enumerate(dependents)
+            )
+        )
+        mark_written(
+            session,
+            cls.__tablename__,
+            *(dependent.table.name for dependent in dependents),
+        )
+        return (await session.scalars(stmt)).one_or_none()
+
     @classmethod
     async def _update(
         cls,
@@ -22,6 +87,7 @@ class Base(DeclarativeBase):
         condition: ExpressionElementRole[Any],
         **kwargs: Any,
     ) -> Self | None:
+        mark_written(session, cls.__tablename__)
         return (
             await session.execute(
                 update(cls).where(condition).values(**kwargs).returning(cls)
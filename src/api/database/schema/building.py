@@ -1,7 +1,13 @@
 from typing import TYPE_CHECKING, Self
 
 from geoalchemy2 import Geometry, WKBElement, WKTElement
-from sqlalchemy import BigInteger, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -87,6 +93,12 @@ class BuildingGeo(BaseSchema):
             "geom",
             postgresql_using="gist",
         ),
+        # Must match the geography() call in queries.geo.geo_filter.
+        Index(
+            "ix_building_geo_geog",
+            text("(geography(geom))"),
+            postgresql_using="gist",
+        ),
     )
 
     building_id: Mapped[int] = mapped_column(
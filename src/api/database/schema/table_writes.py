@@ -0,0 +1,66 @@
+from typing import Any
+
+from sqlalchemy import Connection, MetaData, event, text
+
+from api.database.schema.base import metadata
+
+# Channel on which a committed write names each table it touched.
+WRITES_CHANNEL = "table_writes"
+
+NOTIFY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_table_write()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Sent on commit, once per table and transaction.
+    PERFORM pg_notify('{WRITES_CHANNEL}', TG_TABLE_NAME);
+    RETURN NULL;
+END
+$$
+"""
+
+
+def notify_tables() -> list[str]:
+    """Tables announcing their writes: every table of ``metadata``."""
+    return sorted(metadata.tables)
+
+
+def table_writes_ddl() -> list[str]:
+    statements = [NOTIFY_FUNCTION]
+    statements.extend(
+        f"CREATE OR REPLACE TRIGGER {table}_notify_write"
+        f" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}"
+        " FOR EACH STATEMENT EXECUTE FUNCTION notify_table_write()"
+        for table in notify_tables()
+    )
+    return statements
+
+
+def table_writes_drop_ddl() -> list[str]:
+    statements = [
+        f"DROP TRIGGER IF EXISTS {table}_notify_write ON {table}"
+        for table in notify_tables()
+    ]
+    statements.append("DROP FUNCTION IF EXISTS notify_table_write()")
+    return statements
+
+
+@event.listens_for(metadata, "after_create")
+def _create_table_writes(
+    target: MetaData,
+    connection: Connection,
+    **kwargs: Any,
+) -> None:
+    for statement in table_writes_ddl():
+        connection.execute(text(statement))
+
+
+@event.listens_for(metadata, "before_drop")
+def _drop_table_writes(
+    target: MetaData,
+    connection: Connection,
+    **kwargs: Any,
+) -> None:
+    for statement in table_writes_drop_ddl():
+        connection.execute(text(statement))
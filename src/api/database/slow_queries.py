@@ -0,0 +1,191 @@
+"""Per-query statement timings and a log of slow statements with plans.
+
+Statements are tagged with the ``QUERY_NAME`` execution option set by
+``prebuilt``, so timings and log entries name the public query function
+instead of a SQL fragment. A slow statement is logged as JSON right away;
+its ``EXPLAIN (ANALYZE, BUFFERS)`` runs afterwards in a background task on
+a separate read-only transaction that is rolled back.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.default import DefaultExecutionContext
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.database.queries.statements import QUERY_NAME
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_QUERY = "slow_query_explain"
+_EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+_STARTED = "slow_query_started"
+_RATE_WINDOW_S = 60.0
+
+
+@dataclass(slots=True)
+class QueryTimings:
+    count: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    slow: int = 0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
+
+    def record(self, elapsed_s: float) -> None:
+        self.count += 1
+        self.total_s += elapsed_s
+        self.max_s = max(self.max_s, elapsed_s)
+
+
+def fingerprint(statement: str) -> str:
+    # Values are bound, so the SQL text identifies the statement shape.
+    return blake2b(statement.encode(), digest_size=8).hexdigest()
+
+
+class SlowQueryLog:
+    """Times statements per ``QUERY_NAME`` and explains the slow ones.
+
+    A fingerprint is explained at most once per ``explain_interval_s``,
+    and no more than ``explains_per_minute`` plans are captured overall.
+    Statements that write are logged but never explained.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold_s: float,
+        explain: bool,
+        explain_interval_s: float,
+        explains_per_minute: int,
+    ) -> None:
+        self.threshold_s = threshold_s
+        self.explain = explain
+        self.explain_interval_s = explain_interval_s
+        self.explains_per_minute = explains_per_minute
+        self.timings: dict[str, QueryTimings] = {}
+        self._explained: dict[str, float] = {}
+        self._recent: deque[float] = deque()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        def finished(
+            conn: Connection,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: ExecutionContext | None,
+            executemany: bool,
+        ) -> None:
+            started = conn.info.pop(_STARTED, None)
+            if started is None or not isinstance(
+                context, DefaultExecutionContext
+            ):
+                return
+            self._record(
+                engine,
+                context,
+                statement,
+                parameters,
+                time.perf_counter() - started,
+            )
+
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _started)
+        event.listen(sync_engine, "after_cursor_execute", finished)
+
+    async def aclose(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _record(
+        self,
+        engine: AsyncEngine,
+        context: DefaultExecutionContext,
+        statement: str,
+        parameters: Any,
+        elapsed_s: float,
+    ) -> None:
+        name = context.execution_options.get(QUERY_NAME, "other")
+        if name == EXPLAIN_QUERY:
+            return
+        timings = self.timings.get(name)
+        if timings is None:
+            timings = self.timings[name] = QueryTimings()
+        timings.record(elapsed_s)
+        if self.threshold_s <= 0 or elapsed_s < self.threshold_s:
+            return
+        timings.slow += 1
+        entry = {
+            "query": name,
+            "fingerprint": fingerprint(statement),
+            "duration_ms": round(elapsed_s * 1000, 3),
+            "statement": statement,
+        }
+        logger.warning("Slow query %s", json.dumps(entry))
+        writes = context.isinsert or context.isupdate or context.isdelete
+        if self.explain and not writes and self._may_explain(entry):
+            task = asyncio.get_running_loop().create_task(
+                self._explain(engine, entry, parameters)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _may_explain(self, entry: dict[str, Any]) -> bool:
+        now = time.monotonic()
+        last = self._explained.get(entry["fingerprint"])
+        if last is not None and now - last < self.explain_interval_s:
+            return False
+        while self._recent and now - self._recent[0] >= _RATE_WINDOW_S:
+            self._recent.popleft()
+        if len(self._recent) >= self.explains_per_minute:
+            return False
+        self._explained[entry["fingerprint"]] = now
+        self._recent.append(now)
+        return True
+
+    async def _explain(
+        self,
+        engine: AsyncEngine,
+        entry: dict[str, Any],
+        parameters: Any,
+    ) -> None:
+        options = {QUERY_NAME: EXPLAIN_QUERY}
+        try:
+            async with engine.connect() as conn:
+                # A statement that writes through a CTE fails here
+                # instead of running twice.
+                await conn.exec_driver_sql(
+                    "SET TRANSACTION READ ONLY", execution_options=options
+                )
+                result = await conn.exec_driver_sql(
+                    _EXPLAIN + entry["statement"],
+                    parameters,
+                    execution_options=options,
+                )
+                plan = result.scalar_one()
+                await conn.rollback()
+        except (SQLAlchemyError, OSError):
+            logger.warning("Slow query EXPLAIN failed", exc_info=True)
+            return
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        logger.warning(
+            "Slow query plan %s", json.dumps({**entry, "plan": plan})
+        )
+
+
+def _started(conn: Connection, *args: Any) -> None:
+    conn.info[_STARTED] = time.perf_counter()
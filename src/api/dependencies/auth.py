@@ -3,13 +3,15 @@ from typing import Annotated
 from fastapi import Header, HTTPException, status
 
 from api.settings import settings
+from api.timing import phase
 
 
-def verify_api_key(
+async def verify_api_key(
     api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
 ) -> None:
-    if api_key != settings.API_KEY:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Unauthorized",
-        )
+    with phase("auth"):
+        if api_key != settings.API_KEY:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Unauthorized",
+            )
@@ -0,0 +1,37 @@
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from api.cache.activity_tree import ActivityTree
+from api.cache.building_index import BuildingIndex
+from api.cache.response import RequestCache, ResponseCache
+from api.database.replicas import Replica
+from api.dependencies.db import get_replica, has_consistency_token
+
+
+def get_activity_tree(request: Request) -> ActivityTree:
+    activity_tree: ActivityTree = request.app.state.activity_tree
+    return activity_tree
+
+
+def get_building_index(request: Request) -> BuildingIndex | None:
+    """The in-memory index, unless the read waits for a write.
+
+    The index trails the database by up to a refresh interval.
+    """
+    if has_consistency_token(request):
+        return None
+    building_index: BuildingIndex = request.app.state.building_index
+    return building_index
+
+
+def get_response_cache(
+    request: Request,
+    replica: Annotated[Replica | None, Depends(get_replica)],
+) -> RequestCache:
+    response_cache: ResponseCache = request.app.state.response_cache
+    return RequestCache(
+        response_cache,
+        read=not has_consistency_token(request),
+        write=replica is None,
+    )
@@ -1,10 +1,93 @@
 from collections.abc import AsyncIterator
+from functools import cache
+from typing import Annotated
 
-from fastapi import Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
 
+from api.database.replicas import (
+    CONSISTENCY_HEADER,
+    Replica,
+    ReplicaSet,
+    parse_lsn,
+)
 
-async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
-    async_session = request.app.state.async_session
-    async with async_session() as session:
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def has_consistency_token(request: Request) -> bool:
+    return CONSISTENCY_HEADER in request.headers
+
+
+def _min_lsn(request: Request) -> int | None:
+    token = request.headers.get(CONSISTENCY_HEADER)
+    if token is None:
+        return None
+    try:
+        return parse_lsn(token)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+def get_replica(request: Request) -> Replica | None:
+    """The replica serving a GET request, picked once per request.
+
+    Reads presenting a consistency token only go to a replica that has
+    replayed the write behind it.
+    """
+    if request.method not in READ_METHODS:
+        return None
+    replicas: ReplicaSet = request.app.state.replicas
+    return replicas.pick(_min_lsn(request))
+
+
+def _sessions(
+    request: Request, replica: Replica | None
+) -> async_sessionmaker[AsyncSession]:
+    if replica is not None:
+        return replica.sessions
+    sessions: async_sessionmaker[AsyncSession] = (
+        request.app.state.async_session
+    )
+    return sessions
+
+
+@cache
+def _snapshot_bind(engine: AsyncEngine) -> AsyncEngine:
+    return engine.execution_options(isolation_level="REPEATABLE READ")
+
+
+async def get_session(
+    request: Request,
+    replica: Annotated[Replica | None, Depends(get_replica)],
+) -> AsyncIterator[AsyncSession]:
+    """A primary session, or a replica session for GET requests."""
+    async with _sessions(request, replica)() as session:
         yield session
+
+
+async def get_snapshot_session(
+    request: Request,
+    replica: Annotated[Replica | None, Depends(get_replica)],
+) -> AsyncIterator[AsyncSession]:
+    """Like ``get_session``, but all statements read one snapshot.
+
+    For routes that compute a validator and then the body it stands for
+    in separate statements: a write committed in between must not pair
+    an old tag with a new body.
+    """
+    sessions = _sessions(request, replica)
+    async with sessions(bind=_snapshot_bind(sessions.kw["bind"])) as session:
+        yield session
+
+
+def get_replicas(request: Request) -> ReplicaSet:
+    replicas: ReplicaSet = request.app.state.replicas
+    return replicas
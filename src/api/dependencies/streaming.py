@@ -0,0 +1,13 @@
+from typing import Annotated
+
+from fastapi import Query, Request
+
+from api.models.serialization import NDJSON_MEDIA_TYPE
+
+
+def wants_stream(
+    request: Request,
+    stream: Annotated[bool, Query()] = False,
+) -> bool:
+    """Stream the whole result as NDJSON instead of returning a page."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
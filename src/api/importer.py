@@ -0,0 +1,128 @@
+"""Bulk import of activities, buildings and agencies from CSV or NDJSON.
+
+Each file holds one kind of record; the format follows the extension
+(``.csv``, ``.ndjson`` or ``.jsonl``). Everything is imported in one
+transaction:
+
+    python -m api.importer --activities activities.csv \\
+        --buildings buildings.ndjson --agencies agencies.ndjson
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from api.database.bulk_import import (
+    STAGING_TABLES,
+    ImportStats,
+    Record,
+    bulk_import,
+    record_columns,
+)
+from api.database.engine import create_engine
+from api.models.bulk_import import (
+    ActivityImport,
+    AgencyImport,
+    BuildingImport,
+)
+
+IMPORT_MODELS: dict[str, type[BaseModel]] = {
+    "activity": ActivityImport,
+    "building": BuildingImport,
+    "agency": AgencyImport,
+}
+CSV_SUFFIXES = frozenset({".csv"})
+NDJSON_SUFFIXES = frozenset({".ndjson", ".jsonl"})
+
+
+def _items(path: Path, model: type[BaseModel]) -> Iterator[BaseModel]:
+    with path.open(encoding="utf-8", newline="") as file:
+        if path.suffix in CSV_SUFFIXES:
+            for row in csv.DictReader(file):
+                # Empty cells fall back to the model defaults.
+                yield model.model_validate(
+                    {key: value for key, value in row.items() if value}
+                )
+        elif path.suffix in NDJSON_SUFFIXES:
+            for line in file:
+                if line.strip():
+                    yield model.model_validate_json(line)
+        else:
+            raise ValueError(f"{path}: unsupported file format.")
+
+
+def read_records(path: Path, kind: str) -> Iterator[Record]:
+    """Validated records of ``path`` in staging column order.
+
+    Records are produced lazily, so ``COPY`` streams the file instead
+    of loading it into memory.
+    """
+    columns = record_columns(STAGING_TABLES[kind])
+    items = _items(path, IMPORT_MODELS[kind])
+    line = 0
+    try:
+        for line, item in enumerate(items, start=1):
+            yield (line, *(getattr(item, column) for column in columns))
+    except ValidationError as exc:
+        raise ValueError(f"{path}: record {line + 1}: {exc}") from exc
+
+
+def _report(stats: ImportStats) -> None:
+    lines = [{"kind": kind, "rows": rows} for kind, rows in stats.rows.items()]
+    lines.append(
+        {
+            "rows": stats.total_rows,
+            "copy_s": round(stats.copy_s, 3),
+            "merge_s": round(stats.merge_s, 3),
+            "rows_per_s": round(stats.rows_per_s),
+        }
+    )
+    for line in lines:
+        sys.stdout.write(json.dumps(line) + "\n")
+
+
+async def run(paths: dict[str, Path]) -> ImportStats:
+    sources = {kind: read_records(path, kind) for kind, path in paths.items()}
+    engine = create_engine()
+    try:
+        async with engine.begin() as conn:
+            return await bulk_import(conn, sources)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--activities", type=Path)
+    parser.add_argument("--buildings", type=Path)
+    parser.add_argument("--agencies", type=Path)
+    args = parser.parse_args()
+    paths = {
+        kind: path
+        for kind, path in (
+            ("activity", args.activities),
+            ("building", args.buildings),
+            ("agency", args.agencies),
+        )
+        if path is not None
+    }
+    if not paths:
+        parser.error("nothing to import")
+    try:
+        stats = asyncio.run(run(paths))
+    except ValueError as exc:
+        sys.exit(str(exc))
+    _report(stats)
+
+
+if __name__ == "__main__":
+    main()
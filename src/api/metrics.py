@@ -0,0 +1,394 @@
+"""Request, database and cache metrics in the Prometheus text format.
+
+Everything is collected per process in plain counters, written from the
+event loop thread by the middleware, so nothing takes a lock and a
+request costs a few dictionary lookups and bisections. Statement time
+comes from the request's ``api.timing`` context.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from starlette.datastructures import MutableHeaders, State
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api import timing
+from api.cache.activity_tree import ActivityTree
+from api.cache.building_index import BuildingIndex
+from api.cache.response import ResponseCache
+from api.database.engine import pool_stats
+from api.database.queries.statements import QueryCacheMonitor
+from api.database.replicas import ReplicaSet
+from api.database.slow_queries import SlowQueryLog
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS_S = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS_BYTES = tuple(float(4**power * 256) for power in range(8))
+
+_QUERY_STARTED = "metrics_query_started"
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # The last slot counts values above every bound (``+Inf``).
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def lines(self, name: str, labels: str) -> Iterator[str]:
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+        cumulative += self.counts[-1]
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.total}"
+        yield f"{name}_count{{{labels}}} {cumulative}"
+
+
+@dataclass(slots=True)
+class RouteMetrics:
+    statuses: dict[int, int] = field(default_factory=dict)
+    latency: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS_S)
+    )
+    size: Histogram = field(
+        default_factory=lambda: Histogram(SIZE_BUCKETS_BYTES)
+    )
+    db_time: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS_S)
+    )
+
+
+class RequestMetrics:
+    """Per route template: status counts, latency, body size, DB time."""
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration_s: float,
+        size: int,
+        db_s: float,
+    ) -> None:
+        key = (method, route)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics()
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.latency.observe(duration_s)
+        metrics.size.observe(size)
+        metrics.db_time.observe(db_s)
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        """Add the statement time of ``engine`` to the current request."""
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _query_started)
+        event.listen(sync_engine, "after_cursor_execute", _query_finished)
+
+
+def _query_started(conn: Connection, *args: Any) -> None:
+    conn.info[_QUERY_STARTED] = time.perf_counter()
+
+
+def _query_finished(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    started = conn.info.pop(_QUERY_STARTED, None)
+    if started is not None:
+        timing.add("sql", time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and records it under its route template.
+
+    The request's ``RequestTiming`` is opened here; with
+    ``server_timing`` its phases are sent in the ``Server-Timing``
+    header.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics,
+        server_timing: bool = False,
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        size = 0
+        with timing.request_timing() as request_timing:
+
+            async def send_counted(message: Message) -> None:
+                nonlocal status, size
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if self.server_timing:
+                        headers = MutableHeaders(scope=message)
+                        headers.append(
+                            timing.SERVER_TIMING_HEADER,
+                            request_timing.header(),
+                        )
+                elif message["type"] == "http.response.body":
+                    size += len(message.get("body", b""))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_counted)
+            finally:
+                # The router stores the matched route in the scope.
+                route = scope.get("route")
+                self.metrics.observe(
+                    scope["method"],
+                    getattr(route, "path", "unmatched"),
+                    status,
+                    time.perf_counter() - request_timing.started,
+                    size,
+                    request_timing.phases.get("sql", 0.0),
+                )
+
+
+def _labels(**values: object) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in values.items()
+    )
+
+
+def _family(name: str, kind: str, help_text: str) -> Iterator[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {kind}"
+
+
+def _request_lines(metrics: RequestMetrics) -> Iterator[str]:
+    routes = sorted(metrics.routes.items())
+    yield from _family(
+        "http_requests_total", "counter", "HTTP requests by status."
+    )
+    for (method, route), stats in routes:
+        for status, count in sorted(stats.statuses.items()):
+            labels = _labels(method=method, route=route, status=status)
+            yield f"http_requests_total{{{labels}}} {count}"
+    for name, attribute, help_text in (
+        (
+            "http_request_duration_seconds",
+            "latency",
+            "Time until the response body was sent.",
+        ),
+        ("http_response_size_bytes", "size", "Response body size."),
+        (
+            "http_request_db_seconds",
+            "db_time",
+            "Time spent executing statements per request.",
+        ),
+    ):
+        yield from _family(name, "histogram", help_text)
+        for (method, route), stats in routes:
+            histogram: Histogram = getattr(stats, attribute)
+            yield from histogram.lines(
+                name, _labels(method=method, route=route)
+            )
+
+
+def _pool_lines(engines: dict[str, AsyncEngine]) -> Iterator[str]:
+    gauges: dict[str, list[tuple[str, float]]] = {
+        "db_pool_size": [],
+        "db_pool_checked_out": [],
+        "db_pool_overflow": [],
+        "db_pool_wait_seconds_max": [],
+    }
+    counters: dict[str, list[tuple[str, float]]] = {
+        "db_pool_checkouts_total": [],
+        "db_pool_wait_seconds_total": [],
+        "db_pool_timeouts_total": [],
+    }
+    for name, engine in engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = _labels(pool=name)
+        gauges["db_pool_size"].append((labels, pool.size()))
+        gauges["db_pool_checked_out"].append((labels, pool.checkedout()))
+        gauges["db_pool_overflow"].append((labels, max(pool.overflow(), 0)))
+        stats = pool_stats(engine)
+        if stats is None:
+            continue
+        gauges["db_pool_wait_seconds_max"].append((labels, stats.max_wait_s))
+        counters["db_pool_checkouts_total"].append((labels, stats.checkouts))
+        counters["db_pool_wait_seconds_total"].append((labels, stats.wait_s))
+        counters["db_pool_timeouts_total"].append((labels, stats.timeouts))
+    for kind, families in (("gauge", gauges), ("counter", counters)):
+        for metric, samples in families.items():
+            yield from _family(metric, kind, "Connection pool state.")
+            for labels, value in samples:
+                yield f"{metric}{{{labels}}} {value}"
+
+
+def _counter_lines(
+    name: str, help_text: str, samples: Sequence[tuple[str, float]]
+) -> Iterator[str]:
+    yield from _family(name, "counter", help_text)
+    for labels, value in samples:
+        yield f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+
+def _cache_lines(state: State) -> Iterator[str]:
+    activity_tree: ActivityTree = state.activity_tree
+    response_cache: ResponseCache = state.response_cache
+    building_index: BuildingIndex = state.building_index
+    query_cache: QueryCacheMonitor = state.query_cache
+    replicas: ReplicaSet = state.replicas
+    cache_samples = [
+        (
+            _labels(cache="activity_tree", result="hit"),
+            activity_tree.stats.hits,
+        ),
+        (
+            _labels(cache="activity_tree", result="miss"),
+            activity_tree.stats.misses,
+        ),
+        (_labels(cache="response", result="hit"), response_cache.stats.hits),
+        (
+            _labels(cache="response", result="miss"),
+            response_cache.stats.misses,
+        ),
+    ]
+    yield from _counter_lines(
+        "cache_lookups_total", "In-process cache lookups.", cache_samples
+    )
+    yield from _counter_lines(
+        "response_cache_evictions_total",
+        "Responses evicted to stay under the byte limit.",
+        [("", response_cache.stats.evictions)],
+    )
+    yield from _counter_lines(
+        "response_cache_invalidations_total",
+        "Responses dropped by committed writes.",
+        [("", response_cache.stats.invalidations)],
+    )
+    yield from _family("response_cache_bytes", "gauge", "Cached bytes.")
+    yield f"response_cache_bytes {response_cache.size}"
+    yield from _counter_lines(
+        "building_index_queries_total",
+        "Geo queries answered by the in-process building index.",
+        [("", building_index.stats.queries)],
+    )
+    queries = sorted(query_cache.queries.items())
+    for metric, attribute, help_text in (
+        ("query_executions_total", "executions", "Executed statements."),
+        (
+            "query_compiled_cache_hits_total",
+            "compiled_hits",
+            "Statements found in the SQLAlchemy compiled cache.",
+        ),
+        (
+            "query_prepared_cache_hits_total",
+            "prepared_hits",
+            "Statements found in the asyncpg prepared statement cache.",
+        ),
+    ):
+        yield from _counter_lines(
+            metric,
+            help_text,
+            [
+                (_labels(query=name), getattr(stats, attribute))
+                for name, stats in queries
+            ],
+        )
+    yield from _counter_lines(
+        "db_reads_total",
+        "GET sessions by the server they were routed to.",
+        [
+            (_labels(target="replica"), replicas.stats.replica_reads),
+            (_labels(target="primary"), replicas.stats.primary_reads),
+        ],
+    )
+
+
+def _query_lines(slow_queries: SlowQueryLog) -> Iterator[str]:
+    timings = sorted(slow_queries.timings.items())
+    yield from _family(
+        "query_duration_seconds", "summary", "Statement time per query."
+    )
+    for name, stats in timings:
+        labels = _labels(query=name)
+        yield f"query_duration_seconds_sum{{{labels}}} {stats.total_s}"
+        yield f"query_duration_seconds_count{{{labels}}} {stats.count}"
+    yield from _counter_lines(
+        "query_slow_total",
+        "Statements over SLOW_QUERY_MS.",
+        [(_labels(query=name), stats.slow) for name, stats in timings],
+    )
+
+
+def engines(state: State) -> dict[str, AsyncEngine]:
+    replicas: ReplicaSet = state.replicas
+    return {
+        "primary": state.engine,
+        **{
+            f"replica{index}": replica.engine
+            for index, replica in enumerate(replicas.replicas)
+        },
+    }
+
+
+def render(state: State) -> str:
+    """All metrics of the app whose ``state`` is given, as one document."""
+    lines = [
+        *_request_lines(state.metrics),
+        *_pool_lines(engines(state)),
+        *_query_lines(state.slow_queries),
+        *_cache_lines(state),
+    ]
+    return "\n".join(lines) + "\n"
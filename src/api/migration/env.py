@@ -6,7 +6,13 @@ from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
-from api.database.schema import actiivty, agency, building
+from api.database.schema import (
+    actiivty,
+    agency,
+    agency_card,
+    building,
+    table_writes,
+)
 from api.database.schema.base import metadata
 from api.settings import settings
 
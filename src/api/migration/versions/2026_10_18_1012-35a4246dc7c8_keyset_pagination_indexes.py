@@ -0,0 +1,63 @@
+"""keyset pagination indexes
+
+Revision ID: 35a4246dc7c8
+Revises: f3a454b9a11e
+Create Date: 2026-10-18 10:12:41.530218+03:00
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "35a4246dc7c8"
+down_revision: str | Sequence[str] | None = "f3a454b9a11e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_agency_building_building_id_agency_id",
+        "agency_building",
+        ["building_id", "agency_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_agency_building_building_id", table_name="agency_building"
+    )
+    op.create_index(
+        "ix_agency_activity_activity_id_agency_id",
+        "agency_activity",
+        ["activity_id", "agency_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_agency_activity_activity_id", table_name="agency_activity"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_agency_activity_activity_id",
+        "agency_activity",
+        ["activity_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_agency_activity_activity_id_agency_id",
+        table_name="agency_activity",
+    )
+    op.create_index(
+        "ix_agency_building_building_id",
+        "agency_building",
+        ["building_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_agency_building_building_id_agency_id",
+        table_name="agency_building",
+    )
@@ -0,0 +1,50 @@
+"""agency name search indexes
+
+Revision ID: 670ea1466ad6
+Revises: 35a4246dc7c8
+Create Date: 2026-10-18 10:47:09.184412+03:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "670ea1466ad6"
+down_revision: str | Sequence[str] | None = "35a4246dc7c8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_agency_name_name_trgm",
+            "agency_name",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_agency_name_name_prefix",
+            "agency_name",
+            [sa.text('lower(name) COLLATE "C"'), "agency_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_agency_name_name_prefix", table_name="agency_name")
+    op.drop_index(
+        "ix_agency_name_name_trgm",
+        table_name="agency_name",
+        postgresql_using="gin",
+    )
@@ -0,0 +1,263 @@
+"""agency card read model
+
+Revision ID: 9c1d7e20b4a5
+Revises: 670ea1466ad6
+Create Date: 2026-10-18 11:32:57.604118+03:00
+
+"""
+
+from collections.abc import Sequence
+
+import geoalchemy2
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1d7e20b4a5"
+down_revision: str | Sequence[str] | None = "670ea1466ad6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION agency_card_refresh(agency_ids bigint[])
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF coalesce(cardinality(agency_ids), 0) = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO agency_card (
+        agency_id, building_id, geom, activity_ids, document, updated_at
+    )
+    SELECT
+        a.id,
+        ab.building_id,
+        bg.geom,
+        array(
+            SELECT aa.activity_id
+            FROM agency_activity AS aa
+            WHERE aa.agency_id = a.id
+            ORDER BY aa.activity_id
+        ),
+        jsonb_build_object(
+            'id', a.id,
+            'name', an.name,
+            'phones', coalesce(ph.phones, '[]'::jsonb),
+            'building', jsonb_build_object(
+                'id', ab.building_id,
+                'address', ba.address,
+                'lat', ST_Y(bg.geom),
+                'lon', ST_X(bg.geom)
+            ),
+            'activities', coalesce(act.activities, '[]'::jsonb)
+        ),
+        now()
+    FROM agency AS a
+    JOIN agency_name AS an ON an.agency_id = a.id
+    JOIN agency_building AS ab ON ab.agency_id = a.id
+    JOIN building_address AS ba ON ba.building_id = ab.building_id
+    JOIN building_geo AS bg ON bg.building_id = ab.building_id
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(p.phone ORDER BY p.id) AS phones
+        FROM agency_phone AS p
+        WHERE p.agency_id = a.id
+    ) AS ph ON true
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(
+            jsonb_build_object(
+                'id', ac.id,
+                'name', acn.name,
+                'parent_id', ap.parent_id
+            )
+            ORDER BY ac.id
+        ) AS activities
+        FROM agency_activity AS aa
+        JOIN activity AS ac ON ac.id = aa.activity_id
+        JOIN activity_name AS acn ON acn.activity_id = ac.id
+        LEFT JOIN activity_parent AS ap ON ap.activity_id = ac.id
+        WHERE aa.agency_id = a.id
+    ) AS act ON true
+    WHERE a.id = ANY(agency_ids)
+    ON CONFLICT (agency_id) DO UPDATE SET
+        building_id = excluded.building_id,
+        geom = excluded.geom,
+        activity_ids = excluded.activity_ids,
+        document = excluded.document,
+        updated_at = excluded.updated_at;
+
+    DELETE FROM agency_card AS c
+    WHERE c.agency_id = ANY(agency_ids)
+      AND NOT EXISTS (
+        SELECT 1
+        FROM agency_name AS an
+        JOIN agency_building AS ab ON ab.agency_id = an.agency_id
+        JOIN building_address AS ba ON ba.building_id = ab.building_id
+        JOIN building_geo AS bg ON bg.building_id = ab.building_id
+        WHERE an.agency_id = c.agency_id
+      );
+END
+$$
+"""
+
+_SYNC_FUNCTION = """
+CREATE OR REPLACE FUNCTION {name}()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    changed bigint[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed := array(SELECT {key} FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed := array(SELECT {key} FROM old_rows);
+    ELSE
+        changed := array(
+            SELECT {key} FROM new_rows UNION SELECT {key} FROM old_rows
+        );
+    END IF;
+    PERFORM agency_card_refresh({agency_ids});
+    RETURN NULL;
+END
+$$
+"""
+
+# Sync function -> (key column of the source rows, affected agency ids).
+_SYNC_FUNCTIONS: dict[str, tuple[str, str]] = {
+    "agency_card_sync_by_agency": ("agency_id", "changed"),
+    "agency_card_sync_by_building": (
+        "building_id",
+        "array(SELECT agency_id FROM agency_building"
+        " WHERE building_id = ANY(changed))",
+    ),
+    "agency_card_sync_by_activity": (
+        "activity_id",
+        "array(SELECT DISTINCT agency_id FROM agency_activity"
+        " WHERE activity_id = ANY(changed))",
+    ),
+}
+
+# Normalized table -> sync function fired by its statement triggers.
+_SOURCES: dict[str, str] = {
+    "agency_name": "agency_card_sync_by_agency",
+    "agency_phone": "agency_card_sync_by_agency",
+    "agency_building": "agency_card_sync_by_agency",
+    "agency_activity": "agency_card_sync_by_agency",
+    "building_address": "agency_card_sync_by_building",
+    "building_geo": "agency_card_sync_by_building",
+    "activity_name": "agency_card_sync_by_activity",
+    "activity_parent": "agency_card_sync_by_activity",
+}
+
+# Transition tables force one trigger per event.
+_TRIGGER_EVENTS: dict[str, str] = {
+    "insert": "INSERT REFERENCING NEW TABLE AS new_rows",
+    "update": "UPDATE REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "DELETE REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "agency_card",
+        sa.Column("agency_id", sa.BigInteger(), nullable=False),
+        sa.Column("building_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "geom",
+            geoalchemy2.types.Geometry(
+                geometry_type="POINT",
+                srid=4326,
+                dimension=2,
+                spatial_index=False,
+                from_text="ST_GeomFromEWKT",
+                name="geometry",
+                nullable=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "activity_ids",
+            postgresql.ARRAY(sa.BigInteger()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column(
+            "document",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["agency_id"], ["agency.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("agency_id"),
+    )
+    op.create_index(
+        "ix_agency_card_building_id_agency_id",
+        "agency_card",
+        ["building_id", "agency_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_agency_card_geom",
+        "agency_card",
+        ["geom"],
+        unique=False,
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "ix_agency_card_activity_ids",
+        "agency_card",
+        ["activity_ids"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.execute(_REFRESH_FUNCTION)
+    for name, (key, agency_ids) in _SYNC_FUNCTIONS.items():
+        op.execute(
+            _SYNC_FUNCTION.format(name=name, key=key, agency_ids=agency_ids)
+        )
+    for table, function in _SOURCES.items():
+        for suffix, events in _TRIGGER_EVENTS.items():
+            op.execute(
+                f"CREATE TRIGGER {table}_agency_card_{suffix}"
+                f" AFTER {events} ON {table}"
+                f" FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+            )
+    op.execute("SELECT agency_card_refresh(array(SELECT id FROM agency))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _SOURCES:
+        for suffix in _TRIGGER_EVENTS:
+            op.execute(
+                f"DROP TRIGGER IF EXISTS {table}_agency_card_{suffix}"
+                f" ON {table}"
+            )
+    for name in _SYNC_FUNCTIONS:
+        op.execute(f"DROP FUNCTION IF EXISTS {name}()")
+    op.execute("DROP FUNCTION IF EXISTS agency_card_refresh(bigint[])")
+    op.drop_index(
+        "ix_agency_card_activity_ids",
+        table_name="agency_card",
+        postgresql_using="gin",
+    )
+    op.drop_index(
+        "ix_agency_card_geom",
+        table_name="agency_card",
+        postgresql_using="gist",
+    )
+    op.drop_index(
+        "ix_agency_card_building_id_agency_id", table_name="agency_card"
+    )
+    op.drop_table("agency_card")
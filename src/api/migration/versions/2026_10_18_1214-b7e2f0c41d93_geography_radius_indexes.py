@@ -0,0 +1,53 @@
+"""geography radius indexes
+
+Revision ID: b7e2f0c41d93
+Revises: 9c1d7e20b4a5
+Create Date: 2026-10-18 12:14:36.218904+03:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2f0c41d93"
+down_revision: str | Sequence[str] | None = "9c1d7e20b4a5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_building_geo_geog",
+            "building_geo",
+            [sa.text("(geography(geom))")],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_agency_card_geog",
+            "agency_card",
+            [sa.text("(geography(geom))")],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_agency_card_geog",
+        table_name="agency_card",
+        postgresql_using="gist",
+    )
+    op.drop_index(
+        "ix_building_geo_geog",
+        table_name="building_geo",
+        postgresql_using="gist",
+    )
@@ -0,0 +1,50 @@
+"""table write notifications
+
+Revision ID: 4d8a1f6c2b90
+Revises: b7e2f0c41d93
+Create Date: 2026-10-18 13:02:11.540127+03:00
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d8a1f6c2b90"
+down_revision: str | Sequence[str] | None = "b7e2f0c41d93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_table_write()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Sent on commit, once per table and transaction.
+    PERFORM pg_notify('table_writes', TG_TABLE_NAME);
+    RETURN NULL;
+END
+$$
+"""
+
+_TABLES = ("activity_closure",)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(_NOTIFY_FUNCTION)
+    for table in _TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_write"
+            f" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}"
+            " FOR EACH STATEMENT EXECUTE FUNCTION notify_table_write()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_write ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_table_write()")
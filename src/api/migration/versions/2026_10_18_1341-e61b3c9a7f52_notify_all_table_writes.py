@@ -0,0 +1,49 @@
+"""notify all table writes
+
+Revision ID: e61b3c9a7f52
+Revises: 4d8a1f6c2b90
+Create Date: 2026-10-18 13:41:27.093815+03:00
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e61b3c9a7f52"
+down_revision: str | Sequence[str] | None = "4d8a1f6c2b90"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# ``activity_closure`` already notifies since 4d8a1f6c2b90.
+_TABLES = (
+    "activity",
+    "activity_name",
+    "activity_parent",
+    "agency",
+    "agency_activity",
+    "agency_building",
+    "agency_card",
+    "agency_name",
+    "agency_phone",
+    "building",
+    "building_address",
+    "building_geo",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in _TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_write"
+            f" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}"
+            " FOR EACH STATEMENT EXECUTE FUNCTION notify_table_write()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_write ON {table}")
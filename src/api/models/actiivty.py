@@ -1,6 +1,12 @@
-from typing import Annotated
+from collections import defaultdict, deque
+from typing import Annotated, Self
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+MAX_BULK_ACTIVITIES = 5000
+
+# ``(name, index of the parent node)``; roots have no parent index.
+ActivityDraft = tuple[str, int | None]
 
 
 class ActivityCreate(BaseModel):
@@ -12,3 +18,86 @@ class ActivityOut(BaseModel):
     id: int
     name: str
     parent_id: Annotated[int | None, Field(default=None, ge=1)]
+
+
+class ActivityNode(BaseModel):
+    name: Annotated[str, Field(min_length=1)]
+    children: list[ActivityNode] = Field(default_factory=list)
+
+
+class ActivityItem(BaseModel):
+    ref: Annotated[str, Field(min_length=1)]
+    name: Annotated[str, Field(min_length=1)]
+    parent_ref: Annotated[str | None, Field(default=None, min_length=1)]
+
+
+class ActivityBulkCreate(BaseModel):
+    """A subtree given either as nested ``tree`` nodes or flat ``items``.
+
+    Flat items point at their parent through ``parent_ref``. Roots of
+    either shape are attached to the existing ``parent_id`` activity.
+    """
+
+    parent_id: Annotated[int | None, Field(default=None, ge=1)]
+    tree: list[ActivityNode] | None = None
+    items: Annotated[
+        list[ActivityItem] | None,
+        Field(default=None, max_length=MAX_BULK_ACTIVITIES),
+    ]
+
+    @model_validator(mode="after")
+    def _check_shape(self) -> Self:
+        if (self.tree is None) == (self.items is None):
+            raise ValueError("Exactly one of tree or items is required.")
+        return self
+
+    def drafts(self) -> list[ActivityDraft]:
+        """Nodes in parent-first order, each pointing at its parent index."""
+        if self.items is not None:
+            drafts = _item_drafts(self.items)
+        else:
+            drafts = _tree_drafts(self.tree or [])
+        if not drafts:
+            raise ValueError("No activities to create.")
+        if len(drafts) > MAX_BULK_ACTIVITIES:
+            raise ValueError(
+                f"At most {MAX_BULK_ACTIVITIES} activities per request."
+            )
+        return drafts
+
+
+def _tree_drafts(roots: list[ActivityNode]) -> list[ActivityDraft]:
+    drafts: list[ActivityDraft] = []
+    queue: deque[tuple[ActivityNode, int | None]] = deque(
+        (root, None) for root in roots
+    )
+    while queue:
+        node, parent = queue.popleft()
+        drafts.append((node.name, parent))
+        index = len(drafts) - 1
+        queue.extend((child, index) for child in node.children)
+    return drafts
+
+
+def _item_drafts(items: list[ActivityItem]) -> list[ActivityDraft]:
+    refs = {item.ref for item in items}
+    if len(refs) != len(items):
+        raise ValueError("Activity refs must be unique.")
+    children: defaultdict[str | None, list[ActivityItem]] = defaultdict(list)
+    for item in items:
+        if item.parent_ref is not None and item.parent_ref not in refs:
+            raise ValueError(f"Unknown parent_ref {item.parent_ref!r}.")
+        children[item.parent_ref].append(item)
+    drafts: list[ActivityDraft] = []
+    queue: deque[tuple[ActivityItem, int | None]] = deque(
+        (item, None) for item in children[None]
+    )
+    while queue:
+        item, parent = queue.popleft()
+        drafts.append((item.name, parent))
+        index = len(drafts) - 1
+        queue.extend((child, index) for child in children[item.ref])
+    if len(drafts) != len(items):
+        # Items never reached from a root sit on a parent_ref cycle.
+        raise ValueError("Activity parent_refs must not form a cycle.")
+    return drafts
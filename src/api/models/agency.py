@@ -1,20 +1,41 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field
 
 from api.models.actiivty import ActivityOut
 from api.models.building import BuildingOut
-from api.models.geo import GeoQueryBase
+from api.models.geo import GeoQueryBase, NearestQueryBase
+from api.models.pagination import PageQuery
 
+NameSearchMode = Literal["substring", "similarity", "prefix"]
+MAX_BATCH_IDS = 5000
 
-class AgencyListQuery(BaseModel):
+
+class AgencyListQuery(PageQuery):
     building_id: Annotated[int | None, Field(default=None, ge=1)]
     activity_id: Annotated[int | None, Field(default=None, ge=1)]
     include_descendants: bool = False
     name: str | None = None
+    name_mode: NameSearchMode = "substring"
+    min_similarity: Annotated[float, Field(gt=0, le=1)] = 0.3
+
+    def cursor_key_types(self) -> tuple[type, ...]:
+        if self.name is None:
+            return (int,)
+        match self.name_mode:
+            case "similarity":
+                return (float, int)
+            case "prefix":
+                return (str, int)
+            case _:
+                return (int,)
+
+
+class AgencyGeoQuery(GeoQueryBase, PageQuery):
+    pass
 
 
-class AgencyGeoQuery(GeoQueryBase):
+class AgencyNearestQuery(NearestQueryBase):
     pass
 
 
@@ -24,3 +45,19 @@ class AgencyOut(BaseModel):
     phones: Annotated[list[str], Field(default_factory=list)]
     building: BuildingOut
     activities: Annotated[list[ActivityOut], Field(default_factory=list)]
+
+
+class AgencyNearestOut(AgencyOut):
+    distance_m: float
+
+
+class AgencyBatchQuery(BaseModel):
+    ids: Annotated[
+        list[Annotated[int, Field(ge=1)]],
+        Field(min_length=1, max_length=MAX_BATCH_IDS),
+    ]
+
+
+class AgencyBatchOut(BaseModel):
+    agencies: list[AgencyOut]
+    missing: list[int]
@@ -1,9 +1,14 @@
 from pydantic import BaseModel
 
-from api.models.geo import GeoQueryBase
+from api.models.geo import GeoQueryBase, NearestQueryBase
+from api.models.pagination import PageQuery
 
 
-class BuildingGeoQuery(GeoQueryBase):
+class BuildingGeoQuery(GeoQueryBase, PageQuery):
+    pass
+
+
+class BuildingNearestQuery(NearestQueryBase):
     pass
 
 
@@ -12,3 +17,7 @@ class BuildingOut(BaseModel):
     address: str
     lat: float
     lon: float
+
+
+class BuildingNearestOut(BuildingOut):
+    distance_m: float
@@ -0,0 +1,36 @@
+from typing import Annotated, Any
+
+from pydantic import BaseModel, Field, field_validator
+
+# Separator of list values in CSV cells, e.g. ``2-222-222;3-333-333``.
+CSV_LIST_SEPARATOR = ";"
+
+
+class ActivityImport(BaseModel):
+    id: Annotated[int, Field(ge=1)]
+    name: Annotated[str, Field(min_length=1)]
+    parent_id: Annotated[int | None, Field(default=None, ge=1)]
+
+
+class BuildingImport(BaseModel):
+    id: Annotated[int, Field(ge=1)]
+    address: Annotated[str, Field(min_length=1)]
+    lat: Annotated[float, Field(ge=-90, le=90)]
+    lon: Annotated[float, Field(ge=-180, le=180)]
+
+
+class AgencyImport(BaseModel):
+    id: Annotated[int, Field(ge=1)]
+    name: Annotated[str, Field(min_length=1)]
+    building_id: Annotated[int, Field(ge=1)]
+    phones: Annotated[list[str], Field(default_factory=list)]
+    activity_ids: Annotated[
+        list[Annotated[int, Field(ge=1)]], Field(default_factory=list)
+    ]
+
+    @field_validator("phones", "activity_ids", mode="before")
+    @classmethod
+    def split_csv_list(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [item for item in value.split(CSV_LIST_SEPARATOR) if item]
+        return value
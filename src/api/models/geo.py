@@ -2,8 +2,13 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field, model_validator
 
+from api.models.pagination import MAX_PAGE_LIMIT
+from api.models.query import QueryModel
 
-class GeoQueryBase(BaseModel):
+DEFAULT_NEAREST_LIMIT = 20
+
+
+class GeoQueryBase(QueryModel):
     lat: Annotated[float | None, Field(ge=-90, le=90)] = None
     lon: Annotated[float | None, Field(ge=-180, le=180)] = None
     radius_m: Annotated[float | None, Field(gt=0)] = None
@@ -58,3 +63,13 @@ class GeoQueryBase(BaseModel):
         if has_all_box:
             self._validate_bounds()
         return self
+
+
+class NearestQueryBase(QueryModel):
+    lat: Annotated[float, Field(ge=-90, le=90)]
+    lon: Annotated[float, Field(ge=-180, le=180)]
+    limit: Annotated[int, Field(ge=1, le=MAX_PAGE_LIMIT)] = (
+        DEFAULT_NEAREST_LIMIT
+    )
+    activity_id: Annotated[int | None, Field(ge=1)] = None
+    include_descendants: bool = False
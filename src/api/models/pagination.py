@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+from collections.abc import Mapping, Sequence
+from typing import Annotated, Any
+
+from pydantic import Field, model_validator
+
+from api.models.query import QueryModel
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CursorKey = tuple[int | float | str, ...]
+
+
+def encode_cursor(*key: int | float | str) -> str:
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        key = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if (
+        not isinstance(key, list)
+        or not key
+        or not isinstance(key[-1], int)
+        or not all(isinstance(value, int | float | str) for value in key)
+    ):
+        raise ValueError("Invalid cursor.")
+    return tuple(key)
+
+
+def next_cursor(
+    rows: Sequence[Mapping[str, Any]],
+    limit: int,
+    *key_fields: str,
+) -> str | None:
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(last[field] for field in key_fields), last["id"])
+
+
+class PageQuery(QueryModel):
+    limit: Annotated[int, Field(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT
+    cursor: str | None = None
+
+    def cursor_key_types(self) -> tuple[type, ...]:
+        return (int,)
+
+    @model_validator(mode="after")
+    def validate_cursor(self) -> PageQuery:
+        after = self.after
+        if after is None:
+            return self
+        types = self.cursor_key_types()
+        if len(after) != len(types) or not all(
+            isinstance(value, int | float if kind is float else kind)
+            for value, kind in zip(after, types, strict=True)
+        ):
+            raise ValueError("Invalid cursor.")
+        return self
+
+    @property
+    def after(self) -> CursorKey | None:
+        if self.cursor is None:
+            return None
+        return decode_cursor(self.cursor)
+
+    @property
+    def after_id(self) -> int | None:
+        after = self.after
+        if after is None:
+            return None
+        return int(after[-1])
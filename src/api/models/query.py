@@ -0,0 +1,13 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+from api.timing import phase
+
+
+class QueryModel(BaseModel):
+    """Query-string model whose validation is timed as ``params``."""
+
+    def __init__(self, **data: Any) -> None:
+        with phase("params"):
+            super().__init__(**data)
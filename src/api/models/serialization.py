@@ -0,0 +1,84 @@
+from collections.abc import AsyncGenerator, AsyncIterator, Mapping, Sequence
+from contextlib import aclosing
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import StreamingResponse
+from starlette.types import Send
+
+from api.timing import phase
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {"content": {NDJSON_MEDIA_TYPE: {}}},
+}
+
+Row = Mapping[str, Any]
+
+
+@cache
+def list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+@cache
+def model_adapter(model: type[BaseModel]) -> TypeAdapter[Any]:
+    return TypeAdapter(model)
+
+
+def dump_rows(model: type[BaseModel], rows: Sequence[Row]) -> bytes:
+    """Validate query rows as ``list[model]`` once and dump them as JSON.
+
+    The whole list goes through a single pydantic-core call each way;
+    routes return the bytes, so FastAPI does not validate them again.
+    """
+    adapter = list_adapter(model)
+    with phase("model"):
+        items = adapter.validate_python(rows)
+    with phase("json"):
+        return adapter.dump_json(items)
+
+
+def dump_row(model: type[BaseModel], row: Row) -> bytes:
+    adapter = model_adapter(model)
+    with phase("model"):
+        item = adapter.validate_python(row)
+    with phase("json"):
+        return adapter.dump_json(item)
+
+
+def dump_lines(model: type[BaseModel], rows: Sequence[Row]) -> bytes:
+    adapter = model_adapter(model)
+    return b"".join(
+        adapter.dump_json(item) + b"\n"
+        for item in list_adapter(model).validate_python(rows)
+    )
+
+
+class NdjsonResponse(StreamingResponse):
+    """Row batches sent as newline-delimited JSON, one chunk per batch.
+
+    A batch is only fetched once the previous chunk has been sent. The
+    batch iterator is closed as soon as sending stops, so a client that
+    disconnects releases the database cursor right away.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        batches: AsyncGenerator[Sequence[Row]],
+    ) -> None:
+        self.batches = batches
+        super().__init__(self._lines(model))
+
+    async def _lines(self, model: type[BaseModel]) -> AsyncIterator[bytes]:
+        async for rows in self.batches:
+            if rows:
+                yield dump_lines(model, rows)
+
+    async def stream_response(self, send: Send) -> None:
+        async with aclosing(self.batches):
+            await super().stream_response(send)
@@ -1,12 +1,21 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.cache.activity_tree import ActivityTree
+from api.cache.response import JSON_MEDIA_TYPE
+from api.database.replicas import CONSISTENCY_HEADER, ReplicaSet
 from api.database.schema.actiivty import Activity
 from api.dependencies.auth import verify_api_key
-from api.dependencies.db import get_session
-from api.models.actiivty import ActivityCreate, ActivityOut
+from api.dependencies.cache import get_activity_tree
+from api.dependencies.db import get_replicas, get_session
+from api.models.actiivty import (
+    ActivityBulkCreate,
+    ActivityCreate,
+    ActivityOut,
+)
+from api.models.serialization import dump_rows
 
 router = APIRouter(
     tags=["activity"],
@@ -17,7 +26,10 @@ router = APIRouter(
 @router.post("/activity", status_code=201, response_model=ActivityOut)
 async def create_activity(
     payload: Annotated[ActivityCreate, Body()],
+    response: Response,
     session: Annotated[AsyncSession, Depends(get_session)],
+    activity_tree: Annotated[ActivityTree, Depends(get_activity_tree)],
+    replicas: Annotated[ReplicaSet, Depends(get_replicas)],
 ) -> ActivityOut:
     try:
         activity = await Activity.create_activity(
@@ -30,9 +42,58 @@ async def create_activity(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exc),
         ) from exc
+    await session.commit()
+    activity_tree.add(activity.id, payload.parent_id)
+    token = await replicas.write_token(session)
+    if token is not None:
+        response.headers[CONSISTENCY_HEADER] = token
 
     return ActivityOut(
         id=activity.id,
         name=payload.name,
         parent_id=payload.parent_id,
     )
+
+
+@router.post(
+    "/activity/bulk", status_code=201, response_model=list[ActivityOut]
+)
+async def create_activities(
+    payload: Annotated[ActivityBulkCreate, Body()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    activity_tree: Annotated[ActivityTree, Depends(get_activity_tree)],
+    replicas: Annotated[ReplicaSet, Depends(get_replicas)],
+) -> Response:
+    try:
+        drafts = payload.drafts()
+        ids = await Activity.create_tree(
+            session=session,
+            drafts=drafts,
+            parent_id=payload.parent_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    await session.commit()
+
+    parent_ids = [
+        payload.parent_id if parent is None else ids[parent]
+        for _, parent in drafts
+    ]
+    for activity_id, parent_id in zip(ids, parent_ids, strict=True):
+        activity_tree.add(activity_id, parent_id)
+    rows = [
+        {"id": activity_id, "name": name, "parent_id": parent_id}
+        for activity_id, (name, _), parent_id in zip(
+            ids, drafts, parent_ids, strict=True
+        )
+    ]
+    token = await replicas.write_token(session)
+    return Response(
+        content=dump_rows(ActivityOut, rows),
+        status_code=status.HTTP_201_CREATED,
+        media_type=JSON_MEDIA_TYPE,
+        headers=None if token is None else {CONSISTENCY_HEADER: token},
+    )
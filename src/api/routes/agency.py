@@ -1,24 +1,65 @@
-from typing import Annotated
+from typing import Annotated, Any, cast
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.cache.activity_tree import ActivityTree
+from api.cache.conditional import (
+    NOT_MODIFIED_RESPONSES,
+    conditional,
+    is_not_modified,
+    not_modified,
+    validator_headers,
+)
+from api.cache.response import JSON_MEDIA_TYPE, RequestCache
 from api.database.queries import agency as agency_queries
+from api.database.queries.rendering import JsonPage
+from api.database.schema.base import metadata
 from api.dependencies.auth import verify_api_key
-from api.dependencies.db import get_session
-from api.models.agency import AgencyGeoQuery, AgencyListQuery, AgencyOut
+from api.dependencies.cache import get_activity_tree, get_response_cache
+from api.dependencies.db import get_session, get_snapshot_session
+from api.dependencies.streaming import wants_stream
+from api.models.agency import (
+    AgencyBatchOut,
+    AgencyBatchQuery,
+    AgencyGeoQuery,
+    AgencyListQuery,
+    AgencyNearestOut,
+    AgencyNearestQuery,
+    AgencyOut,
+)
+from api.models.pagination import NEXT_CURSOR_HEADER, next_cursor
+from api.models.serialization import (
+    NDJSON_RESPONSES,
+    NdjsonResponse,
+    dump_row,
+    dump_rows,
+)
+from api.settings import settings
 
 router = APIRouter(
     tags=["agency"],
     dependencies=[Depends(verify_api_key)],
 )
 
+# An agency document embeds its building and activities.
+_CACHE_TAGS = frozenset(metadata.tables)
 
-@router.get("/agency", response_model=list[AgencyOut])
-async def list_agencies(
-    params: Annotated[AgencyListQuery, Depends()],
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> list[AgencyOut]:
+
+async def _list_agency_rows(
+    params: AgencyListQuery,
+    session: AsyncSession,
+    activity_tree: ActivityTree,
+) -> tuple[list[dict[str, Any]], tuple[str, ...]]:
     match params:
         case AgencyListQuery(
             building_id=int() as building_id, activity_id=None, name=None
@@ -26,8 +67,10 @@ async def list_agencies(
             rows = await agency_queries.list_agencies_by_building(
                 session=session,
                 building_id=building_id,
+                limit=params.limit,
+                after_id=params.after_id,
             )
-            return [AgencyOut.model_validate(row) for row in rows]
+            return rows, ()
         case AgencyListQuery(
             activity_id=int() as activity_id,
             include_descendants=bool() as include_descendants,
@@ -38,15 +81,48 @@ async def list_agencies(
                 session=session,
                 activity_id=activity_id,
                 include_descendants=include_descendants,
+                limit=params.limit,
+                after_id=params.after_id,
+                descendant_ids=activity_tree.descendants(activity_id),
             )
-            return [AgencyOut.model_validate(row) for row in rows]
+            return rows, ()
+        case AgencyListQuery(
+            name=str() as name,
+            name_mode="prefix",
+            activity_id=None,
+            building_id=None,
+        ):
+            rows = await agency_queries.list_agencies_by_name_prefix(
+                session=session,
+                prefix=name,
+                limit=params.limit,
+                after=cast(tuple[str, int] | None, params.after),
+            )
+            return rows, ("sort_key",)
+        case AgencyListQuery(
+            name=str() as name,
+            name_mode="similarity",
+            activity_id=None,
+            building_id=None,
+        ):
+            rows = await agency_queries.list_agencies_by_name_similarity(
+                session=session,
+                name=name,
+                min_similarity=params.min_similarity,
+                limit=params.limit,
+                after=cast(tuple[float, int] | None, params.after),
+            )
+            return rows, ("rank",)
         case AgencyListQuery(
             name=str() as name, activity_id=None, building_id=None
         ):
             rows = await agency_queries.list_agencies_by_name(
-                session=session, name=name
+                session=session,
+                name=name,
+                limit=params.limit,
+                after_id=params.after_id,
             )
-            return [AgencyOut.model_validate(row) for row in rows]
+            return rows, ()
         case _:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,28 +130,226 @@ async def list_agencies(
             )
 
 
-@router.get("/agency/geo", response_model=list[AgencyOut])
+async def _render_agency_page(
+    params: AgencyListQuery,
+    session: AsyncSession,
+    activity_tree: ActivityTree,
+) -> JsonPage | None:
+    """Postgres-rendered body for the id-ordered filters, else None."""
+    match params:
+        case AgencyListQuery(
+            building_id=int() as building_id, activity_id=None, name=None
+        ):
+            return await agency_queries.render_agencies_by_building(
+                session=session,
+                building_id=building_id,
+                limit=params.limit,
+                after_id=params.after_id,
+            )
+        case AgencyListQuery(
+            activity_id=int() as activity_id,
+            include_descendants=bool() as include_descendants,
+            building_id=None,
+            name=None,
+        ):
+            return await agency_queries.render_agencies_by_activity(
+                session=session,
+                activity_id=activity_id,
+                include_descendants=include_descendants,
+                limit=params.limit,
+                after_id=params.after_id,
+                descendant_ids=activity_tree.descendants(activity_id),
+            )
+        case AgencyListQuery(
+            name=str() as name,
+            name_mode="substring",
+            activity_id=None,
+            building_id=None,
+        ):
+            return await agency_queries.render_agencies_by_name(
+                session=session,
+                name=name,
+                limit=params.limit,
+                after_id=params.after_id,
+            )
+        case _:
+            return None
+
+
+async def _list_agency_body(
+    params: AgencyListQuery,
+    session: AsyncSession,
+    activity_tree: ActivityTree,
+) -> tuple[bytes, str | None]:
+    if settings.AGENCY_JSON_PASSTHROUGH:
+        page = await _render_agency_page(params, session, activity_tree)
+        if page is not None:
+            return page.body, page.next_cursor(params.limit)
+    rows, cursor_fields = await _list_agency_rows(
+        params, session, activity_tree
+    )
+    body = dump_rows(AgencyOut, rows)
+    return body, next_cursor(rows, params.limit, *cursor_fields)
+
+
+async def _list_agency_validators(
+    params: AgencyListQuery,
+    session: AsyncSession,
+) -> dict[str, str]:
+    match params:
+        case AgencyListQuery(
+            building_id=int() as building_id, activity_id=None, name=None
+        ):
+            version = await agency_queries.get_building_agencies_version(
+                session=session,
+                building_id=building_id,
+                limit=params.limit,
+                after_id=params.after_id,
+            )
+            return {} if version is None else validator_headers(*version)
+        case _:
+            return {}
+
+
+def _agency_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Agency not found.",
+    )
+
+
+@router.get(
+    "/agency",
+    response_model=list[AgencyOut],
+    responses=NOT_MODIFIED_RESPONSES,
+)
+async def list_agencies(
+    request: Request,
+    params: Annotated[AgencyListQuery, Depends()],
+    session: Annotated[AsyncSession, Depends(get_snapshot_session)],
+    activity_tree: Annotated[ActivityTree, Depends(get_activity_tree)],
+    response_cache: Annotated[RequestCache, Depends(get_response_cache)],
+) -> Response:
+    cache = response_cache.route("list_agencies", params, _CACHE_TAGS)
+    if (cached := cache.lookup()) is not None:
+        return conditional(request, cached)
+    headers = await _list_agency_validators(params, session)
+    if is_not_modified(request, headers):
+        return not_modified(headers)
+    body, cursor = await _list_agency_body(params, session, activity_tree)
+    if cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return cache.respond(body, headers)
+
+
+@router.get(
+    "/agency/geo",
+    response_model=list[AgencyOut],
+    responses=NDJSON_RESPONSES,
+)
 async def list_agencies_by_geo(
     params: Annotated[AgencyGeoQuery, Depends()],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> list[AgencyOut]:
-    rows = await agency_queries.list_agencies_by_geo(
-        session=session, geo=params
+    response_cache: Annotated[RequestCache, Depends(get_response_cache)],
+    stream: Annotated[bool, Depends(wants_stream)],
+) -> Response:
+    if stream:
+        batches = agency_queries.stream_agencies_by_geo(session, params)
+        return NdjsonResponse(AgencyOut, batches)
+    cache = response_cache.route("list_agencies_by_geo", params, _CACHE_TAGS)
+    if (cached := cache.lookup()) is not None:
+        return cached
+    if settings.AGENCY_JSON_PASSTHROUGH:
+        page = await agency_queries.render_agencies_by_geo(
+            session=session,
+            geo=params,
+            limit=params.limit,
+            after_id=params.after_id,
+        )
+        body, cursor = page.body, page.next_cursor(params.limit)
+    else:
+        rows = await agency_queries.list_agencies_by_geo(
+            session=session,
+            geo=params,
+            limit=params.limit,
+            after_id=params.after_id,
+        )
+        body = dump_rows(AgencyOut, rows)
+        cursor = next_cursor(rows, params.limit)
+    headers = {}
+    if cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return cache.respond(body, headers)
+
+
+@router.get("/agency/nearest", response_model=list[AgencyNearestOut])
+async def list_agencies_nearest(
+    params: Annotated[AgencyNearestQuery, Depends()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    activity_tree: Annotated[ActivityTree, Depends(get_activity_tree)],
+    response_cache: Annotated[RequestCache, Depends(get_response_cache)],
+) -> Response:
+    cache = response_cache.route("list_agencies_nearest", params, _CACHE_TAGS)
+    if (cached := cache.lookup()) is not None:
+        return cached
+    descendant_ids = None
+    if params.activity_id is not None:
+        descendant_ids = activity_tree.descendants(params.activity_id)
+    rows = await agency_queries.list_agencies_nearest(
+        session=session,
+        query=params,
+        descendant_ids=descendant_ids,
     )
-    return [AgencyOut.model_validate(row) for row in rows]
+    return cache.respond(dump_rows(AgencyNearestOut, rows))
 
 
-@router.get("/agency/{agency_id}", response_model=AgencyOut)
+@router.post("/agency/batch", response_model=AgencyBatchOut)
+async def get_agencies_batch(
+    payload: Annotated[AgencyBatchQuery, Body()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> Response:
+    ids = list(dict.fromkeys(payload.ids))
+    rows = await agency_queries.get_agencies_by_ids(
+        session=session, agency_ids=ids
+    )
+    by_id = {row["id"]: row for row in rows}
+    batch = {
+        "agencies": [
+            by_id[agency_id] for agency_id in ids if agency_id in by_id
+        ],
+        "missing": [agency_id for agency_id in ids if agency_id not in by_id],
+    }
+    return Response(
+        content=dump_row(AgencyBatchOut, batch),
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+@router.get(
+    "/agency/{agency_id}",
+    response_model=AgencyOut,
+    responses=NOT_MODIFIED_RESPONSES,
+)
 async def get_agency(
+    request: Request,
     agency_id: Annotated[int, Path(ge=1)],
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> AgencyOut:
+    session: Annotated[AsyncSession, Depends(get_snapshot_session)],
+    response_cache: Annotated[RequestCache, Depends(get_response_cache)],
+) -> Response:
+    cache = response_cache.route("get_agency", agency_id, _CACHE_TAGS)
+    if (cached := cache.lookup()) is not None:
+        return conditional(request, cached)
+    version = await agency_queries.get_agency_version(
+        session=session, agency_id=agency_id
+    )
+    if version is None:
+        raise _agency_not_found()
+    headers = validator_headers(*version)
+    if is_not_modified(request, headers):
+        return not_modified(headers)
     agency = await agency_queries.get_agency_by_id(
         session=session, agency_id=agency_id
     )
     if agency is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Agency not found.",
-        )
-    return AgencyOut.model_validate(agency)
+        raise _agency_not_found()
+    return cache.respond(dump_row(AgencyOut, agency), headers)
@@ -1,23 +1,98 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.cache.activity_tree import ActivityTree
+from api.cache.building_index import BuildingIndex
+from api.cache.response import RequestCache
 from api.database.queries import building as building_queries
+from api.database.schema.base import metadata
+from api.database.schema.building import BuildingAddress, BuildingGeo
 from api.dependencies.auth import verify_api_key
+from api.dependencies.cache import (
+    get_activity_tree,
+    get_building_index,
+    get_response_cache,
+)
 from api.dependencies.db import get_session
-from api.models.building import BuildingGeoQuery, BuildingOut
+from api.dependencies.streaming import wants_stream
+from api.models.building import (
+    BuildingGeoQuery,
+    BuildingNearestOut,
+    BuildingNearestQuery,
+    BuildingOut,
+)
+from api.models.pagination import NEXT_CURSOR_HEADER, next_cursor
+from api.models.serialization import (
+    NDJSON_RESPONSES,
+    NdjsonResponse,
+    dump_rows,
+)
 
 router = APIRouter(
     tags=["building"],
     dependencies=[Depends(verify_api_key)],
 )
 
+_CACHE_TAGS = frozenset(
+    {BuildingAddress.__tablename__, BuildingGeo.__tablename__}
+)
+# Activity filters reach agencies and the activity tree.
+_NEAREST_CACHE_TAGS = frozenset(metadata.tables)
+
 
-@router.get("/building/geo", response_model=list[BuildingOut])
+@router.get(
+    "/building/geo",
+    response_model=list[BuildingOut],
+    responses=NDJSON_RESPONSES,
+)
 async def list_buildings_by_geo(
     params: Annotated[BuildingGeoQuery, Depends()],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> list[BuildingOut]:
-    rows = await building_queries.list_buildings_by_geo(session, params)
-    return [BuildingOut.model_validate(row) for row in rows]
+    building_index: Annotated[
+        BuildingIndex | None, Depends(get_building_index)
+    ],
+    response_cache: Annotated[RequestCache, Depends(get_response_cache)],
+    stream: Annotated[bool, Depends(wants_stream)],
+) -> Response:
+    if stream:
+        batches = building_queries.stream_buildings_by_geo(session, params)
+        return NdjsonResponse(BuildingOut, batches)
+    cache = response_cache.route("list_buildings_by_geo", params, _CACHE_TAGS)
+    if (cached := cache.lookup()) is not None:
+        return cached
+    rows = await building_queries.list_buildings_by_geo(
+        session,
+        params,
+        limit=params.limit,
+        after_id=params.after_id,
+        building_index=building_index,
+    )
+    headers = {}
+    if cursor := next_cursor(rows, params.limit):
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return cache.respond(dump_rows(BuildingOut, rows), headers)
+
+
+@router.get("/building/nearest", response_model=list[BuildingNearestOut])
+async def list_buildings_nearest(
+    params: Annotated[BuildingNearestQuery, Depends()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    activity_tree: Annotated[ActivityTree, Depends(get_activity_tree)],
+    response_cache: Annotated[RequestCache, Depends(get_response_cache)],
+) -> Response:
+    cache = response_cache.route(
+        "list_buildings_nearest", params, _NEAREST_CACHE_TAGS
+    )
+    if (cached := cache.lookup()) is not None:
+        return cached
+    descendant_ids = None
+    if params.activity_id is not None:
+        descendant_ids = activity_tree.descendants(params.activity_id)
+    rows = await building_queries.list_buildings_nearest(
+        session,
+        params,
+        descendant_ids=descendant_ids,
+    )
+    return cache.respond(dump_rows(BuildingNearestOut, rows))
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Request, Response
+
+from api.metrics import PROMETHEUS_MEDIA_TYPE, render
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> Response:
+    return Response(
+        content=render(request.app.state),
+        media_type=PROMETHEUS_MEDIA_TYPE,
+    )
@@ -1,5 +1,5 @@
 from importlib import metadata
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import AfterValidator, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,6 +22,9 @@ def _load_project_metadata(dist_name: str) -> tuple[str | None, str | None]:
     return meta.get("Name"), meta.get("Version")
 
 
+AsyncpgDsn = Annotated[PostgresDsn, AfterValidator(_set_default_driver_name)]
+
+
 class Settings(BaseSettings):
     # SERVICE
     BIND: str = "0.0.0.0:8080"
@@ -29,9 +32,43 @@ class Settings(BaseSettings):
     WORKERS: int = 1
     ROOT_PATH: str = "/api/v1"
     API_KEY: str = "test-api-key"
+    SERVER_TIMING: bool = False
 
     # DB
-    PG_URL: Annotated[PostgresDsn, AfterValidator(_set_default_driver_name)]
+    PG_URL: AsyncpgDsn
+    PG_LISTEN_URL: AsyncpgDsn | None = None
+    PG_REPLICA_URLS: tuple[AsyncpgDsn, ...] = ()
+    PG_REPLICA_POLICY: Literal["round_robin", "least_used"] = "round_robin"
+    PG_REPLICA_CHECK_INTERVAL_S: float = 1.0
+    AGENCY_READ_MODEL: Literal["normalized", "card"] = "normalized"
+    AGENCY_JSON_PASSTHROUGH: bool = False
+    STREAM_YIELD_PER: int = 500
+    SQL_COMPILED_CACHE_SIZE: int = 500
+    PG_STATEMENT_CACHE_SIZE: int = 100
+
+    # POOL
+    PG_POOL_SIZE: int = 5
+    PG_MAX_OVERFLOW: int = 10
+    PG_POOL_TIMEOUT_S: float = 30.0
+    PG_POOL_RECYCLE_S: int = 1800
+    PG_PRE_PING: Literal["checkout", "periodic", "off"] = "periodic"
+    PG_PING_INTERVAL_S: float = 30.0
+    PG_TRANSACTION_POOLER: bool = False
+
+    # SLOW QUERIES
+    SLOW_QUERY_MS: float = 500.0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_INTERVAL_S: float = 3600.0
+    SLOW_QUERY_EXPLAINS_PER_MINUTE: int = 6
+
+    # CACHE
+    ACTIVITY_TREE_CACHE: bool | None = None
+    ACTIVITY_TREE_REFRESH_S: float = 300.0
+    BUILDING_INDEX: bool = False
+    BUILDING_INDEX_REFRESH_S: float = 30.0
+    RESPONSE_CACHE_ROUTES: frozenset[str] = frozenset()
+    RESPONSE_CACHE_TTL_S: float = 30.0
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
 
     model_config = SettingsConfigDict(
         case_sensitive=True,
@@ -0,0 +1,70 @@
+"""Per-request phase timings, reported in the ``Server-Timing`` header.
+
+The metrics middleware opens a ``RequestTiming`` for every request.
+Dependencies, query functions and serializers add to it through
+``phase`` or ``add``. Outside a request both are no-ops.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class RequestTiming:
+    __slots__ = ("phases", "started")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self) -> str:
+        """Phases in milliseconds, followed by the time so far."""
+        total = time.perf_counter() - self.started
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.3f}"
+            for name, seconds in (*self.phases.items(), ("total", total))
+        )
+
+
+_current: ContextVar[RequestTiming | None] = ContextVar(
+    "request_timing", default=None
+)
+
+
+@contextmanager
+def request_timing() -> Iterator[RequestTiming]:
+    timing = RequestTiming()
+    token = _current.set(timing)
+    try:
+        yield timing
+    finally:
+        _current.reset(token)
+
+
+def current() -> RequestTiming | None:
+    return _current.get()
+
+
+def add(name: str, seconds: float) -> None:
+    timing = _current.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
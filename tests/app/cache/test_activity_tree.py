@@ -0,0 +1,115 @@
+from typing import cast
+from unittest.mock import Mock
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache.activity_tree import ActivityTree
+
+CLOSURE = [(1, 1), (1, 2), (1, 3), (2, 2), (2, 3), (3, 3), (4, 4)]
+
+
+def _tree() -> ActivityTree:
+    tree = ActivityTree()
+    tree.load(CLOSURE)
+    return tree
+
+
+def test_activity_tree_descendants_positive():
+    tree = _tree()
+
+    assert tree.descendants(1) == (1, 2, 3)
+    assert tree.descendants(3) == (3,)
+    assert tree.stats.hits == 2
+    assert tree.stats.hit_ratio == 1.0
+
+
+def test_activity_tree_unknown_activity_negative():
+    tree = _tree()
+
+    assert tree.descendants(99) is None
+    assert tree.stats.misses == 1
+
+
+def test_activity_tree_not_loaded_negative():
+    tree = ActivityTree()
+
+    assert tree.descendants(1) is None
+    assert tree.stats.misses == 0
+
+
+def test_activity_tree_add_patches_ancestors_positive():
+    tree = _tree()
+
+    tree.add(5, parent_id=3)
+    tree.add(6, parent_id=None)
+
+    assert tree.descendants(1) == (1, 2, 3, 5)
+    assert tree.descendants(2) == (2, 3, 5)
+    assert tree.descendants(5) == (5,)
+    assert tree.descendants(6) == (6,)
+    assert tree.descendants(4) == (4,)
+
+
+def test_activity_tree_add_unknown_parent_negative():
+    tree = _tree()
+
+    tree.add(5, parent_id=42)
+
+    assert tree.ready is False
+    assert tree.descendants(1) is None
+
+
+def test_activity_tree_invalidate_negative():
+    tree = _tree()
+
+    tree.invalidate()
+
+    assert tree.ready is False
+    assert tree.descendants(1) is None
+
+
+class _ClosureSession:
+    def __init__(
+        self, tree: ActivityTree, write: bool, add: bool = False
+    ) -> None:
+        self.tree = tree
+        self.write = write
+        self.add = add
+
+    async def execute(self, stmt: object) -> Mock:
+        if self.write:
+            # Another process commits a write while the rows load.
+            self.tree.invalidate()
+        if self.add:
+            # This process creates an activity while the rows load.
+            self.tree.add(5, parent_id=3)
+        result = Mock()
+        result.tuples.return_value.all.return_value = CLOSURE
+        return result
+
+
+async def test_activity_tree_rebuild_positive():
+    tree = ActivityTree()
+
+    await tree.rebuild(cast(AsyncSession, _ClosureSession(tree, False)))
+
+    assert tree.descendants(1) == (1, 2, 3)
+
+
+async def test_activity_tree_invalidated_during_rebuild_negative():
+    tree = ActivityTree()
+
+    await tree.rebuild(cast(AsyncSession, _ClosureSession(tree, True)))
+
+    assert tree.ready is False
+
+
+async def test_activity_tree_add_during_rebuild_positive():
+    tree = ActivityTree()
+    session = _ClosureSession(tree, write=False, add=True)
+
+    await tree.rebuild(cast(AsyncSession, session))
+
+    assert tree.ready is True
+    assert tree.descendants(1) == (1, 2, 3, 5)
+    assert tree.descendants(5) == (5,)
@@ -0,0 +1,181 @@
+from typing import Any
+
+import numpy as np
+import pytest
+
+from api.cache.building_index import (
+    BuildingIndex,
+    _Points,
+    geodesic_m,
+    haversine_m,
+)
+from api.models.building import BuildingGeoQuery
+
+ROWS = [
+    (1, "Center", 55.0, 37.0),
+    (2, "North 1km", 55.009, 37.0),
+    (3, "East 1km", 55.0, 37.0157),
+    (4, "Far", 56.0, 37.0),
+    (5, "Corner", 55.2, 37.2),
+]
+
+
+def _index(rows=ROWS) -> BuildingIndex:
+    index = BuildingIndex()
+    index.load(rows)
+    return index
+
+
+def _ids(rows: list[dict[str, Any]] | None) -> list[int]:
+    assert rows is not None
+    return [row["id"] for row in rows]
+
+
+def test_haversine_one_degree_of_latitude_positive():
+    distances = haversine_m(
+        55.0, 37.0, np.array([56.0, 55.0]), np.array([37.0, 37.0])
+    )
+
+    assert distances[0] == pytest.approx(111_195, rel=1e-4)
+    assert distances[1] == 0
+
+
+def test_geodesic_vincenty_reference_positive():
+    # Flinders Peak to Buninyong, Vincenty's 1975 test line.
+    distances = geodesic_m(
+        -(37 + 57 / 60 + 3.72030 / 3600),
+        144 + 25 / 60 + 29.52440 / 3600,
+        np.array([-(37 + 39 / 60 + 10.15610 / 3600)]),
+        np.array([143 + 55 / 60 + 35.38390 / 3600]),
+    )
+
+    assert distances[0] == pytest.approx(54_972.271, abs=1e-3)
+
+
+@pytest.mark.parametrize(
+    ("offset_m", "expected"), [(0.5, [1, 2]), (-0.5, [1])]
+)
+def test_building_index_radius_spheroid_boundary_positive(offset_m, expected):
+    rows = [(1, "Center", 55.0, 37.0), (2, "North", 55.02, 37.0)]
+    index = _index(rows)
+    spheroid_m = geodesic_m(55.0, 37.0, np.array([55.02]), np.array([37.0]))
+    sphere_m = haversine_m(55.0, 37.0, np.array([55.02]), np.array([37.0]))
+    radius_m = float(spheroid_m[0]) + offset_m
+
+    found = index.search(
+        BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=radius_m), limit=10
+    )
+
+    # The sphere alone would put the point inside either radius.
+    assert sphere_m[0] < radius_m
+    assert _ids(found) == expected
+
+
+def test_building_index_radius_positive():
+    index = _index()
+
+    rows = index.search(
+        BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=1100), limit=10
+    )
+
+    assert rows is not None
+    assert _ids(rows) == [1, 2, 3]
+    assert rows[0] == {
+        "id": 1,
+        "address": "Center",
+        "lat": 55.0,
+        "lon": 37.0,
+    }
+    assert index.stats.queries == 1
+
+
+def test_building_index_bbox_inclusive_positive():
+    index = _index()
+
+    rows = index.search(
+        BuildingGeoQuery(
+            min_lat=55.0, max_lat=55.2, min_lon=37.0, max_lon=37.2
+        ),
+        limit=10,
+    )
+
+    assert rows is not None
+    assert _ids(rows) == [1, 2, 3, 5]
+
+
+def test_building_index_keyset_page_positive():
+    index = _index()
+    geo = BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=200_000)
+
+    first = index.search(geo, limit=2)
+    second = index.search(geo, limit=2, after_id=2)
+    last = index.search(geo, limit=2, after_id=4)
+
+    assert _ids(first) == [1, 2]
+    assert _ids(second) == [3, 4]
+    assert _ids(last) == [5]
+
+
+def test_building_index_matches_brute_force_positive():
+    rng = np.random.default_rng(7)
+    rows = [
+        (
+            building_id,
+            f"Address {building_id}",
+            float(rng.uniform(54.0, 56.0)),
+            float(rng.uniform(36.0, 38.0)),
+        )
+        for building_id in range(1, 2001)
+    ]
+    index = _index(rows)
+    lats = np.array([row[2] for row in rows])
+    lons = np.array([row[3] for row in rows])
+
+    rows_found = index.search(
+        BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=30_000), limit=1000
+    )
+
+    expected = [
+        row[0]
+        for row, distance in zip(
+            rows, geodesic_m(55.0, 37.0, lats, lons), strict=True
+        )
+        if distance <= 30_000
+    ]
+    assert _ids(rows_found) == expected
+
+
+def test_building_index_upsert_moves_building_positive():
+    index = _index()
+
+    index.upsert([(4, "Moved", 55.0001, 37.0), (6, "New", 55.0, 37.0001)])
+
+    rows = index.search(
+        BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=100), limit=10
+    )
+    assert rows is not None
+    assert _ids(rows) == [1, 4, 6]
+    assert rows[1]["address"] == "Moved"
+    assert len(index) == 6
+
+
+def test_building_index_not_loaded_negative():
+    index = BuildingIndex()
+
+    rows = index.search(
+        BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=100), limit=10
+    )
+
+    assert rows is None
+    assert index.stats.queries == 0
+
+
+def test_building_index_fingerprint_positive():
+    # Same count and id sum; only the squares tell the sets apart.
+    first = _Points.from_rows([(1, "a", 55.0, 37.0), (6, "b", 55.0, 37.0)])
+    second = _Points.from_rows([(2, "a", 55.0, 37.0), (5, "b", 55.0, 37.0)])
+    large = _Points.from_rows([(2**40, "a", 55.0, 37.0)])
+
+    assert first.fingerprint() == (2, 7, 37)
+    assert second.fingerprint() == (2, 7, 29)
+    assert large.fingerprint() == (1, 2**40, 2**80 % 2**64)
@@ -0,0 +1,142 @@
+from sqlalchemy.orm import Session
+
+from api.cache.response import RESPONSE_CACHE, RequestCache, ResponseCache
+from api.database.schema.base import WRITTEN_TABLES
+
+AGENCY_TAGS = frozenset({"agency_name", "building_geo"})
+BUILDING_TAGS = frozenset({"building_geo"})
+
+
+def _cache(**kwargs) -> ResponseCache:
+    options = {"ttl_s": 60.0, "max_bytes": 1024, "routes": {"route"}}
+    return ResponseCache(**{**options, **kwargs})
+
+
+def test_response_cache_hit_positive():
+    cache = _cache()
+
+    cache.put("key", b"[]", {"X-Next-Cursor": "abc"}, AGENCY_TAGS)
+    entry = cache.get("key")
+
+    assert entry is not None
+    assert entry.body == b"[]"
+    assert entry.response().headers["X-Next-Cursor"] == "abc"
+    assert cache.stats.hits == 1
+
+
+def test_response_cache_miss_negative():
+    cache = _cache()
+
+    assert cache.get("missing") is None
+    assert cache.stats.misses == 1
+
+
+def test_response_cache_expired_negative():
+    cache = _cache(ttl_s=0.0)
+
+    cache.put("key", b"[]", {}, AGENCY_TAGS)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_response_cache_evicts_least_recent_positive():
+    cache = _cache(max_bytes=10)
+
+    cache.put("first", b"1111", {}, AGENCY_TAGS)
+    cache.put("second", b"2222", {}, AGENCY_TAGS)
+    cache.get("first")
+    cache.put("third", b"3333", {}, AGENCY_TAGS)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.stats.evictions == 1
+    assert cache.size == 8
+
+
+def test_response_cache_oversized_negative():
+    cache = _cache(max_bytes=2)
+
+    cache.put("key", b"[{}]", {}, AGENCY_TAGS)
+
+    assert len(cache) == 0
+
+
+def test_response_cache_invalidate_by_table_positive():
+    cache = _cache()
+    cache.put("agency", b"[]", {}, AGENCY_TAGS)
+    cache.put("building", b"[]", {}, BUILDING_TAGS)
+
+    dropped = cache.invalidate({"agency_name"})
+
+    assert dropped == 1
+    assert cache.get("agency") is None
+    assert cache.get("building") is not None
+
+
+def test_response_cache_stale_generation_negative():
+    cache = _cache()
+    slot = cache.route("route", 1, AGENCY_TAGS)
+
+    cache.invalidate({"agency_name"})
+    cache.put(slot.key, b"[]", {}, slot.tags, slot.generation)
+
+    assert cache.get(slot.key) is None
+
+
+def test_response_cache_route_disabled_negative():
+    cache = _cache()
+
+    slot = cache.route("other", 1, AGENCY_TAGS)
+
+    assert slot.cache is None
+    assert slot.lookup() is None
+
+
+def test_response_cache_route_write_only_negative():
+    cache = _cache()
+    cache.put("route:1", b"[]", {}, AGENCY_TAGS)
+
+    slot = RequestCache(cache, read=False).route("route", 1, AGENCY_TAGS)
+    slot.respond(b"[1]")
+
+    assert slot.lookup() is None
+    entry = cache.get("route:1")
+    assert entry is not None
+    assert entry.body == b"[1]"
+
+
+def test_response_cache_route_read_only_negative():
+    cache = _cache()
+
+    slot = RequestCache(cache, write=False).route("route", 1, AGENCY_TAGS)
+    slot.respond(b"[]")
+
+    assert slot.lookup() is None
+    assert len(cache) == 0
+
+
+def test_response_cache_invalidated_on_commit_positive():
+    cache = _cache()
+    cache.put("agency", b"[]", {}, AGENCY_TAGS)
+    session = Session(info={RESPONSE_CACHE: cache})
+    session.info[WRITTEN_TABLES] = {"building_geo"}
+
+    session.commit()
+
+    assert cache.get("agency") is None
+    assert WRITTEN_TABLES not in session.info
+
+
+def test_response_cache_kept_on_rollback_negative():
+    cache = _cache()
+    cache.put("agency", b"[]", {}, AGENCY_TAGS)
+    session = Session(info={RESPONSE_CACHE: cache})
+    session.begin()
+    session.info[WRITTEN_TABLES] = {"building_geo"}
+
+    session.rollback()
+    session.commit()
+
+    assert cache.get("agency") is not None
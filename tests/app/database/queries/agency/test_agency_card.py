@@ -0,0 +1,215 @@
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.queries.agency import (
+    get_agency_by_id,
+    list_agencies_by_activity,
+    list_agencies_by_building,
+    list_agencies_by_geo,
+    list_agencies_by_name,
+)
+from api.database.schema.actiivty import ActivityName
+from api.database.schema.agency import Agency, AgencyName, AgencyPhone
+from api.database.schema.agency_card import AgencyCard
+from api.database.schema.building import BuildingGeo
+from api.models.agency import AgencyGeoQuery
+from api.settings import settings
+from tests.app.database.queries.conftest import (
+    create_activity,
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+def card_read_model(monkeypatch):
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", "card")
+
+
+async def _card(
+    db_session: AsyncSession,
+    agency_id: int,
+) -> AgencyCard | None:
+    return (
+        await db_session.execute(
+            select(AgencyCard).where(AgencyCard.agency_id == agency_id)
+        )
+    ).scalar_one_or_none()
+
+
+async def test_agency_card_matches_normalized_positive(
+    db_session,
+    monkeypatch,
+):
+    building = await create_building(
+        db_session,
+        address="Card Address",
+        lat=55.5,
+        lon=37.5,
+    )
+    root = await create_activity(db_session, name="Food", parent_id=None)
+    child = await create_activity(db_session, name="Milk", parent_id=root.id)
+    agency = await create_agency(
+        db_session,
+        name="Carded",
+        building=building,
+        phones=["2-222", "1-111"],
+        activity_ids=[child.id, root.id],
+    )
+
+    normalized = await get_agency_by_id(db_session, agency.id)
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", "card")
+    card = await get_agency_by_id(db_session, agency.id)
+
+    assert normalized is not None
+    assert card == {**normalized, "phones": list(normalized["phones"])}
+
+
+async def test_agency_card_columns_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Columns",
+        lat=55.0,
+        lon=37.0,
+    )
+    activity = await create_activity(db_session, name="Shop", parent_id=None)
+    agency = await create_agency(
+        db_session,
+        name="Columns Agency",
+        building=building,
+        activity_ids=[activity.id],
+    )
+
+    card = await _card(db_session, agency.id)
+
+    assert card is not None
+    assert card.building_id == building.id
+    assert card.activity_ids == [activity.id]
+
+
+async def test_agency_card_follows_updates_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Before",
+        lat=55.0,
+        lon=37.0,
+    )
+    activity = await create_activity(db_session, name="Old", parent_id=None)
+    agency = await create_agency(
+        db_session,
+        name="Before",
+        building=building,
+        phones=["1-111"],
+        activity_ids=[activity.id],
+    )
+
+    await AgencyName.update_name(db_session, agency_id=agency.id, name="After")
+    await AgencyPhone.create(db_session, agency_id=agency.id, phone="2-222")
+    await BuildingGeo.update_geo(
+        db_session,
+        building_id=building.id,
+        lat=56.0,
+        lon=38.0,
+    )
+    await ActivityName.update_name(
+        db_session,
+        activity_id=activity.id,
+        name="New",
+    )
+
+    card = await _card(db_session, agency.id)
+
+    assert card is not None
+    assert card.document["name"] == "After"
+    assert card.document["phones"] == ["1-111", "2-222"]
+    assert card.document["building"]["lat"] == 56.0
+    assert card.document["activities"][0]["name"] == "New"
+
+
+async def test_agency_card_removed_with_agency_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Removed",
+        lat=55.0,
+        lon=37.0,
+    )
+    agency = await create_agency(
+        db_session,
+        name="Removed",
+        building=building,
+    )
+
+    await db_session.execute(delete(Agency).where(Agency.id == agency.id))
+
+    assert await _card(db_session, agency.id) is None
+
+
+async def test_agency_card_incomplete_agency_negative(db_session):
+    agency = await Agency.create(db_session)
+    await AgencyName.create(db_session, agency_id=agency.id, name="Homeless")
+
+    assert await _card(db_session, agency.id) is None
+
+
+@pytest.mark.usefixtures("card_read_model")
+async def test_agency_card_list_queries_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Card List",
+        lat=55.0,
+        lon=37.0,
+    )
+    other = await create_building(
+        db_session,
+        address="Card Other",
+        lat=56.0,
+        lon=37.0,
+    )
+    root = await create_activity(db_session, name="Food", parent_id=None)
+    child = await create_activity(db_session, name="Milk", parent_id=root.id)
+    first = await create_agency(
+        db_session,
+        name="Card First",
+        building=building,
+        activity_ids=[child.id],
+    )
+    second = await create_agency(
+        db_session,
+        name="Card Second",
+        building=other,
+        activity_ids=[root.id],
+    )
+
+    by_building = await list_agencies_by_building(db_session, building.id)
+    by_child = await list_agencies_by_activity(
+        db_session,
+        root.id,
+        include_descendants=True,
+    )
+    by_cached_child = await list_agencies_by_activity(
+        db_session,
+        root.id,
+        include_descendants=True,
+        descendant_ids=[root.id, child.id],
+    )
+    by_root = await list_agencies_by_activity(
+        db_session,
+        root.id,
+        include_descendants=False,
+    )
+    by_geo = await list_agencies_by_geo(
+        db_session,
+        AgencyGeoQuery(lat=55.0, lon=37.0, radius_m=2000),
+    )
+    by_name = await list_agencies_by_name(db_session, "Card Second")
+
+    assert [row["id"] for row in by_building] == [first.id]
+    assert by_building[0]["building"]["address"] == "Card List"
+    assert [row["id"] for row in by_child] == [first.id, second.id]
+    assert [row["id"] for row in by_cached_child] == [first.id, second.id]
+    assert [row["id"] for row in by_root] == [second.id]
+    assert [row["id"] for row in by_geo] == [first.id]
+    assert [row["name"] for row in by_name] == ["Card Second"]
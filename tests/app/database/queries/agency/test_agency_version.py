@@ -0,0 +1,140 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete
+
+from api.database.queries.agency import (
+    get_agency_version,
+    get_building_agencies_version,
+)
+from api.database.schema.agency import AgencyName, AgencyPhone
+from api.database.schema.building import BuildingAddress
+from api.settings import settings
+from tests.app.database.queries.conftest import (
+    create_activity,
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+EARLIER = datetime(2000, 1, 1)
+
+
+@pytest.fixture(params=["normalized", "card"])
+def read_model(request, monkeypatch):
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", request.param)
+    return request.param
+
+
+async def test_get_agency_version_positive(db_session, read_model):
+    building = await create_building(
+        db_session,
+        address="Version",
+        lat=55.0,
+        lon=37.0,
+    )
+    activity = await create_activity(db_session, name="Food", parent_id=None)
+    agency = await create_agency(
+        db_session,
+        name="Versioned",
+        building=building,
+        phones=["1-111"],
+        activity_ids=[activity.id],
+    )
+
+    version = await get_agency_version(db_session, agency.id)
+
+    assert version is not None
+    assert version[0] == (1 if read_model == "card" else 9)
+
+
+async def test_get_agency_version_follows_writes_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Before",
+        lat=55.0,
+        lon=37.0,
+    )
+    agency = await create_agency(
+        db_session,
+        name="Versioned",
+        building=building,
+        phones=["1-111"],
+    )
+    initial = await get_agency_version(db_session, agency.id)
+
+    await AgencyPhone.create(db_session, agency_id=agency.id, phone="2-222")
+    added = await get_agency_version(db_session, agency.id)
+    await db_session.execute(
+        delete(AgencyPhone).where(AgencyPhone.phone == "2-222")
+    )
+    removed = await get_agency_version(db_session, agency.id)
+    # A savepoint writes under its own transaction id, like a separate
+    # request; the stale ``updated_at`` must not hide the write.
+    async with db_session.begin_nested():
+        await BuildingAddress._update(
+            db_session,
+            BuildingAddress.building_id == building.id,
+            address="After",
+            updated_at=EARLIER,
+        )
+    moved = await get_agency_version(db_session, agency.id)
+
+    assert initial is not None
+    assert added is not None
+    assert moved is not None
+    assert added[0] == initial[0] + 1
+    assert removed == initial
+    assert moved[0] == initial[0]
+    assert moved[1] != initial[1]
+
+
+async def test_get_agency_version_not_found_negative(db_session):
+    assert await get_agency_version(db_session, 999999) is None
+
+
+async def test_get_building_agencies_version_page_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Paged",
+        lat=55.0,
+        lon=37.0,
+    )
+    first = await create_agency(db_session, name="First", building=building)
+    second = await create_agency(db_session, name="Second", building=building)
+
+    first_before = await get_building_agencies_version(
+        db_session, building.id, limit=1
+    )
+    second_before = await get_building_agencies_version(
+        db_session, building.id, limit=1, after_id=first.id
+    )
+    async with db_session.begin_nested():
+        await AgencyName._update(
+            db_session,
+            AgencyName.agency_id == second.id,
+            name="Second Renamed",
+        )
+    first_page = await get_building_agencies_version(
+        db_session, building.id, limit=1
+    )
+    second_page = await get_building_agencies_version(
+        db_session, building.id, limit=1, after_id=first.id
+    )
+
+    assert first_page is not None
+    assert second_page is not None
+    assert first_page == first_before
+    assert second_page != second_before
+
+
+async def test_get_building_agencies_version_empty_negative(db_session):
+    building = await create_building(
+        db_session,
+        address="Empty",
+        lat=55.0,
+        lon=37.0,
+    )
+
+    assert await get_building_agencies_version(db_session, building.id) is None
@@ -0,0 +1,50 @@
+import pytest
+
+from api.database.queries.agency import get_agencies_by_ids, get_agency_by_id
+from api.settings import settings
+from tests.app.database.queries.conftest import (
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture(params=["normalized", "card"])
+def read_model(request, monkeypatch):
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", request.param)
+    return request.param
+
+
+@pytest.mark.usefixtures("read_model")
+async def test_get_agencies_by_ids_positive(db_session):
+    building = await create_building(
+        db_session, address="Batch Address", lat=55.0, lon=37.0
+    )
+    agencies = [
+        await create_agency(
+            db_session,
+            name=f"Batch {index}",
+            building=building,
+            phones=[f"8-800-{index}"],
+        )
+        for index in range(3)
+    ]
+    ids = [agencies[2].id, agencies[0].id]
+
+    found = await get_agencies_by_ids(db_session, ids)
+
+    assert found == [
+        await get_agency_by_id(db_session, agency_id)
+        for agency_id in sorted(ids)
+    ]
+
+
+@pytest.mark.usefixtures("read_model")
+async def test_get_agencies_by_ids_negative(db_session):
+    building = await create_building(
+        db_session, address="Batch Missing", lat=55.0, lon=37.0
+    )
+    agency = await create_agency(db_session, name="Only", building=building)
+
+    assert await get_agencies_by_ids(db_session, [agency.id + 1]) == []
@@ -2,6 +2,7 @@ import pytest
 
 from api.database.queries.agency import get_agency_by_id
 from tests.app.database.queries.conftest import (
+    create_activity,
     create_agency,
     create_building,
 )
@@ -45,3 +46,37 @@ async def test_get_agency_by_id_negative(db_session):
     missing = await get_agency_by_id(db_session, agency.id + 1)
 
     assert missing is None
+
+
+async def test_get_agency_by_id_hydrates_relations_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Hydrate Address",
+        lat=55.5,
+        lon=37.5,
+    )
+    root = await create_activity(db_session, name="Food", parent_id=None)
+    child = await create_activity(db_session, name="Milk", parent_id=root.id)
+    agency = await create_agency(
+        db_session,
+        name="Hydrated",
+        building=building,
+        phones=["2-222", "1-111"],
+        activity_ids=[child.id, root.id],
+    )
+
+    found = await get_agency_by_id(db_session, agency.id)
+
+    assert found is not None
+    assert list(found["phones"]) == ["2-222", "1-111"]
+    assert found["building"] == {
+        "id": building.id,
+        "address": "Hydrate Address",
+        "lat": 55.5,
+        "lon": 37.5,
+    }
+    assert [activity["id"] for activity in found["activities"]] == [
+        root.id,
+        child.id,
+    ]
+    assert found["activities"][1]["parent_id"] == root.id
@@ -62,3 +62,31 @@ async def test_list_agencies_by_activity_without_descendants_negative(
     )
 
     assert result == []
+
+
+async def test_list_agencies_by_activity_with_cached_descendants_positive(
+    db_session,
+):
+    building = await create_building(
+        db_session,
+        address="Cached Desc",
+        lat=55.0,
+        lon=37.0,
+    )
+    root = await create_activity(db_session, name="Cars", parent_id=None)
+    child = await create_activity(db_session, name="Parts", parent_id=root.id)
+    agency = await create_agency(
+        db_session,
+        name="Autoparts",
+        building=building,
+        activity_ids=[child.id],
+    )
+
+    result = await list_agencies_by_activity(
+        db_session,
+        activity_id=root.id,
+        include_descendants=True,
+        descendant_ids=[root.id, child.id],
+    )
+
+    assert [row["id"] for row in result] == [agency.id]
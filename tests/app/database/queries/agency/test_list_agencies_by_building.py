@@ -45,3 +45,26 @@ async def test_list_agencies_by_building_negative(db_session):
     result = await list_agencies_by_building(db_session, building.id)
 
     assert result == []
+
+
+async def test_list_agencies_by_building_keyset_pages_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Paged Address",
+        lat=55.0,
+        lon=37.0,
+    )
+    agencies = [
+        await create_agency(
+            db_session, name=f"Agency {index}", building=building
+        )
+        for index in range(3)
+    ]
+
+    first = await list_agencies_by_building(db_session, building.id, limit=2)
+    second = await list_agencies_by_building(
+        db_session, building.id, limit=2, after_id=first[-1]["id"]
+    )
+
+    assert [row["id"] for row in first] == [a.id for a in agencies[:2]]
+    assert [row["id"] for row in second] == [agencies[2].id]
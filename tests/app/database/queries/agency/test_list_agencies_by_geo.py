@@ -2,9 +2,11 @@ import pytest
 
 from api.database.queries.agency import list_agencies_by_geo
 from api.models.agency import AgencyGeoQuery
+from api.settings import settings
 from tests.app.database.queries.conftest import (
     create_agency,
     create_building,
+    explain_executed,
 )
 
 pytestmark = pytest.mark.postgres
@@ -94,3 +96,46 @@ async def test_list_agencies_by_geo_radius_negative(db_session):
     result = await list_agencies_by_geo(db_session, geo)
 
     assert result == []
+
+
+@pytest.mark.parametrize(
+    ("read_model", "geo", "index"),
+    [
+        (
+            "normalized",
+            AgencyGeoQuery(lat=55.0, lon=37.0, radius_m=2000),
+            "ix_building_geo_geog",
+        ),
+        (
+            "card",
+            AgencyGeoQuery(lat=55.0, lon=37.0, radius_m=2000),
+            "ix_agency_card_geog",
+        ),
+        (
+            "normalized",
+            AgencyGeoQuery(
+                min_lat=55.0, max_lat=55.2, min_lon=37.0, max_lon=37.2
+            ),
+            "ix_building_geo_geom",
+        ),
+        (
+            "card",
+            AgencyGeoQuery(
+                min_lat=55.0, max_lat=55.2, min_lon=37.0, max_lon=37.2
+            ),
+            "ix_agency_card_geom",
+        ),
+    ],
+)
+async def test_list_agencies_by_geo_uses_index_positive(
+    db_session, monkeypatch, read_model, geo, index
+):
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", read_model)
+
+    plan = await explain_executed(
+        db_session, lambda: list_agencies_by_geo(db_session, geo)
+    )
+
+    assert index in plan
+    assert "Seq Scan on building_geo" not in plan
+    assert "Seq Scan on agency_card" not in plan
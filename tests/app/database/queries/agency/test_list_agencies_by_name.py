@@ -49,3 +49,22 @@ async def test_list_agencies_by_name_negative(db_session):
     result = await list_agencies_by_name(db_session, "Missing")
 
     assert result == []
+
+
+async def test_list_agencies_by_name_wildcards_are_literal_negative(
+    db_session,
+):
+    building = await create_building(
+        db_session,
+        address="Wildcard Address",
+        lat=55.0,
+        lon=37.0,
+    )
+    await create_agency(
+        db_session,
+        name="Roga i Kopita",
+        building=building,
+    )
+
+    assert await list_agencies_by_name(db_session, "%") == []
+    assert await list_agencies_by_name(db_session, "R_ga") == []
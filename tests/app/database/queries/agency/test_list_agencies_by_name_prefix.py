@@ -0,0 +1,61 @@
+import pytest
+
+from api.database.queries.agency import list_agencies_by_name_prefix
+from tests.app.database.queries.conftest import (
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_list_agencies_by_name_prefix_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Prefix Address",
+        lat=55.0,
+        lon=37.0,
+    )
+    for name in ("Rogachev", "roga i kopita", "Kopita i Roga"):
+        await create_agency(db_session, name=name, building=building)
+
+    result = await list_agencies_by_name_prefix(db_session, "ROGA")
+
+    assert [row["name"] for row in result] == ["roga i kopita", "Rogachev"]
+
+
+async def test_list_agencies_by_name_prefix_keyset_pages_positive(
+    db_session,
+):
+    building = await create_building(
+        db_session,
+        address="Prefix Pages",
+        lat=55.0,
+        lon=37.0,
+    )
+    for name in ("Shop A", "Shop B", "Shop C"):
+        await create_agency(db_session, name=name, building=building)
+
+    first = await list_agencies_by_name_prefix(db_session, "shop", limit=2)
+    last = first[-1]
+    second = await list_agencies_by_name_prefix(
+        db_session, "shop", limit=2, after=(last["sort_key"], last["id"])
+    )
+
+    assert [row["name"] for row in first + second] == [
+        "Shop A",
+        "Shop B",
+        "Shop C",
+    ]
+
+
+async def test_list_agencies_by_name_prefix_negative(db_session):
+    building = await create_building(
+        db_session,
+        address="Prefix Missing",
+        lat=55.0,
+        lon=37.0,
+    )
+    await create_agency(db_session, name="Kopita", building=building)
+
+    assert await list_agencies_by_name_prefix(db_session, "opita") == []
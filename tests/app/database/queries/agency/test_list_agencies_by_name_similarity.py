@@ -0,0 +1,45 @@
+import pytest
+
+from api.database.queries.agency import list_agencies_by_name_similarity
+from tests.app.database.queries.conftest import (
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_list_agencies_by_name_similarity_ranked_positive(db_session):
+    building = await create_building(
+        db_session,
+        address="Similarity Address",
+        lat=55.0,
+        lon=37.0,
+    )
+    for name in ("Roga i Kopita", "Roga", "Milk Shop"):
+        await create_agency(db_session, name=name, building=building)
+
+    result = await list_agencies_by_name_similarity(
+        db_session, "Roga", min_similarity=0.3
+    )
+
+    assert [row["name"] for row in result] == ["Roga", "Roga i Kopita"]
+    assert result[0]["rank"] > result[1]["rank"]
+
+
+async def test_list_agencies_by_name_similarity_threshold_negative(
+    db_session,
+):
+    building = await create_building(
+        db_session,
+        address="Similarity Threshold",
+        lat=55.0,
+        lon=37.0,
+    )
+    await create_agency(db_session, name="Roga i Kopita", building=building)
+
+    result = await list_agencies_by_name_similarity(
+        db_session, "Roga", min_similarity=0.9
+    )
+
+    assert result == []
@@ -0,0 +1,94 @@
+import pytest
+
+from api.database.queries.agency import list_agencies_nearest
+from api.models.agency import AgencyNearestQuery
+from api.settings import settings
+from tests.app.database.queries.conftest import (
+    create_activity,
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_list_agencies_nearest_orders_by_distance_positive(db_session):
+    far = await create_building(db_session, address="Far", lat=55.2, lon=37.0)
+    near = await create_building(
+        db_session,
+        address="Near",
+        lat=55.01,
+        lon=37.0,
+    )
+    far_agency = await create_agency(db_session, name="Far", building=far)
+    near_agency = await create_agency(db_session, name="Near", building=near)
+
+    result = await list_agencies_nearest(
+        db_session,
+        AgencyNearestQuery(lat=55.0, lon=37.0, limit=2),
+    )
+
+    assert [row["id"] for row in result] == [near_agency.id, far_agency.id]
+    assert result[0]["distance_m"] == pytest.approx(1113, rel=0.01)
+    assert result[0]["building"]["address"] == "Near"
+
+
+async def test_list_agencies_nearest_limit_positive(db_session):
+    for index in range(3):
+        building = await create_building(
+            db_session,
+            address=f"Limit {index}",
+            lat=55.0 + index / 100,
+            lon=37.0,
+        )
+        await create_agency(
+            db_session, name=f"Limit {index}", building=building
+        )
+
+    result = await list_agencies_nearest(
+        db_session,
+        AgencyNearestQuery(lat=55.0, lon=37.0, limit=2),
+    )
+
+    assert [row["name"] for row in result] == ["Limit 0", "Limit 1"]
+
+
+@pytest.mark.parametrize("read_model", ["normalized", "card"])
+async def test_list_agencies_nearest_activity_filter_positive(
+    db_session, monkeypatch, read_model
+):
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", read_model)
+    building = await create_building(
+        db_session,
+        address="Activity",
+        lat=55.0,
+        lon=37.0,
+    )
+    root = await create_activity(db_session, name="Food", parent_id=None)
+    child = await create_activity(db_session, name="Meat", parent_id=root.id)
+    other = await create_activity(db_session, name="Cars", parent_id=None)
+    butcher = await create_agency(
+        db_session,
+        name="Butcher",
+        building=building,
+        activity_ids=[child.id],
+    )
+    await create_agency(
+        db_session,
+        name="Garage",
+        building=building,
+        activity_ids=[other.id],
+    )
+
+    result = await list_agencies_nearest(
+        db_session,
+        AgencyNearestQuery(
+            lat=55.0,
+            lon=37.0,
+            activity_id=root.id,
+            include_descendants=True,
+        ),
+    )
+
+    assert [row["id"] for row in result] == [butcher.id]
+    assert result[0]["distance_m"] == pytest.approx(0)
@@ -0,0 +1,121 @@
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.queries.agency import (
+    list_agencies_by_activity,
+    list_agencies_by_building,
+    list_agencies_by_geo,
+    list_agencies_by_name,
+    render_agencies_by_activity,
+    render_agencies_by_building,
+    render_agencies_by_geo,
+    render_agencies_by_name,
+)
+from api.database.schema.actiivty import Activity
+from api.database.schema.agency import Agency
+from api.database.schema.building import Building
+from api.models.agency import AgencyGeoQuery, AgencyOut
+from api.settings import settings
+from tests.app.database.queries.conftest import (
+    create_activity,
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+AGENCY_LIST = TypeAdapter(list[AgencyOut])
+ODD_TEXT = 'Quote " slash \\ tab \t bell \x07 del \x7f ü 😀  '
+COORDINATES = [
+    (55.0, 37.6173),
+    (0.000001, -0.00001),
+    (-0.0, 179.99999999999997),
+    (1.5e-7, 0.1),
+]
+
+
+@pytest.fixture(params=["normalized", "card"])
+def read_model(request, monkeypatch):
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", request.param)
+    return request.param
+
+
+def _dump(rows: list[dict[str, Any]]) -> bytes:
+    return AGENCY_LIST.dump_json([AgencyOut.model_validate(r) for r in rows])
+
+
+async def _seed(
+    db_session: AsyncSession,
+) -> tuple[list[tuple[Agency, Building]], Activity]:
+    root = await create_activity(db_session, name=ODD_TEXT, parent_id=None)
+    child = await create_activity(db_session, name="Child", parent_id=root.id)
+    agencies = []
+    for index, (lat, lon) in enumerate(COORDINATES):
+        building = await create_building(
+            db_session,
+            address=f"{ODD_TEXT} {index}",
+            lat=lat,
+            lon=lon,
+        )
+        agency = await create_agency(
+            db_session,
+            name=f"Render {ODD_TEXT} {index}",
+            building=building,
+            phones=[f"{index}-1", ODD_TEXT][: index % 3],
+            activity_ids=[child.id, root.id][: index % 3],
+        )
+        agencies.append((agency, building))
+    return agencies, root
+
+
+@pytest.mark.usefixtures("read_model")
+async def test_render_agencies_matches_models_positive(db_session):
+    agencies, root = await _seed(db_session)
+    building_id = agencies[0][1].id
+
+    by_building = await render_agencies_by_building(db_session, building_id)
+    by_activity = await render_agencies_by_activity(
+        db_session, root.id, include_descendants=True, limit=2
+    )
+    by_name = await render_agencies_by_name(db_session, "Render")
+
+    assert by_building.body == _dump(
+        await list_agencies_by_building(db_session, building_id)
+    )
+    assert by_activity.body == _dump(
+        await list_agencies_by_activity(
+            db_session, root.id, include_descendants=True, limit=2
+        )
+    )
+    assert by_name.body == _dump(
+        await list_agencies_by_name(db_session, "Render")
+    )
+    assert by_name.count == len(agencies)
+    assert by_name.last_id == agencies[-1][0].id
+
+
+@pytest.mark.usefixtures("read_model")
+@pytest.mark.parametrize(("lat", "lon"), COORDINATES)
+async def test_render_agencies_by_geo_coordinates_positive(
+    db_session, lat, lon
+):
+    await _seed(db_session)
+    geo = AgencyGeoQuery(lat=lat, lon=lon, radius_m=1)
+
+    page = await render_agencies_by_geo(db_session, geo)
+
+    assert page.count == 1
+    assert page.body == _dump(await list_agencies_by_geo(db_session, geo))
+
+
+@pytest.mark.usefixtures("read_model")
+async def test_render_agencies_empty_negative(db_session):
+    page = await render_agencies_by_name(db_session, "Nobody")
+
+    assert page.body == b"[]"
+    assert page.count == 0
+    assert page.last_id is None
+    assert page.next_cursor(limit=1) is None
@@ -0,0 +1,68 @@
+import pytest
+
+from api.database.queries.agency import (
+    list_agencies_by_geo,
+    stream_agencies_by_geo,
+)
+from api.models.agency import AgencyGeoQuery
+from api.settings import settings
+from tests.app.database.queries.conftest import (
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture(params=["normalized", "card"])
+def read_model(request, monkeypatch):
+    monkeypatch.setattr(settings, "AGENCY_READ_MODEL", request.param)
+    monkeypatch.setattr(settings, "STREAM_YIELD_PER", 2)
+    return request.param
+
+
+@pytest.mark.usefixtures("read_model")
+async def test_stream_agencies_by_geo_matches_list_positive(db_session):
+    for index in range(5):
+        building = await create_building(
+            db_session,
+            address=f"Inside {index}",
+            lat=55.0 + index * 0.001,
+            lon=37.0,
+        )
+        await create_agency(
+            db_session,
+            name=f"Agency {index}",
+            building=building,
+            phones=[f"8-800-{index}"],
+        )
+    outside = await create_building(
+        db_session, address="Outside", lat=56.0, lon=37.0
+    )
+    await create_agency(db_session, name="Outside Agency", building=outside)
+
+    geo = AgencyGeoQuery(lat=55.0, lon=37.0, radius_m=2000)
+    batches = [
+        batch async for batch in stream_agencies_by_geo(db_session, geo)
+    ]
+    expected = await list_agencies_by_geo(db_session, geo)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    streamed = sorted(
+        (row for batch in batches for row in batch),
+        key=lambda row: row["id"],
+    )
+    assert streamed == expected
+
+
+async def test_stream_agencies_by_geo_negative(db_session):
+    building = await create_building(
+        db_session, address="Far", lat=56.0, lon=37.0
+    )
+    await create_agency(db_session, name="Far Agency", building=building)
+
+    geo = AgencyGeoQuery(lat=55.0, lon=37.0, radius_m=2000)
+
+    assert [
+        batch async for batch in stream_agencies_by_geo(db_session, geo)
+    ] == []
@@ -1,8 +1,15 @@
+import numpy as np
 import pytest
+from sqlalchemy import delete
 
+from api.cache.building_index import BuildingIndex, geodesic_m
 from api.database.queries.building import list_buildings_by_geo
+from api.database.schema.building import Building, BuildingGeo
 from api.models.building import BuildingGeoQuery
-from tests.app.database.queries.conftest import create_building
+from tests.app.database.queries.conftest import (
+    create_building,
+    explain_executed,
+)
 
 pytestmark = pytest.mark.postgres
 
@@ -66,3 +73,176 @@ async def test_list_buildings_by_geo_radius_negative(db_session):
     result = await list_buildings_by_geo(db_session, geo)
 
     assert result == []
+
+
+async def test_list_buildings_by_geo_keyset_pages_positive(db_session):
+    buildings = [
+        await create_building(
+            db_session,
+            address=f"Page {index}",
+            lat=55.0,
+            lon=37.0 + index / 1000,
+        )
+        for index in range(3)
+    ]
+    geo = BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=5000)
+
+    first = await list_buildings_by_geo(db_session, geo, limit=2)
+    second = await list_buildings_by_geo(
+        db_session, geo, limit=2, after_id=first[-1]["id"]
+    )
+
+    assert [row["id"] for row in first + second] == [
+        building.id for building in buildings
+    ]
+
+
+@pytest.mark.parametrize(
+    "geo",
+    [
+        BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=1500),
+        BuildingGeoQuery(lat=55.005, lon=37.005, radius_m=2000),
+        BuildingGeoQuery(
+            min_lat=54.99,
+            max_lat=55.01,
+            min_lon=36.985,
+            max_lon=37.02,
+        ),
+    ],
+)
+async def test_list_buildings_by_geo_index_matches_postgis_positive(
+    db_session, geo
+):
+    for row in range(-2, 3):
+        for column in range(-2, 3):
+            await create_building(
+                db_session,
+                address=f"Grid {row} {column}",
+                lat=55.0 + row / 100,
+                lon=37.0 + column / 100,
+            )
+    index = BuildingIndex()
+    await index.rebuild(db_session)
+
+    expected = await list_buildings_by_geo(db_session, geo, limit=100)
+    result = await list_buildings_by_geo(
+        db_session, geo, limit=100, building_index=index
+    )
+
+    assert result == expected
+    assert index.stats.queries == 1
+
+
+@pytest.mark.parametrize(("offset_m", "inside"), [(0.5, True), (-0.5, False)])
+async def test_list_buildings_by_geo_index_radius_boundary_positive(
+    db_session, offset_m, inside
+):
+    building = await create_building(
+        db_session,
+        address="Boundary",
+        lat=55.02,
+        lon=37.0,
+    )
+    index = BuildingIndex()
+    await index.rebuild(db_session)
+    distance_m = geodesic_m(55.0, 37.0, np.array([55.02]), np.array([37.0]))
+    geo = BuildingGeoQuery(
+        lat=55.0, lon=37.0, radius_m=float(distance_m[0]) + offset_m
+    )
+
+    expected = await list_buildings_by_geo(db_session, geo)
+    result = await list_buildings_by_geo(db_session, geo, building_index=index)
+
+    assert [row["id"] for row in expected] == ([building.id] if inside else [])
+    assert result == expected
+    assert index.stats.queries == 1
+
+
+async def test_building_index_refresh_positive(db_session):
+    moved = await create_building(
+        db_session,
+        address="Moved",
+        lat=56.0,
+        lon=37.0,
+    )
+    removed = await create_building(
+        db_session,
+        address="Removed",
+        lat=55.0,
+        lon=37.0,
+    )
+    index = BuildingIndex()
+    await index.rebuild(db_session)
+
+    await BuildingGeo.update_geo(
+        db_session,
+        building_id=moved.id,
+        lat=55.0,
+        lon=37.0001,
+    )
+    await index.refresh(db_session)
+    geo = BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=100)
+    after_update = index.search(geo, limit=10)
+
+    await db_session.execute(delete(Building).where(Building.id == removed.id))
+    await index.refresh(db_session)
+    after_delete = index.search(geo, limit=10)
+
+    assert after_update is not None
+    assert [row["id"] for row in after_update] == [moved.id, removed.id]
+    assert after_delete is not None
+    assert [row["id"] for row in after_delete] == [moved.id]
+    assert index.stats.rebuilds == 2
+
+
+async def test_building_index_refresh_delete_and_insert_positive(db_session):
+    removed = await create_building(
+        db_session,
+        address="Removed",
+        lat=55.0,
+        lon=37.0,
+    )
+    index = BuildingIndex()
+    await index.rebuild(db_session)
+
+    await db_session.execute(delete(Building).where(Building.id == removed.id))
+    added = await create_building(
+        db_session,
+        address="Added",
+        lat=55.0,
+        lon=37.0001,
+    )
+    await index.refresh(db_session)
+    rows = index.search(
+        BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=100), limit=10
+    )
+
+    assert rows is not None
+    assert [row["id"] for row in rows] == [added.id]
+    assert index.stats.rebuilds == 2
+
+
+@pytest.mark.parametrize(
+    ("geo", "index"),
+    [
+        (
+            BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=2000),
+            "ix_building_geo_geog",
+        ),
+        (
+            BuildingGeoQuery(
+                min_lat=55.0, max_lat=55.2, min_lon=37.0, max_lon=37.2
+            ),
+            "ix_building_geo_geom",
+        ),
+    ],
+)
+async def test_list_buildings_by_geo_uses_index_positive(
+    db_session, geo, index
+):
+    plan = await explain_executed(
+        db_session, lambda: list_buildings_by_geo(db_session, geo)
+    )
+
+    assert index in plan
+    assert "Seq Scan on building_geo" not in plan
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import select, text
+
+from api.database.queries.building import list_buildings_nearest
+from api.database.queries.geo import knn_distance
+from api.database.schema.building import BuildingGeo
+from api.models.building import BuildingNearestQuery
+from tests.app.database.queries.conftest import (
+    create_activity,
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_list_buildings_nearest_orders_by_distance_positive(db_session):
+    far = await create_building(db_session, address="Far", lat=55.2, lon=37.0)
+    near = await create_building(
+        db_session,
+        address="Near",
+        lat=55.01,
+        lon=37.0,
+    )
+
+    result = await list_buildings_nearest(
+        db_session,
+        BuildingNearestQuery(lat=55.0, lon=37.0, limit=2),
+    )
+
+    assert [row["id"] for row in result] == [near.id, far.id]
+    assert result[0]["distance_m"] < result[1]["distance_m"]
+    assert result[1]["distance_m"] == pytest.approx(22239, rel=0.01)
+
+
+async def test_list_buildings_nearest_activity_filter_positive(db_session):
+    shop = await create_building(
+        db_session, address="Shop", lat=55.1, lon=37.0
+    )
+    await create_building(db_session, address="Empty", lat=55.0, lon=37.0)
+    activity = await create_activity(db_session, name="Food", parent_id=None)
+    await create_agency(
+        db_session,
+        name="Grocery",
+        building=shop,
+        activity_ids=[activity.id],
+    )
+
+    result = await list_buildings_nearest(
+        db_session,
+        BuildingNearestQuery(lat=55.0, lon=37.0, activity_id=activity.id),
+    )
+
+    assert [row["id"] for row in result] == [shop.id]
+
+
+async def test_list_buildings_nearest_uses_knn_index_positive(db_session):
+    stmt = (
+        select(BuildingGeo.id)
+        .order_by(knn_distance(BuildingGeo.geom, 55.0, 37.0))
+        .limit(5)
+    )
+    compiled = stmt.compile(
+        dialect=db_session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+
+    await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = await db_session.execute(text(f"EXPLAIN {compiled}"))
+
+    assert "ix_building_geo_geog" in "\n".join(plan.scalars().all())
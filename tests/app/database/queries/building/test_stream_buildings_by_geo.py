@@ -0,0 +1,43 @@
+import pytest
+
+from api.database.queries.building import (
+    list_buildings_by_geo,
+    stream_buildings_by_geo,
+)
+from api.models.building import BuildingGeoQuery
+from api.settings import settings
+from tests.app.database.queries.conftest import create_building
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_stream_buildings_by_geo_matches_list_positive(
+    db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "STREAM_YIELD_PER", 2)
+    for index in range(3):
+        await create_building(
+            db_session,
+            address=f"Inside {index}",
+            lat=55.1,
+            lon=37.1 + index * 0.01,
+        )
+    await create_building(db_session, address="Outside", lat=56.0, lon=37.0)
+
+    geo = BuildingGeoQuery(
+        min_lat=55.0,
+        max_lat=55.2,
+        min_lon=37.0,
+        max_lon=37.2,
+    )
+    batches = [
+        batch async for batch in stream_buildings_by_geo(db_session, geo)
+    ]
+    expected = await list_buildings_by_geo(db_session, geo)
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    streamed = sorted(
+        (row for batch in batches for row in batch),
+        key=lambda row: row["id"],
+    )
+    assert streamed == expected
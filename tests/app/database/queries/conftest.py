@@ -1,7 +1,8 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any
 
 import pytest
-from sqlalchemy import text
+from sqlalchemy import Connection, event, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -30,6 +31,7 @@ async def db_engine() -> AsyncGenerator[AsyncEngine]:
     )
     async with engine.begin() as conn:
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(metadata.create_all)
     yield engine
     async with engine.begin() as conn:
@@ -107,3 +109,36 @@ async def create_activity(
         name=name,
         parent_id=parent_id,
     )
+
+
+async def explain_executed(
+    session: AsyncSession,
+    run: Callable[[], Awaitable[object]],
+) -> str:
+    """``EXPLAIN`` of the last SQL ``run`` sent, with seq scans off.
+
+    Explains the exact text and parameters the query function executed,
+    so the plan is the one its endpoint gets.
+    """
+    conn = await session.connection()
+    executed: list[tuple[str, Any]] = []
+
+    def capture(
+        connection: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        executed.append((statement, parameters))
+
+    event.listen(conn.sync_connection, "before_cursor_execute", capture)
+    try:
+        await run()
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", capture)
+    statement, parameters = executed[-1]
+    await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return "\n".join(plan.scalars().all())
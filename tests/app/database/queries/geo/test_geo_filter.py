@@ -1,7 +1,7 @@
 import pytest
 from sqlalchemy import select
 
-from api.database.queries.geo import apply_geo_filter
+from api.database.queries.geo import geo_filter, geo_params, geo_shape
 from api.database.schema.building import Building, BuildingGeo
 from api.models.building import BuildingGeoQuery
 from tests.app.database.queries.conftest import create_building
@@ -9,7 +9,7 @@ from tests.app.database.queries.conftest import create_building
 pytestmark = pytest.mark.postgres
 
 
-async def test_apply_geo_filter_radius_positive(db_session):
+async def test_geo_filter_radius_positive(db_session):
     near = await create_building(
         db_session,
         address="Near",
@@ -27,13 +27,13 @@ async def test_apply_geo_filter_radius_positive(db_session):
         BuildingGeo, BuildingGeo.building_id == Building.id
     )
     geo = BuildingGeoQuery(lat=55.0, lon=37.0, radius_m=2000)
-    stmt = apply_geo_filter(stmt, geo, BuildingGeo.geom)
-    result = await db_session.execute(stmt)
+    stmt = geo_filter(stmt, BuildingGeo.geom, geo_shape(geo))
+    result = await db_session.execute(stmt, geo_params(geo))
 
     assert result.scalars().all() == [near.id]
 
 
-async def test_apply_geo_filter_bbox_positive(db_session):
+async def test_geo_filter_bbox_positive(db_session):
     inside = await create_building(
         db_session,
         address="Inside",
@@ -56,8 +56,8 @@ async def test_apply_geo_filter_bbox_positive(db_session):
         min_lon=37.0,
         max_lon=37.2,
     )
-    stmt = apply_geo_filter(stmt, geo, BuildingGeo.geom)
-    result = await db_session.execute(stmt)
+    stmt = geo_filter(stmt, BuildingGeo.geom, geo_shape(geo))
+    result = await db_session.execute(stmt, geo_params(geo))
 
     assert result.scalars().all() == [inside.id]
 
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import func, select
+
+from api.database.schema.actiivty import (
+    Activity,
+    ActivityClosure,
+    ActivityName,
+    ActivityParent,
+)
+from api.database.schema.agency import AgencyPhone
+from tests.app.database.queries.conftest import (
+    create_activity,
+    create_agency,
+    create_building,
+)
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_create_many_keeps_row_order_positive(db_session):
+    building = await create_building(db_session, "Ленина 1", 55.75, 37.61)
+    agency = await create_agency(db_session, "Рога", building)
+    phones = [f"8-800-000-00-0{n}" for n in range(5)]
+
+    created = await AgencyPhone._create_many(
+        db_session,
+        [{"agency_id": agency.id, "phone": phone} for phone in phones],
+    )
+
+    assert [row.phone for row in created] == phones
+    assert all(row.id is not None for row in created)
+    assert await AgencyPhone._create_many(db_session, []) == []
+
+
+async def test_create_activity_chain_positive(db_session):
+    root = await create_activity(db_session, name="Root", parent_id=None)
+    child = await create_activity(db_session, name="Child", parent_id=root.id)
+
+    name = await db_session.scalar(
+        select(ActivityName.name).where(ActivityName.activity_id == child.id)
+    )
+    parent_id = await db_session.scalar(
+        select(ActivityParent.parent_id).where(
+            ActivityParent.activity_id == child.id
+        )
+    )
+    closure = await db_session.execute(
+        select(ActivityClosure.ancestor_id, ActivityClosure.depth)
+        .where(ActivityClosure.descendant_id == child.id)
+        .order_by(ActivityClosure.depth)
+    )
+    assert name == "Child"
+    assert parent_id == root.id
+    assert closure.tuples().all() == [(child.id, 0), (root.id, 1)]
+
+
+async def test_create_activity_depth_limit_negative(db_session):
+    parent_id = None
+    for level in range(4):
+        activity = await create_activity(
+            db_session, name=f"Level {level}", parent_id=parent_id
+        )
+        parent_id = activity.id
+    count = select(func.count()).select_from(Activity)
+    before = await db_session.scalar(count)
+
+    with pytest.raises(ValueError, match="depth limit"):
+        await create_activity(db_session, name="Too deep", parent_id=parent_id)
+
+    # Nothing was written, and the transaction is still usable.
+    assert await db_session.scalar(count) == before
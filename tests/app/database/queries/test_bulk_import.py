@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.bulk_import import bulk_import
+from api.database.queries.agency import get_agency_by_id
+from api.database.schema.actiivty import ActivityClosure
+from api.database.schema.building import Building
+
+pytestmark = pytest.mark.postgres
+
+# Far above anything the sequences handed out to other tests.
+BASE_ID = 10_000_000_000
+
+
+async def _import(session: AsyncSession, **sources):
+    conn = await session.connection()
+    return await bulk_import(conn, sources)
+
+
+async def test_bulk_import_positive(db_session):
+    root, child, building, agency = (BASE_ID + n for n in range(1, 5))
+
+    stats = await _import(
+        db_session,
+        activity=[(1, root, "Еда", None), (2, child, "Мясо", root)],
+        building=[(1, building, "Ленина 1", 55.75, 37.61)],
+        agency=[(1, agency, "Рога", building, ["1-111"], [child])],
+    )
+
+    assert stats.rows == {"activity": 2, "building": 1, "agency": 1}
+    assert stats.rows_per_s > 0
+    found = await get_agency_by_id(db_session, agency)
+    assert found is not None
+    assert found["name"] == "Рога"
+    assert found["phones"] == ["1-111"]
+    assert found["building"]["address"] == "Ленина 1"
+    assert [activity["id"] for activity in found["activities"]] == [child]
+    closure = await db_session.execute(
+        select(ActivityClosure.ancestor_id, ActivityClosure.depth)
+        .where(ActivityClosure.descendant_id == child)
+        .order_by(ActivityClosure.depth)
+    )
+    assert closure.all() == [(child, 0), (root, 1)]
+    assert (await Building.create(db_session)).id > building
+
+
+async def test_bulk_import_reimport_positive(db_session):
+    building, agency = BASE_ID + 11, BASE_ID + 12
+    await _import(
+        db_session,
+        building=[(1, building, "Old", 55.0, 37.0)],
+        agency=[(1, agency, "Old", building, ["1-111", "2-222"], [])],
+    )
+
+    await _import(
+        db_session,
+        agency=[
+            (1, agency, "Stale", building, [], []),
+            (2, agency, "New", building, ["2-222", "3-333"], []),
+        ],
+    )
+
+    found = await get_agency_by_id(db_session, agency)
+    assert found is not None
+    assert found["name"] == "New"
+    assert found["phones"] == ["2-222", "3-333"]
+
+
+async def test_bulk_import_unknown_building_negative(db_session):
+    with pytest.raises(ValueError, match="1 agencies reference unknown"):
+        await _import(
+            db_session,
+            agency=[(1, BASE_ID + 21, "Lost", BASE_ID + 22, [], [])],
+        )
+
+
+async def test_bulk_import_depth_limit_negative(db_session):
+    ids = [BASE_ID + 31 + n for n in range(5)]
+    chain = [
+        (line, activity_id, f"Level {line}", parent_id)
+        for line, (activity_id, parent_id) in enumerate(
+            zip(ids, [None, *ids[:-1]], strict=True), start=1
+        )
+    ]
+
+    with pytest.raises(ValueError, match="depth limit"):
+        await _import(db_session, activity=chain)
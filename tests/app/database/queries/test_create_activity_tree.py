@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.schema.actiivty import (
+    Activity,
+    ActivityClosure,
+    ActivityName,
+    ActivityParent,
+)
+from tests.app.database.queries.conftest import create_activity
+
+pytestmark = pytest.mark.postgres
+
+
+async def _closure(
+    session: AsyncSession, descendant_id: int
+) -> list[tuple[int, int]]:
+    rows = await session.execute(
+        select(ActivityClosure.ancestor_id, ActivityClosure.depth)
+        .where(ActivityClosure.descendant_id == descendant_id)
+        .order_by(ActivityClosure.depth)
+    )
+    return list(rows.tuples().all())
+
+
+async def test_create_activity_tree_positive(db_session):
+    root = await create_activity(db_session, name="Root", parent_id=None)
+
+    food, cars, meat = await Activity.create_tree(
+        db_session,
+        drafts=[("Food", None), ("Cars", None), ("Meat", 0)],
+        parent_id=root.id,
+    )
+
+    assert food < cars < meat
+    names = await db_session.execute(
+        select(ActivityName.name)
+        .where(ActivityName.activity_id.in_([food, cars, meat]))
+        .order_by(ActivityName.activity_id)
+    )
+    assert names.scalars().all() == ["Food", "Cars", "Meat"]
+    parent = await db_session.execute(
+        select(ActivityParent.parent_id).where(
+            ActivityParent.activity_id == meat
+        )
+    )
+    assert parent.scalar_one() == food
+    assert await _closure(db_session, cars) == [(cars, 0), (root.id, 1)]
+    assert await _closure(db_session, meat) == [
+        (meat, 0),
+        (food, 1),
+        (root.id, 2),
+    ]
+
+
+async def test_create_activity_tree_without_parent_positive(db_session):
+    (root,) = await Activity.create_tree(
+        db_session, drafts=[("Root", None)], parent_id=None
+    )
+
+    assert await _closure(db_session, root) == [(root, 0)]
+
+
+async def test_create_activity_tree_depth_limit_negative(db_session):
+    root = await create_activity(db_session, name="Root", parent_id=None)
+    before = (await db_session.execute(select(Activity.id))).scalars().all()
+
+    with pytest.raises(ValueError, match="depth limit"):
+        await Activity.create_tree(
+            db_session,
+            drafts=[("A", None), ("B", 0), ("C", 1), ("D", 2)],
+            parent_id=root.id,
+        )
+
+    after = (await db_session.execute(select(Activity.id))).scalars().all()
+    assert after == before
+
+
+async def test_create_activity_tree_unknown_parent_negative(db_session):
+    with pytest.raises(ValueError, match="does not exist"):
+        await Activity.create_tree(
+            db_session, drafts=[("A", None)], parent_id=10_000_000_000
+        )
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.engine import create_engine
+from api.database.queries.agency import list_agencies_by_building
+from api.database.queries.statements import (
+    QUERY_NAME,
+    QueryCacheMonitor,
+    QueryCacheStats,
+    prebuilt,
+)
+from api.database.schema.building import Building
+from tests.app.database.queries.conftest import create_agency, create_building
+
+
+def test_prebuilt_builds_once_per_shape_positive():
+    builds = []
+
+    def build():
+        builds.append(1)
+        return select(Building.id)
+
+    first = prebuilt("test_prebuilt", ("radius",), build)
+    again = prebuilt("test_prebuilt", ("radius",), build)
+    other = prebuilt("test_prebuilt", ("box",), build)
+
+    assert first is again
+    assert first is not other
+    assert len(builds) == 2
+    assert first.get_execution_options()[QUERY_NAME] == "test_prebuilt"
+
+
+def test_query_cache_stats_without_executions_negative():
+    stats = QueryCacheStats()
+
+    assert stats.compiled_hit_ratio == 0.0
+    assert stats.prepared_hit_ratio == 0.0
+
+
+@pytest.mark.postgres
+async def test_query_cache_monitor_reports_hits_positive(db_engine):
+    engine = create_engine()
+    monitor = QueryCacheMonitor()
+    monitor.instrument(engine)
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn)
+        try:
+            building = await create_building(session, "Ленина 1", 55.0, 37.0)
+            await create_agency(session, "Рога", building)
+            for _ in range(2):
+                await list_agencies_by_building(session, building.id)
+        finally:
+            await session.close()
+            await trans.rollback()
+    await engine.dispose()
+
+    report = monitor.report()["list_agencies_by_building"]
+    assert report["executions"] == 2
+    assert report["compiled_hit_ratio"] == 0.5
+    assert report["prepared_hit_ratio"] == 0.5
+    assert "other" in monitor.report()
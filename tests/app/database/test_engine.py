@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from api.database.engine import (
+    PoolStats,
+    TimedQueuePool,
+    create_engine,
+    pool_stats,
+)
+from api.settings import settings
+
+
+async def test_create_engine_uses_pool_settings_positive(monkeypatch):
+    monkeypatch.setattr(settings, "PG_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "PG_PRE_PING", "periodic")
+    engine = create_engine()
+
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == 3
+    assert engine.pool._pre_ping is False
+    stats = pool_stats(engine)
+    assert stats is engine.pool.stats
+    await engine.dispose()
+    assert pool_stats(engine) is stats
+
+
+async def test_create_engine_transaction_pooler_positive(monkeypatch):
+    monkeypatch.setattr(settings, "PG_TRANSACTION_POOLER", True)
+    engine = create_engine()
+
+    assert isinstance(engine.pool, NullPool)
+    assert pool_stats(engine) is None
+    await engine.dispose()
+
+
+def test_pool_stats_without_checkouts_negative():
+    assert PoolStats().mean_wait_s == 0.0
+
+
+@pytest.mark.postgres
+async def test_pool_stats_counts_timeouts_negative(monkeypatch):
+    monkeypatch.setattr(settings, "PG_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "PG_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "PG_POOL_TIMEOUT_S", 0.05)
+    engine = create_engine()
+    stats = pool_stats(engine)
+    assert stats is not None
+    try:
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError, match="QueuePool limit"):
+                async with engine.connect():
+                    pass
+    finally:
+        await engine.dispose()
+
+    assert stats.checkouts == 2
+    assert stats.timeouts == 1
+    assert stats.max_wait_s >= 0.05
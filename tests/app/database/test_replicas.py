@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.database.engine import create_engine
+from api.database.replicas import Replica, ReplicaSet, parse_lsn
+from api.settings import settings
+
+
+def _replica(replayed_lsn: int, healthy: bool = True) -> Replica:
+    engine = create_engine(settings.PG_URL)
+    return Replica(
+        engine,
+        async_sessionmaker(bind=engine),
+        healthy=healthy,
+        replayed_lsn=replayed_lsn,
+    )
+
+
+def test_parse_lsn_positive():
+    assert parse_lsn("0/16B3748") == 0x16B3748
+    assert parse_lsn("16/B374D848") == (0x16 << 32) + 0xB374D848
+    assert parse_lsn("1/0") > parse_lsn("0/FFFFFFFF")
+
+
+@pytest.mark.parametrize("token", ["", "16B3748", "0/xyz", "/"])
+def test_parse_lsn_negative(token):
+    with pytest.raises(ValueError, match="Invalid consistency token"):
+        parse_lsn(token)
+
+
+def test_pick_round_robin_positive():
+    first, second = _replica(10), _replica(10)
+    replicas = ReplicaSet([first, second, _replica(10, healthy=False)])
+
+    picked = [replicas.pick() for _ in range(4)]
+
+    assert picked == [first, second, first, second]
+    assert replicas.stats.replica_reads == 4
+
+
+def test_pick_caught_up_replica_positive():
+    behind, ahead = _replica(10), _replica(20)
+    replicas = ReplicaSet([behind, ahead], policy="least_used")
+
+    assert replicas.pick(min_lsn=15) is ahead
+
+
+def test_pick_falls_back_to_primary_negative():
+    replicas = ReplicaSet([_replica(10), _replica(30, healthy=False)])
+
+    assert replicas.pick(min_lsn=20) is None
+    assert replicas.stats.lagging_reads == 1
+    assert replicas.stats.primary_reads == 1
+    assert ReplicaSet([]).pick() is None
+
+
+@pytest.mark.postgres
+async def test_write_token_reached_by_replica_positive():
+    replicas = ReplicaSet.connect([settings.PG_URL], "round_robin")
+    primary = create_engine()
+    try:
+        async with async_sessionmaker(bind=primary)() as session:
+            token = await replicas.write_token(session)
+        await replicas.check()
+    finally:
+        await replicas.dispose()
+        await primary.dispose()
+
+    assert token is not None
+    assert replicas.pick(min_lsn=parse_lsn(token)) is replicas.replicas[0]
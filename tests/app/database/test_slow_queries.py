@@ -0,0 +1,66 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from sqlalchemy import literal, select
+
+from api.database.engine import create_engine
+from api.database.queries.statements import prebuilt
+from api.database.slow_queries import SlowQueryLog, fingerprint
+
+
+def _log(threshold_s: float = 0.0) -> SlowQueryLog:
+    return SlowQueryLog(
+        threshold_s=threshold_s,
+        explain=True,
+        explain_interval_s=3600.0,
+        explains_per_minute=2,
+    )
+
+
+def test_fingerprint_positive():
+    assert fingerprint("SELECT $1") == fingerprint("SELECT $1")
+    assert fingerprint("SELECT $1") != fingerprint("SELECT $2")
+    assert len(fingerprint("SELECT 1")) == 16
+
+
+def test_explain_once_per_fingerprint_negative():
+    log = _log()
+
+    assert log._may_explain({"fingerprint": "a"}) is True
+    assert log._may_explain({"fingerprint": "a"}) is False
+
+
+def test_explain_rate_limit_negative():
+    log = _log()
+
+    assert log._may_explain({"fingerprint": "a"}) is True
+    assert log._may_explain({"fingerprint": "b"}) is True
+    assert log._may_explain({"fingerprint": "c"}) is False
+
+
+@pytest.mark.postgres
+async def test_slow_query_plan_logged_positive(caplog):
+    engine = create_engine()
+    log = _log(threshold_s=1e-9)
+    log.instrument(engine)
+    stmt = prebuilt("test_slow_query", (), lambda: select(literal(1)))
+    caplog.set_level(logging.WARNING, logger="api.database.slow_queries")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(stmt)
+        await asyncio.gather(*log._tasks)
+    finally:
+        await engine.dispose()
+
+    assert log.timings["test_slow_query"].slow == 1
+    plans = [
+        record.args[0]
+        for record in caplog.records
+        if record.msg == "Slow query plan %s"
+    ]
+    assert len(plans) == 1
+    entry = json.loads(plans[0])
+    assert entry["query"] == "test_slow_query"
+    assert "Plan" in entry["plan"][0]
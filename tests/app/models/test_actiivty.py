@@ -0,0 +1,81 @@
+import pytest
+from pydantic import ValidationError
+
+from api.models.actiivty import ActivityBulkCreate
+
+
+def test_activity_bulk_tree_drafts_positive():
+    payload = ActivityBulkCreate.model_validate(
+        {
+            "tree": [
+                {
+                    "name": "Food",
+                    "children": [
+                        {"name": "Meat", "children": [{"name": "Beef"}]},
+                        {"name": "Milk"},
+                    ],
+                },
+                {"name": "Cars"},
+            ]
+        }
+    )
+
+    assert payload.drafts() == [
+        ("Food", None),
+        ("Cars", None),
+        ("Meat", 0),
+        ("Milk", 0),
+        ("Beef", 2),
+    ]
+
+
+def test_activity_bulk_item_drafts_parent_first_positive():
+    payload = ActivityBulkCreate.model_validate(
+        {
+            "items": [
+                {"ref": "beef", "name": "Beef", "parent_ref": "meat"},
+                {"ref": "meat", "name": "Meat", "parent_ref": "food"},
+                {"ref": "food", "name": "Food"},
+            ]
+        }
+    )
+
+    assert payload.drafts() == [
+        ("Food", None),
+        ("Meat", 0),
+        ("Beef", 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("items", "match"),
+    [
+        (
+            [{"ref": "a", "name": "A"}, {"ref": "a", "name": "B"}],
+            "unique",
+        ),
+        ([{"ref": "a", "name": "A", "parent_ref": "b"}], "Unknown"),
+        (
+            [
+                {"ref": "a", "name": "A", "parent_ref": "b"},
+                {"ref": "b", "name": "B", "parent_ref": "a"},
+            ],
+            "cycle",
+        ),
+        ([], "No activities"),
+    ],
+)
+def test_activity_bulk_item_drafts_negative(items, match):
+    payload = ActivityBulkCreate.model_validate({"items": items})
+
+    with pytest.raises(ValueError, match=match):
+        payload.drafts()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [{}, {"tree": [], "items": []}],
+)
+def test_activity_bulk_shape_negative(body):
+    with pytest.raises(ValidationError, match="Exactly one"):
+        ActivityBulkCreate.model_validate(body)
@@ -0,0 +1,43 @@
+import pytest
+
+from api.models.agency import AgencyListQuery
+from api.models.pagination import encode_cursor
+
+
+@pytest.mark.parametrize(
+    ("name_mode", "cursor"),
+    [
+        ("substring", encode_cursor(7)),
+        ("similarity", encode_cursor(0.5, 7)),
+        ("prefix", encode_cursor("roga", 7)),
+    ],
+)
+def test_agency_list_query_cursor_shape_positive(name_mode, cursor):
+    params = AgencyListQuery(
+        building_id=None,
+        activity_id=None,
+        name="Roga",
+        name_mode=name_mode,
+        cursor=cursor,
+    )
+
+    assert params.after_id == 7
+
+
+@pytest.mark.parametrize(
+    ("name_mode", "cursor"),
+    [
+        ("substring", encode_cursor(0.5, 7)),
+        ("similarity", encode_cursor(7)),
+        ("prefix", encode_cursor(0.5, 7)),
+    ],
+)
+def test_agency_list_query_cursor_shape_negative(name_mode, cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        AgencyListQuery(
+            building_id=None,
+            activity_id=None,
+            name="Roga",
+            name_mode=name_mode,
+            cursor=cursor,
+        )
@@ -0,0 +1,29 @@
+import pytest
+
+from api.models.pagination import (
+    PageQuery,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+
+
+def test_cursor_roundtrip_positive():
+    assert decode_cursor(encode_cursor(0.5, 42)) == (0.5, 42)
+    assert PageQuery(cursor=encode_cursor(42)).after_id == 42
+
+
+def test_next_cursor_full_page_positive():
+    rows = [{"id": 1}, {"id": 2}]
+
+    assert decode_cursor(next_cursor(rows, 2) or "") == (2,)
+    assert next_cursor(rows, 3) is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "not-base64!", encode_cursor("id"), encode_cursor(1, 2), "W10"],
+)
+def test_page_query_invalid_cursor_negative(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        PageQuery(cursor=cursor)
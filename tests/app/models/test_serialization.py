@@ -0,0 +1,81 @@
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter
+from starlette.types import Message
+
+from api.models.agency import AgencyOut
+from api.models.building import BuildingOut
+from api.models.serialization import (
+    NdjsonResponse,
+    dump_lines,
+    dump_row,
+    dump_rows,
+    list_adapter,
+)
+
+BUILDING = {"id": 1, "address": "Lenina 1", "lat": 55.75, "lon": 37.61}
+AGENCY = {
+    "id": 1,
+    "name": "Рога и копыта",
+    "phones": ["2-222-222"],
+    "building": BUILDING,
+    "activities": [{"id": 2, "name": "Мясная продукция"}],
+}
+
+
+def test_dump_rows_matches_models_positive():
+    rows = [AGENCY, {**AGENCY, "id": 2, "phones": []}]
+    expected = TypeAdapter(list[AgencyOut]).dump_json(
+        [AgencyOut.model_validate(row) for row in rows]
+    )
+
+    assert dump_rows(AgencyOut, rows) == expected
+    assert dump_row(AgencyOut, AGENCY) == (
+        AgencyOut.model_validate(AGENCY).model_dump_json().encode()
+    )
+
+
+def test_dump_rows_drops_query_columns_positive():
+    body = dump_rows(BuildingOut, [{**BUILDING, "sort_key": 0.5}])
+
+    assert body == dump_rows(BuildingOut, [BUILDING])
+    assert b"sort_key" not in body
+
+
+def test_dump_lines_positive():
+    lines = dump_lines(BuildingOut, [BUILDING, {**BUILDING, "id": 2}])
+
+    assert lines.splitlines() == [
+        dump_row(BuildingOut, BUILDING),
+        dump_row(BuildingOut, {**BUILDING, "id": 2}),
+    ]
+    assert lines.endswith(b"\n")
+
+
+def test_list_adapter_cached_positive():
+    assert list_adapter(AgencyOut) is list_adapter(AgencyOut)
+    assert list_adapter(AgencyOut) is not list_adapter(BuildingOut)
+
+
+async def test_ndjson_response_closes_batches_on_disconnect_negative():
+    closed = False
+
+    async def batches() -> AsyncGenerator[list[dict[str, Any]]]:
+        nonlocal closed
+        try:
+            while True:
+                yield [BUILDING]
+        finally:
+            closed = True
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            raise OSError("client went away")
+
+    response = NdjsonResponse(BuildingOut, batches())
+
+    with pytest.raises(OSError, match="client went away"):
+        await response.stream_response(send)
+    assert closed
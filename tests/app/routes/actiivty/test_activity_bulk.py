@@ -0,0 +1,70 @@
+import pytest
+
+
+async def test_activity_bulk_requires_api_key_negative(api_client, build_url):
+    response = await api_client.post(
+        build_url("/activity/bulk"),
+        json={"tree": [{"name": "Food"}]},
+    )
+
+    assert response.status_code == 401
+
+
+async def test_activity_bulk_tree_positive(api_client, api_headers, build_url):
+    response = await api_client.post(
+        build_url("/activity/bulk"),
+        json={
+            "parent_id": 7,
+            "tree": [{"name": "Food", "children": [{"name": "Meat"}]}],
+        },
+        headers=api_headers,
+    )
+
+    assert response.status_code == 201
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json() == [
+        {"id": 1, "name": "Food", "parent_id": 7},
+        {"id": 2, "name": "Meat", "parent_id": 1},
+    ]
+
+
+async def test_activity_bulk_items_positive(
+    api_client, api_headers, build_url
+):
+    response = await api_client.post(
+        build_url("/activity/bulk"),
+        json={
+            "items": [
+                {"ref": "meat", "name": "Meat", "parent_ref": "food"},
+                {"ref": "food", "name": "Food"},
+            ]
+        },
+        headers=api_headers,
+    )
+
+    assert response.status_code == 201
+    assert response.json() == [
+        {"id": 1, "name": "Food", "parent_id": None},
+        {"id": 2, "name": "Meat", "parent_id": 1},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("body", "status_code"),
+    [
+        ({"items": [{"ref": "a", "name": "A", "parent_ref": "b"}]}, 400),
+        ({"tree": []}, 400),
+        ({"tree": [{"name": "A"}], "items": []}, 422),
+    ],
+)
+async def test_activity_bulk_invalid_payload_negative(
+    api_client, api_headers, build_url, body, status_code
+):
+    response = await api_client.post(
+        build_url("/activity/bulk"),
+        json=body,
+        headers=api_headers,
+    )
+
+    assert response.status_code == status_code
+    assert "detail" in response.json()
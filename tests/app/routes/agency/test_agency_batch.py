@@ -0,0 +1,43 @@
+import pytest
+
+from api.models.agency import MAX_BATCH_IDS
+from tests.conftest import AGENCY_SAMPLE
+
+
+async def test_agency_batch_requires_api_key_negative(api_client, build_url):
+    response = await api_client.post(
+        build_url("/agency/batch"), json={"ids": [1]}
+    )
+
+    assert response.status_code == 401
+    assert response.headers["content-type"].startswith("application/json")
+    assert "detail" in response.json()
+
+
+async def test_agency_batch_positive(api_client, api_headers, build_url):
+    response = await api_client.post(
+        build_url("/agency/batch"),
+        json={"ids": [3, 1, 2, 3]},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json() == {"agencies": [AGENCY_SAMPLE], "missing": [3, 2]}
+
+
+@pytest.mark.parametrize(
+    "ids",
+    [[], [0], list(range(1, MAX_BATCH_IDS + 2))],
+)
+async def test_agency_batch_invalid_ids_negative(
+    api_client, api_headers, build_url, ids
+):
+    response = await api_client.post(
+        build_url("/agency/batch"),
+        json={"ids": ids},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 422
+    assert response.headers["content-type"].startswith("application/json")
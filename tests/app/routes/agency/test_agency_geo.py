@@ -1,5 +1,9 @@
+import json
+
 import pytest
 
+from tests.conftest import AGENCY_SAMPLE
+
 
 @pytest.mark.parametrize(
     ("path", "params"),
@@ -92,3 +96,28 @@ async def test_list_agencies_by_geo_invalid_params_negative(
 
     assert response.status_code == 422
     assert response.headers["content-type"].startswith("application/json")
+
+
+@pytest.mark.parametrize(
+    ("params", "accept"),
+    [
+        ({"stream": "true"}, "application/json"),
+        ({}, "application/x-ndjson"),
+    ],
+)
+async def test_list_agencies_by_geo_stream_positive(
+    api_client, api_headers, build_url, params, accept
+):
+    response = await api_client.get(
+        build_url("/agency/geo"),
+        params={"lat": 55.7558, "lon": 37.6173, "radius_m": 1000, **params},
+        headers={**api_headers, "Accept": accept},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        AGENCY_SAMPLE,
+        {**AGENCY_SAMPLE, "id": 2},
+    ]
@@ -1,5 +1,13 @@
+from unittest.mock import AsyncMock
+
 import pytest
 
+from api.database.queries import agency as agency_queries
+from api.database.replicas import CONSISTENCY_HEADER
+from tests.conftest import AGENCY_SAMPLE, AGENCY_VERSION
+
+ETAG = 'W/"5-0cc175b9c0f1b6a831c399e269772661"'
+
 
 @pytest.mark.parametrize(
     ("path", "params"),
@@ -40,3 +48,96 @@ async def test_get_agency_by_id_not_found_negative(
 
     assert response.status_code == 404
     assert response.headers["content-type"].startswith("application/json")
+
+
+async def test_get_agency_by_id_validators_positive(
+    api_client, api_headers, build_url
+):
+    response = await api_client.get(
+        build_url("/agency/1"),
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == ETAG
+    assert "last-modified" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "conditions",
+    [
+        {"If-None-Match": ETAG.removeprefix("W/")},
+        {"If-None-Match": f'W/"0-0", {ETAG}'},
+        {"If-None-Match": "*"},
+    ],
+)
+async def test_get_agency_by_id_not_modified_positive(
+    api_client, api_headers, build_url, monkeypatch, conditions
+):
+    query = AsyncMock(return_value=AGENCY_SAMPLE)
+    monkeypatch.setattr(agency_queries, "get_agency_by_id", query)
+
+    response = await api_client.get(
+        build_url("/agency/1"),
+        headers={**api_headers, **conditions},
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == ETAG
+    query.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "conditions",
+    [
+        {"If-None-Match": 'W/"4-0cc175b9c0f1b6a831c399e269772661"'},
+        {"If-None-Match": 'W/"0-0"'},
+        {"If-Modified-Since": "Thu, 01 Jan 2026 00:00:00 GMT"},
+    ],
+)
+async def test_get_agency_by_id_modified_negative(
+    api_client, api_headers, build_url, conditions
+):
+    response = await api_client.get(
+        build_url("/agency/1"),
+        headers={**api_headers, **conditions},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+
+
+async def test_get_agency_reads_one_snapshot_positive(
+    api_client, api_headers, build_url, monkeypatch
+):
+    isolation = []
+
+    async def get_agency_version(session, agency_id):
+        options = session.bind.get_execution_options()
+        isolation.append(options.get("isolation_level"))
+        return AGENCY_VERSION
+
+    monkeypatch.setattr(
+        agency_queries, "get_agency_version", get_agency_version
+    )
+
+    response = await api_client.get(
+        build_url("/agency/1"),
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert isolation == ["REPEATABLE READ"]
+
+
+async def test_get_agency_invalid_consistency_token_negative(
+    api_client, api_headers, build_url
+):
+    response = await api_client.get(
+        build_url("/agency/1"),
+        headers={**api_headers, CONSISTENCY_HEADER: "not-an-lsn"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid consistency token."
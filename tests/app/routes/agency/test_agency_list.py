@@ -1,5 +1,18 @@
+import json
+from unittest.mock import AsyncMock
+
 import pytest
 
+from api.database.queries import agency as agency_queries
+from api.database.queries.rendering import JsonPage
+from api.models.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+from api.settings import settings
+from tests.conftest import AGENCY_SAMPLE
+
 
 @pytest.mark.parametrize(
     ("path", "params"),
@@ -76,6 +89,26 @@ async def test_search_agencies_by_name_positive(
     assert_json_list(response.json())
 
 
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"name": "Rog", "name_mode": "prefix"},
+        {"name": "Roga", "name_mode": "similarity", "min_similarity": 0.5},
+    ],
+)
+async def test_search_agencies_by_name_modes_positive(
+    api_client, api_headers, assert_json_list, build_url, params
+):
+    response = await api_client.get(
+        build_url("/agency"),
+        params=params,
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert_json_list(response.json())
+
+
 @pytest.mark.parametrize(
     "params",
     [
@@ -96,3 +129,140 @@ async def test_list_agencies_invalid_filters_negative(
 
     assert response.status_code == 400
     assert response.headers["content-type"].startswith("application/json")
+
+
+async def test_list_agencies_next_cursor_positive(
+    api_client, api_headers, build_url, monkeypatch
+):
+    monkeypatch.setattr(
+        agency_queries,
+        "list_agencies_by_building",
+        AsyncMock(return_value=[AGENCY_SAMPLE]),
+    )
+
+    response = await api_client.get(
+        build_url("/agency"),
+        params={"building_id": 1, "limit": 1},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    assert decode_cursor(cursor) == (AGENCY_SAMPLE["id"],)
+
+
+async def test_list_agencies_last_page_without_cursor_positive(
+    api_client, api_headers, build_url
+):
+    response = await api_client.get(
+        build_url("/agency"),
+        params={"building_id": 1, "cursor": encode_cursor(10)},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"building_id": 1, "limit": 0},
+        {"building_id": 1, "limit": 100_000},
+        {"building_id": 1, "cursor": "garbage"},
+        {"name": "Roga", "name_mode": "fuzzy"},
+        {"name": "Roga", "name_mode": "similarity", "min_similarity": 0},
+    ],
+)
+async def test_list_agencies_invalid_page_negative(
+    api_client, api_headers, build_url, params
+):
+    response = await api_client.get(
+        build_url("/agency"),
+        params=params,
+        headers=api_headers,
+    )
+
+    assert response.status_code == 422
+    assert response.headers["content-type"].startswith("application/json")
+
+
+async def test_list_agencies_by_building_not_modified_positive(
+    api_client, api_headers, build_url, monkeypatch
+):
+    query = AsyncMock(return_value=[AGENCY_SAMPLE])
+    monkeypatch.setattr(agency_queries, "list_agencies_by_building", query)
+
+    first = await api_client.get(
+        build_url("/agency"),
+        params={"building_id": 1},
+        headers=api_headers,
+    )
+    second = await api_client.get(
+        build_url("/agency"),
+        params={"building_id": 1},
+        headers={**api_headers, "If-None-Match": first.headers["etag"]},
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert query.await_count == 1
+
+
+async def test_list_agencies_by_name_no_validators_negative(
+    api_client, api_headers, build_url
+):
+    response = await api_client.get(
+        build_url("/agency"),
+        params={"name": "Test"},
+        headers={**api_headers, "If-None-Match": "*"},
+    )
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+@pytest.mark.parametrize(
+    ("params", "query_name"),
+    [
+        ({"building_id": 1}, "render_agencies_by_building"),
+        ({"activity_id": 1}, "render_agencies_by_activity"),
+        ({"name": "Test"}, "render_agencies_by_name"),
+    ],
+)
+async def test_list_agencies_passthrough_positive(
+    api_client, api_headers, build_url, monkeypatch, params, query_name
+):
+    body = json.dumps([AGENCY_SAMPLE], separators=(",", ":")).encode()
+    query = AsyncMock(return_value=JsonPage(body=body, count=1, last_id=1))
+    monkeypatch.setattr(agency_queries, query_name, query)
+    monkeypatch.setattr(settings, "AGENCY_JSON_PASSTHROUGH", True)
+
+    response = await api_client.get(
+        build_url("/agency"),
+        params={**params, "limit": 1},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.content == body
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (1,)
+    query.assert_awaited_once()
+
+
+async def test_list_agencies_passthrough_prefix_negative(
+    api_client, api_headers, build_url, monkeypatch
+):
+    query = AsyncMock(return_value=[])
+    monkeypatch.setattr(agency_queries, "list_agencies_by_name_prefix", query)
+    monkeypatch.setattr(settings, "AGENCY_JSON_PASSTHROUGH", True)
+
+    response = await api_client.get(
+        build_url("/agency"),
+        params={"name": "Te", "name_mode": "prefix"},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == []
+    query.assert_awaited_once()
@@ -0,0 +1,80 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from api.database.queries import agency as agency_queries
+
+
+async def test_agency_nearest_requires_api_key_negative(api_client, build_url):
+    response = await api_client.get(
+        build_url("/agency/nearest"),
+        params={"lat": 55.7558, "lon": 37.6173},
+    )
+
+    assert response.status_code == 401
+    assert "detail" in response.json()
+
+
+async def test_list_agencies_nearest_positive(
+    api_client, api_headers, assert_json_list, build_url
+):
+    response = await api_client.get(
+        build_url("/agency/nearest"),
+        params={"lat": 55.7558, "lon": 37.6173, "limit": 5},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert_json_list(payload)
+    assert payload[0]["id"] == 1
+    assert payload[0]["distance_m"] == 12.5
+
+
+async def test_list_agencies_nearest_passes_query_positive(
+    api_client, api_headers, build_url, monkeypatch
+):
+    query = AsyncMock(return_value=[])
+    monkeypatch.setattr(agency_queries, "list_agencies_nearest", query)
+
+    response = await api_client.get(
+        build_url("/agency/nearest"),
+        params={
+            "lat": 55.0,
+            "lon": 37.0,
+            "limit": 3,
+            "activity_id": 7,
+            "include_descendants": True,
+        },
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert query.await_args is not None
+    params = query.await_args.kwargs["query"]
+    assert (params.lat, params.lon, params.limit) == (55.0, 37.0, 3)
+    assert params.activity_id == 7
+    assert params.include_descendants is True
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"lat": 55.0},
+        {"lat": 95.0, "lon": 37.0},
+        {"lat": 55.0, "lon": 37.0, "limit": 0},
+        {"lat": 55.0, "lon": 37.0, "limit": 100_000},
+        {"lat": 55.0, "lon": 37.0, "activity_id": 0},
+    ],
+)
+async def test_list_agencies_nearest_invalid_params_negative(
+    api_client, api_headers, build_url, params
+):
+    response = await api_client.get(
+        build_url("/agency/nearest"),
+        params=params,
+        headers=api_headers,
+    )
+
+    assert response.status_code == 422
+    assert response.headers["content-type"].startswith("application/json")
@@ -1,5 +1,14 @@
+import json
+from unittest.mock import AsyncMock
+
 import pytest
 
+from api.database.queries import building as building_queries
+from api.database.replicas import CONSISTENCY_HEADER
+from api.models.pagination import NEXT_CURSOR_HEADER
+from api.settings import settings
+from tests.conftest import BUILDING_SAMPLE
+
 
 @pytest.mark.parametrize(
     ("path", "params"),
@@ -75,6 +84,8 @@ async def test_list_buildings_by_geo_bbox_positive(
             "min_lon": 37.5,
             "max_lon": 37.7,
         },
+        {"lat": 55.7558, "lon": 37.6173, "radius_m": 1000, "limit": 0},
+        {"lat": 55.7558, "lon": 37.6173, "radius_m": 1000, "cursor": "x"},
     ],
 )
 async def test_list_buildings_by_geo_invalid_params_negative(
@@ -88,3 +99,75 @@ async def test_list_buildings_by_geo_invalid_params_negative(
 
     assert response.status_code == 422
     assert response.headers["content-type"].startswith("application/json")
+
+
+@pytest.fixture
+def cached_building_geo(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "RESPONSE_CACHE_ROUTES",
+        frozenset({"list_buildings_by_geo"}),
+    )
+
+
+@pytest.mark.usefixtures("cached_building_geo")
+async def test_list_buildings_by_geo_cached_positive(
+    api_client, api_headers, build_url, monkeypatch
+):
+    query = AsyncMock(
+        return_value=[{"id": 7, "address": "Cached", "lat": 55.0, "lon": 37.0}]
+    )
+    monkeypatch.setattr(building_queries, "list_buildings_by_geo", query)
+    params = {"lat": 55.0, "lon": 37.0, "radius_m": 1000, "limit": 1}
+
+    first = await api_client.get(
+        build_url("/building/geo"), params=params, headers=api_headers
+    )
+    second = await api_client.get(
+        build_url("/building/geo"), params=params, headers=api_headers
+    )
+
+    assert first.status_code == 200
+    assert second.content == first.content
+    assert (
+        second.headers[NEXT_CURSOR_HEADER]
+        == (first.headers[NEXT_CURSOR_HEADER])
+    )
+    assert query.await_count == 1
+
+
+@pytest.mark.usefixtures("cached_building_geo")
+async def test_list_buildings_by_geo_consistent_read_skips_caches_positive(
+    api_client, api_headers, build_url, monkeypatch
+):
+    query = AsyncMock(return_value=[])
+    monkeypatch.setattr(building_queries, "list_buildings_by_geo", query)
+    params = {"lat": 55.0, "lon": 37.0, "radius_m": 1000}
+    headers = {**api_headers, CONSISTENCY_HEADER: "0/16B3748"}
+
+    await api_client.get(
+        build_url("/building/geo"), params=params, headers=api_headers
+    )
+    response = await api_client.get(
+        build_url("/building/geo"), params=params, headers=headers
+    )
+
+    assert response.status_code == 200
+    assert query.await_count == 2
+    assert query.call_args.kwargs["building_index"] is None
+
+
+async def test_list_buildings_by_geo_stream_positive(
+    api_client, api_headers, build_url
+):
+    response = await api_client.get(
+        build_url("/building/geo"),
+        params={"lat": 55.0, "lon": 37.0, "radius_m": 1000, "stream": "true"},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        BUILDING_SAMPLE
+    ]
@@ -0,0 +1,65 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from api.database.queries import building as building_queries
+
+BUILDING_NEAREST_SAMPLE = {
+    "id": 1,
+    "address": "Test Address",
+    "lat": 55.0,
+    "lon": 37.0,
+    "distance_m": 42.0,
+}
+
+
+async def test_building_nearest_requires_api_key_negative(
+    api_client, build_url
+):
+    response = await api_client.get(
+        build_url("/building/nearest"),
+        params={"lat": 55.7558, "lon": 37.6173},
+    )
+
+    assert response.status_code == 401
+    assert "detail" in response.json()
+
+
+async def test_list_buildings_nearest_positive(
+    api_client, api_headers, build_url, monkeypatch
+):
+    query = AsyncMock(return_value=[BUILDING_NEAREST_SAMPLE])
+    monkeypatch.setattr(building_queries, "list_buildings_nearest", query)
+
+    response = await api_client.get(
+        build_url("/building/nearest"),
+        params={"lat": 55.0, "lon": 37.0, "activity_id": 3},
+        headers=api_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [BUILDING_NEAREST_SAMPLE]
+    assert query.await_args is not None
+    params = query.await_args.args[1]
+    assert params.activity_id == 3
+    assert params.limit == 20
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"lon": 37.0},
+        {"lat": 55.0, "lon": 181.0},
+        {"lat": 55.0, "lon": 37.0, "limit": 0},
+    ],
+)
+async def test_list_buildings_nearest_invalid_params_negative(
+    api_client, api_headers, build_url, params
+):
+    response = await api_client.get(
+        build_url("/building/nearest"),
+        params=params,
+        headers=api_headers,
+    )
+
+    assert response.status_code == 422
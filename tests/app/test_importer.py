@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from api.importer import read_records
+
+
+def test_read_records_csv_positive(tmp_path: Path):
+    path = tmp_path / "agencies.csv"
+    path.write_text(
+        "id,name,building_id,phones,activity_ids\n"
+        '7,"Рога, копыта",2,2-222-222;3-333-333,5\n'
+        "8,Empty,2,,\n",
+        encoding="utf-8",
+    )
+
+    assert list(read_records(path, "agency")) == [
+        (1, 7, "Рога, копыта", 2, ["2-222-222", "3-333-333"], [5]),
+        (2, 8, "Empty", 2, [], []),
+    ]
+
+
+def test_read_records_ndjson_positive(tmp_path: Path):
+    path = tmp_path / "activities.ndjson"
+    path.write_text(
+        '{"id": 1, "name": "Еда"}\n'
+        "\n"
+        '{"id": 2, "name": "Мясо", "parent_id": 1}\n',
+        encoding="utf-8",
+    )
+
+    assert list(read_records(path, "activity")) == [
+        (1, 1, "Еда", None),
+        (2, 2, "Мясо", 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("name", "content", "message"),
+    [
+        (
+            "buildings.ndjson",
+            '{"id": 1, "address": "A", "lat": 1, "lon": 2}\n'
+            '{"id": 2, "address": "B", "lat": 91, "lon": 2}\n',
+            "record 2",
+        ),
+        ("buildings.xml", "<buildings/>", "unsupported file format"),
+    ],
+)
+def test_read_records_negative(
+    tmp_path: Path, name: str, content: str, message: str
+):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        list(read_records(path, "building"))
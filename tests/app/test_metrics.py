@@ -0,0 +1,56 @@
+from api.metrics import Histogram, RequestMetrics
+
+
+def test_histogram_cumulative_buckets_positive():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    lines = list(histogram.lines("latency", 'route="/a"'))
+
+    assert lines == [
+        'latency_bucket{route="/a",le="0.1"} 2',
+        'latency_bucket{route="/a",le="1"} 3',
+        'latency_bucket{route="/a",le="+Inf"} 4',
+        'latency_sum{route="/a"} 3.65',
+        'latency_count{route="/a"} 4',
+    ]
+
+
+def test_request_metrics_counts_statuses_positive():
+    metrics = RequestMetrics()
+    for status in (200, 200, 404):
+        metrics.observe("GET", "/agency/{agency_id}", status, 0.01, 10, 0.0)
+
+    route = metrics.routes[("GET", "/agency/{agency_id}")]
+    assert route.statuses == {200: 2, 404: 1}
+    assert route.size.total == 30
+
+
+async def test_metrics_endpoint_positive(api_client, api_headers, build_url):
+    await api_client.get(build_url("/agency/1"), headers=api_headers)
+
+    response = await api_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    route = build_url("/agency/{agency_id}")
+    assert (
+        f'http_requests_total{{method="GET",route="{route}",status="200"}} 1'
+        in body
+    )
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'db_pool_checked_out{pool="primary"} 0' in body
+    assert 'cache_lookups_total{cache="response",result="hit"} 0' in body
+
+
+async def test_metrics_unmatched_route_negative(api_client):
+    await api_client.get("/missing")
+
+    response = await api_client.get("/metrics")
+
+    assert (
+        'http_requests_total{method="GET",route="unmatched",status="404"} 1'
+        in response.text
+    )
@@ -0,0 +1,64 @@
+import re
+
+from httpx import ASGITransport, AsyncClient
+
+from api import timing
+from api.app import create_app
+from api.settings import settings
+
+
+def test_phase_outside_request_negative():
+    with timing.phase("sql"):
+        pass
+    timing.add("sql", 1.0)
+
+    assert timing.current() is None
+
+
+def test_request_timing_header_positive():
+    with timing.request_timing() as request_timing:
+        timing.add("sql", 0.002)
+        timing.add("sql", 0.001)
+        with timing.phase("json"):
+            pass
+
+    assert timing.current() is None
+    assert list(request_timing.phases) == ["sql", "json"]
+    assert re.fullmatch(
+        r"sql;dur=3\.000, json;dur=\d+\.\d{3}, total;dur=\d+\.\d{3}",
+        request_timing.header(),
+    )
+
+
+async def test_server_timing_header_positive(
+    monkeypatch, api_headers, build_url
+):
+    monkeypatch.setattr(settings, "SERVER_TIMING", True)
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.get(
+                build_url("/agency/geo"),
+                params={"lat": 55.0, "lon": 37.0, "radius_m": 100},
+                headers=api_headers,
+            )
+
+    assert response.status_code == 200
+    phases = [
+        item.split(";")[0]
+        for item in response.headers[timing.SERVER_TIMING_HEADER].split(", ")
+    ]
+    assert phases == ["auth", "params", "model", "json", "total"]
+
+
+async def test_server_timing_disabled_negative(
+    api_client, api_headers, build_url
+):
+    response = await api_client.get(
+        build_url("/agency/1"), headers=api_headers
+    )
+
+    assert timing.SERVER_TIMING_HEADER not in response.headers
@@ -1,4 +1,4 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock
@@ -9,19 +9,27 @@ from httpx import ASGITransport, AsyncClient
 from api.app import create_app
 from api.database.queries import agency as agency_queries
 from api.database.queries import building as building_queries
+from api.database.queries.rendering import JsonPage
 from api.database.schema.actiivty import Activity
 from api.settings import settings
 
 API_KEY_HEADER = "X-API-Key"
 API_KEY_VALUE = "test-api-key"
 
+BUILDING_SAMPLE = {
+    "id": 1,
+    "address": "Test Address",
+    "lat": 55.0,
+    "lon": 37.0,
+}
 AGENCY_SAMPLE = {
     "id": 1,
     "name": "Test Agency",
     "phones": [],
-    "building": {"id": 1, "address": "Test Address", "lat": 55.0, "lon": 37.0},
+    "building": BUILDING_SAMPLE,
     "activities": [],
 }
+AGENCY_VERSION = (5, "0cc175b9c0f1b6a831c399e269772661")
 
 
 def _should_skip_query_mocks(request: pytest.FixtureRequest) -> bool:
@@ -39,6 +47,32 @@ async def _get_agency_by_id(
     return None
 
 
+async def _get_agency_version(
+    *args: Any, **kwargs: Any
+) -> tuple[int, str] | None:
+    if await _get_agency_by_id(*args, **kwargs) is None:
+        return None
+    return AGENCY_VERSION
+
+
+async def _get_agencies_by_ids(
+    *args: Any, **kwargs: Any
+) -> list[dict[str, Any]]:
+    return [AGENCY_SAMPLE] if 1 in kwargs["agency_ids"] else []
+
+
+def _stream_batches(
+    *batches: list[dict[str, Any]],
+) -> Callable[..., AsyncGenerator[list[dict[str, Any]]]]:
+    async def _stream(
+        *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[list[dict[str, Any]]]:
+        for batch in batches:
+            yield batch
+
+    return _stream
+
+
 def _install_query_mocks(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         agency_queries, "list_agencies_by_building", AsyncMock(return_value=[])
@@ -52,12 +86,66 @@ def _install_query_mocks(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         agency_queries, "list_agencies_by_name", AsyncMock(return_value=[])
     )
+    monkeypatch.setattr(
+        agency_queries,
+        "list_agencies_by_name_prefix",
+        AsyncMock(return_value=[]),
+    )
+    monkeypatch.setattr(
+        agency_queries,
+        "list_agencies_by_name_similarity",
+        AsyncMock(return_value=[]),
+    )
+    monkeypatch.setattr(
+        agency_queries,
+        "list_agencies_nearest",
+        AsyncMock(return_value=[{**AGENCY_SAMPLE, "distance_m": 12.5}]),
+    )
+    for name in (
+        "render_agencies_by_building",
+        "render_agencies_by_activity",
+        "render_agencies_by_geo",
+        "render_agencies_by_name",
+    ):
+        monkeypatch.setattr(
+            agency_queries,
+            name,
+            AsyncMock(
+                return_value=JsonPage(body=b"[]", count=0, last_id=None)
+            ),
+        )
+    monkeypatch.setattr(
+        agency_queries,
+        "stream_agencies_by_geo",
+        _stream_batches([AGENCY_SAMPLE], [], [{**AGENCY_SAMPLE, "id": 2}]),
+    )
     monkeypatch.setattr(agency_queries, "get_agency_by_id", _get_agency_by_id)
+    monkeypatch.setattr(
+        agency_queries, "get_agencies_by_ids", _get_agencies_by_ids
+    )
+    monkeypatch.setattr(
+        agency_queries, "get_agency_version", _get_agency_version
+    )
+    monkeypatch.setattr(
+        agency_queries,
+        "get_building_agencies_version",
+        AsyncMock(return_value=AGENCY_VERSION),
+    )
     monkeypatch.setattr(
         building_queries,
         "list_buildings_by_geo",
         AsyncMock(return_value=[]),
     )
+    monkeypatch.setattr(
+        building_queries,
+        "stream_buildings_by_geo",
+        _stream_batches([BUILDING_SAMPLE]),
+    )
+    monkeypatch.setattr(
+        building_queries,
+        "list_buildings_nearest",
+        AsyncMock(return_value=[]),
+    )
 
 
 def _install_activity_mock(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -75,9 +163,18 @@ def _install_activity_mock(monkeypatch: pytest.MonkeyPatch) -> None:
             raise ValueError("Activity depth limit exceeded.")
         return SimpleNamespace(id=call_count)
 
+    async def _create_tree(
+        cls: type[Activity],
+        session: Any,
+        drafts: list[tuple[str, int | None]],
+        parent_id: int | None,
+    ) -> list[int]:
+        return list(range(1, len(drafts) + 1))
+
     monkeypatch.setattr(
         Activity, "create_activity", classmethod(_create_activity)
     )
+    monkeypatch.setattr(Activity, "create_tree", classmethod(_create_tree))
 
 
 @pytest.fixture